@@ -0,0 +1,240 @@
+"""
+Activity catalog and itinerary selection for the AI Travel Planner
+Activities are compiled once with numeric prices and durations and an inverted index from interest
+to activities. A request ranks the activities matching any of its interests, spreading the ranking
+across interests, and picks the most valuable set that fits a total budget and time limit with a
+small knapsack.
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+# Minutes counted for activities listed as taking a full day
+FULL_DAY_MINUTES = 480
+# Each further activity from the same interest is worth this fraction of the previous one
+DIVERSITY_DECAY = 0.7
+# Positions past this share one (negligible) weight; also keeps the powers out of denormal range
+_DECAY_WEIGHTS = DIVERSITY_DECAY ** np.arange(65, dtype=np.float64)
+# Highest-valued candidates the knapsack chooses from
+ACTIVITY_CANDIDATES = int(os.environ.get('ACTIVITY_CANDIDATES', 48))
+# Budget and time are split into at most this many steps for the knapsack table
+KNAPSACK_BUDGET_STEPS = 200
+KNAPSACK_TIME_STEPS = 64
+DEFAULT_INTERESTS = ('culture', 'food')
+
+# Activities by primary interest; 'also' lists the other interests an activity serves
+ACTIVITY_DATA = {
+    'culture': [
+        {'name': '{destination} Historical Museum', 'description': 'Explore local history and culture', 'price': 25, 'duration': '2-3 hours', 'also': ['history']},
+        {'name': '{destination} Art Gallery', 'description': 'Contemporary and classical art exhibitions', 'price': 20, 'duration': '1-2 hours'},
+        {'name': 'Cultural Walking Tour', 'description': 'Guided tour of historical sites', 'price': 35, 'duration': '3 hours', 'also': ['history']},
+        {'name': 'Traditional Craft Workshop', 'description': 'Learn local crafts and traditions', 'price': 45, 'duration': '2 hours', 'also': ['shopping']}
+    ],
+    'food': [
+        {'name': 'Food Market Tour', 'description': 'Explore local markets and taste specialties', 'price': 40, 'duration': '3 hours', 'also': ['shopping', 'culture']},
+        {'name': 'Cooking Class', 'description': 'Learn to cook traditional dishes', 'price': 65, 'duration': '4 hours', 'also': ['culture']},
+        {'name': 'Wine Tasting', 'description': 'Sample local wines and learn about production', 'price': 55, 'duration': '2 hours', 'also': ['nightlife']},
+        {'name': 'Street Food Tour', 'description': 'Discover the best street food spots', 'price': 30, 'duration': '2.5 hours', 'also': ['nightlife']}
+    ],
+    'adventure': [
+        {'name': 'Hiking Tour', 'description': 'Explore scenic trails and viewpoints', 'price': 50, 'duration': '6 hours', 'also': ['nature']},
+        {'name': 'Bike Rental', 'description': 'Explore the city on two wheels', 'price': 25, 'duration': 'Full day'},
+        {'name': 'Kayaking Experience', 'description': 'Paddle through scenic waterways', 'price': 60, 'duration': '4 hours', 'also': ['nature']},
+        {'name': 'Rock Climbing', 'description': 'Guided climbing experience', 'price': 80, 'duration': '5 hours'}
+    ],
+    'nature': [
+        {'name': 'Nature Walk', 'description': 'Guided walk through natural areas', 'price': 30, 'duration': '3 hours'},
+        {'name': 'Botanical Garden Visit', 'description': 'Explore diverse plant collections', 'price': 15, 'duration': '2 hours', 'also': ['relaxation']},
+        {'name': 'Wildlife Watching', 'description': 'Spot local wildlife in natural habitat', 'price': 45, 'duration': '4 hours', 'also': ['adventure']},
+        {'name': 'Photography Tour', 'description': 'Capture stunning natural landscapes', 'price': 55, 'duration': '3 hours'}
+    ],
+    'relaxation': [
+        {'name': 'Spa Treatment', 'description': 'Rejuvenating spa experience', 'price': 120, 'duration': '2 hours'},
+        {'name': 'Beach Day', 'description': 'Relax on pristine beaches', 'price': 10, 'duration': 'Full day', 'also': ['nature']},
+        {'name': 'Meditation Class', 'description': 'Learn mindfulness and meditation', 'price': 35, 'duration': '1.5 hours'},
+        {'name': 'Yoga Session', 'description': 'Outdoor yoga with scenic views', 'price': 25, 'duration': '1 hour'}
+    ]
+}
+
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(hours?|hrs?|h|minutes?|mins?|m)\b', re.I)
+
+
+def parse_duration(text: str) -> int:
+    """Minutes for durations like '2 hours', '1-2 hours', '90 minutes' or 'Full day'; ranges use the upper end.
+
+    Raises ValueError for text it cannot read.
+    """
+    text = str(text).strip().lower()
+    if 'full day' in text:
+        return FULL_DAY_MINUTES
+    if 'half day' in text:
+        return FULL_DAY_MINUTES // 2
+    match = _DURATION_RE.search(text)
+    if match is None:
+        raise ValueError(f"Unrecognized duration: {text}")
+    amount = float(match.group(2) or match.group(1))
+    return round(amount * 60 if match.group(3).startswith('h') else amount)
+
+
+@dataclass(frozen=True, slots=True)
+class Activity:
+    """A bookable activity; name and description may contain a {destination} placeholder."""
+    name: str
+    description: str
+    price: float
+    duration: str
+    minutes: int
+    interests: tuple
+
+
+class ActivityCatalog:
+    """Activities compiled into numeric columns with an interest -> activity inverted index."""
+
+    def __init__(self, activities):
+        self.activities = tuple(activities)
+        self.prices = np.array([activity.price for activity in self.activities], dtype=np.float64)
+        self.minutes = np.array([activity.minutes for activity in self.activities], dtype=np.int32)
+        postings = {}
+        for i, activity in enumerate(self.activities):
+            for interest in activity.interests:
+                postings.setdefault(interest, []).append(i)
+        # Catalog order within each posting list is the curated order
+        self.index = {interest: np.array(ids, dtype=np.int32) for interest, ids in postings.items()}
+
+    @classmethod
+    def from_data(cls, data=ACTIVITY_DATA):
+        """Compile {interest: [activity dict, ...]} as used by ACTIVITY_DATA."""
+        activities = []
+        for interest, entries in data.items():
+            for entry in entries:
+                interests = tuple(dict.fromkeys([interest, *entry.get('also', ())]))
+                activities.append(Activity(entry['name'], entry['description'], float(entry['price']),
+                                           entry['duration'], parse_duration(entry['duration']), interests))
+        return cls(activities)
+
+    def __len__(self):
+        return len(self.activities)
+
+    def rank(self, interests):
+        """Ids of activities matching any interest with their values, best first.
+
+        An activity is worth one point per requested interest it serves, discounted by
+        DIVERSITY_DECAY for each better activity ahead of it in its strongest interest, so
+        the ranking alternates between interests instead of exhausting the first one.
+        """
+        postings = [self.index[key] for key in dict.fromkeys(str(i).strip().lower() for i in interests or ())
+                    if key in self.index]
+        if not postings:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        counts = np.bincount(np.concatenate(postings), minlength=len(self.activities))
+        position = np.full(len(self.activities), np.iinfo(np.int32).max, dtype=np.int64)
+        for posting in postings:
+            # Within an interest, activities serving more of the requested interests come first
+            order = np.argsort(-counts[posting], kind='stable')
+            np.minimum.at(position, posting[order], np.arange(len(posting)))
+        ids = np.flatnonzero(counts).astype(np.int32)
+        relevance, position = counts[ids], position[ids]
+        values = relevance * _DECAY_WEIGHTS[np.minimum(position, len(_DECAY_WEIGHTS) - 1)]
+        order = np.lexsort((ids, -values))
+        return ids[order], values[order]
+
+    def select(self, interests, budget: float = None, max_minutes: int = None, limit: int = 8):
+        """Ids of the most valuable set of at most limit activities within budget and time, best first."""
+        ids, values = self.rank(interests)
+        fits = np.ones(len(ids), dtype=bool)
+        if budget is not None:
+            fits &= self.prices[ids] <= budget
+        if max_minutes is not None:
+            fits &= self.minutes[ids] <= max_minutes
+        ids, values = ids[fits][:ACTIVITY_CANDIDATES], values[fits][:ACTIVITY_CANDIDATES]
+        if limit <= 0 or len(ids) == 0:
+            return []
+
+        costs = _steps(self.prices[ids], budget, KNAPSACK_BUDGET_STEPS)
+        times = _steps(self.minutes[ids], max_minutes, KNAPSACK_TIME_STEPS)
+        if costs is None and times is None:
+            return ids[:limit].tolist()
+        chosen = _knapsack(values, costs, times, min(limit, len(ids)))
+        return ids[np.sort(chosen)].tolist()
+
+
+def _steps(amounts, capacity, max_steps):
+    """(item sizes, capacity) in whole steps, rounding sizes up so the real total never exceeds capacity.
+
+    The step is a multiple of the sizes' common divisor, so typical prices ($5 steps) and
+    durations (15-minute steps) are exact unless the capacity needs more than max_steps steps.
+    """
+    if capacity is None:
+        return None
+    unit = 1
+    if np.all(amounts == np.round(amounts)) and np.any(amounts > 0):
+        unit = int(np.gcd.reduce(np.round(amounts).astype(np.int64)))
+    step = unit * max(1, int(np.ceil(capacity / max_steps / unit)))
+    return np.ceil(amounts / step).astype(np.int64), int(capacity // step)
+
+
+def _knapsack(values, costs, times, limit):
+    """Indices of the items maximizing total value with at most limit items within both capacities.
+
+    costs and times are (sizes, capacity) pairs or None for an unconstrained dimension. The table
+    holds the best value for every (item count, cost, time) and is filled one item at a time.
+    """
+    n = len(values)
+    cost_sizes, cost_capacity = costs if costs is not None else (np.zeros(n, dtype=np.int64), 0)
+    time_sizes, time_capacity = times if times is not None else (np.zeros(n, dtype=np.int64), 0)
+    best = np.full((limit + 1, cost_capacity + 1, time_capacity + 1), -np.inf)
+    best[0, :, :] = 0.0
+    taken = np.zeros((n, limit + 1, cost_capacity + 1, time_capacity + 1), dtype=bool)
+
+    for item in range(n):
+        c, t = int(cost_sizes[item]), int(time_sizes[item])
+        candidate = np.full_like(best, -np.inf)
+        candidate[1:, c:, t:] = best[:-1, :cost_capacity + 1 - c, :time_capacity + 1 - t] + values[item]
+        taken[item] = candidate > best
+        np.maximum(best, candidate, out=best)
+
+    # Walk back from the best final state
+    count, cost, time = np.unravel_index(np.argmax(best), best.shape)
+    chosen = []
+    for item in range(n - 1, -1, -1):
+        if taken[item, count, cost, time]:
+            chosen.append(item)
+            count, cost, time = count - 1, cost - int(cost_sizes[item]), time - int(time_sizes[item])
+    return np.array(chosen, dtype=np.int64)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_activity_catalog():
+    """Get the shared catalog, compiled on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ActivityCatalog.from_data()
+    return _catalog
+
+
+def get_activities(destination, interests, budget=None, max_hours=None, limit=8):
+    """Activities for a destination in TravelService.get_activities' format, best first."""
+    catalog = get_activity_catalog()
+    max_minutes = None if max_hours is None else round(float(max_hours) * 60)
+    selected = catalog.select(interests, budget, max_minutes, limit)
+    if not selected and not any(str(i).strip().lower() in catalog.index for i in interests or ()):
+        # Nothing matched the interests, fall back to general sightseeing
+        selected = catalog.select(DEFAULT_INTERESTS, budget, max_minutes, limit)
+
+    return [{
+        'name': activity.name.format(destination=destination),
+        'description': activity.description.format(destination=destination),
+        'price': int(activity.price) if activity.price.is_integer() else activity.price,
+        'duration': activity.duration,
+        'duration_minutes': activity.minutes,
+        'interests': list(activity.interests)
+    } for activity in (catalog.activities[i] for i in selected)]
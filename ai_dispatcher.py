@@ -0,0 +1,167 @@
+"""
+Bounded-concurrency dispatcher for AI calls
+Runs blocking Gemini calls on an asyncio event loop thread with a concurrency cap,
+a requests-per-minute token bucket and a bounded queue that fails fast when full
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from token_bucket import TokenBucket
+
+MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', 4))
+REQUESTS_PER_MINUTE = float(os.environ.get('AI_REQUESTS_PER_MINUTE', 60))
+MAX_QUEUE = int(os.environ.get('AI_MAX_QUEUE', 32))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get('AI_QUEUE_TIMEOUT', 30))
+
+
+class DispatcherOverloaded(Exception):
+    """Raised when an AI call is rejected instead of queued; carries the HTTP status to return."""
+
+    def __init__(self, message, status_code=503, retry_after=1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class AIDispatcher:
+    """Submit blocking AI calls from request threads to a shared asyncio loop."""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, requests_per_minute=REQUESTS_PER_MINUTE,
+                 max_queue=MAX_QUEUE, queue_timeout=QUEUE_TIMEOUT_SECONDS):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(requests_per_minute / 60.0, max(1.0, requests_per_minute / 60.0 * 5))
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._executor = None
+
+        # Instrumentation
+        self.queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _ensure_started(self):
+        """Start the event loop thread on first use (after any gunicorn fork)."""
+        if self._loop is not None:
+            return
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='ai-call')
+            self._thread = threading.Thread(target=loop.run_forever, name='ai-dispatcher', daemon=True)
+            self._thread.start()
+            self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(), loop).result()
+            self._loop = loop
+
+    async def _make_semaphore(self):
+        return asyncio.Semaphore(self.max_concurrency)
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) under the dispatcher limits and return its result."""
+        self._ensure_started()
+
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise DispatcherOverloaded('AI request queue is full', status_code=503,
+                                           retry_after=self.queue_timeout / 4)
+            self.queued += 1
+            self.submitted += 1
+
+        future = asyncio.run_coroutine_threadsafe(self._run(fn, args, kwargs, time.monotonic()), self._loop)
+        return future.result()
+
+    async def _run(self, fn, args, kwargs, enqueued_at):
+        """Wait for a rate-limit token, then a concurrency slot, then run fn on the executor.
+
+        The token is taken first so calls waiting out the requests-per-minute budget do not hold
+        a slot that a call with a token could be using.
+        """
+        deadline = enqueued_at + self.queue_timeout
+        started = False
+        try:
+            while True:
+                wait = self.bucket.try_acquire()
+                if wait == 0:
+                    break
+                if time.monotonic() + wait > deadline:
+                    raise DispatcherOverloaded('AI requests-per-minute budget exhausted',
+                                               status_code=429, retry_after=wait)
+                await asyncio.sleep(wait)
+
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                # The call never ran, so its token goes back to the budget
+                self.bucket.release()
+                raise DispatcherOverloaded('Timed out waiting for an AI worker slot', status_code=503,
+                                           retry_after=self.queue_timeout / 4)
+
+            try:
+                self._record_start(time.monotonic() - enqueued_at)
+                started = True
+                return await self._loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+            finally:
+                self._semaphore.release()
+        except DispatcherOverloaded:
+            with self._lock:
+                self.rejected += 1
+            raise
+        finally:
+            with self._lock:
+                if started:
+                    self.running -= 1
+                    self.completed += 1
+                else:
+                    self.queued -= 1
+
+    def _record_start(self, waited):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        """Get queue depth, concurrency and wait-time counters for this process."""
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                'queue_depth': self.queued,
+                'running': self.running,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'wait_seconds_total': round(self.wait_seconds_total, 4),
+                'wait_seconds_avg': round(self.wait_seconds_total / started, 4) if started else 0.0,
+                'wait_seconds_max': round(self.wait_seconds_max, 4),
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue
+            }
+
+
+_dispatcher = AIDispatcher()
+
+
+def dispatch(fn, *args, **kwargs):
+    """Run a blocking AI call through the shared dispatcher."""
+    return _dispatcher.submit(fn, *args, **kwargs)
+
+
+def get_dispatcher_stats() -> dict:
+    """Get instrumentation for the shared dispatcher."""
+    return _dispatcher.stats()
+
@@ -1,6 +1,7 @@
 
 import os
 import logging
+import threading
 from flask import Flask
 
 # Load environment variables
@@ -20,5 +21,13 @@ app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-prod
 # Import routes after app creation to avoid circular imports
 from routes import *
 
+# Compress responses, add ETags to GET responses and serve pre-compressed static files
+import http_caching
+http_caching.init_app(app)
+
+# Warm up the shared Gemini client in the background so the first request skips setup
+from gemini import warm_up_client
+threading.Thread(target=warm_up_client, name='gemini-warm-up', daemon=True).start()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
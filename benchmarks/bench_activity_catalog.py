@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark interest ranking and budget/time-constrained selection on a large synthetic activity catalog
+Usage: python benchmarks/bench_activity_catalog.py [--activities 100000] [--interests 40] [--queries 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activity_catalog import Activity, ActivityCatalog
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def timed_queries(label, queries, run):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        run(*query)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"{label:<36} p50 {percentile(timings, 0.5) * 1000:7.3f} ms   p99 {percentile(timings, 0.99) * 1000:7.3f} ms")
+
+
+def synthetic_catalog(size, interest_count, rng):
+    interests = [f"interest{i}" for i in range(interest_count)]
+    activities = []
+    for i in range(size):
+        minutes = rng.choice([60, 90, 120, 150, 180, 240, 300, 360, 480])
+        activities.append(Activity(f"Activity {i}", '', float(rng.randrange(5, 200, 5)), f"{minutes} minutes",
+                                   minutes, tuple(rng.sample(interests, rng.randint(1, 3)))))
+    return activities, interests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--activities', type=int, default=100000)
+    parser.add_argument('--interests', type=int, default=40)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    activities, interests = synthetic_catalog(args.activities, args.interests, rng)
+    started = time.perf_counter()
+    catalog = ActivityCatalog(activities)
+    print(f"{len(catalog):,} activities over {args.interests} interests, index built in "
+          f"{time.perf_counter() - started:.2f} s")
+
+    queries = [(rng.sample(interests, rng.randint(1, 4)), rng.randrange(50, 500, 10), rng.randrange(120, 960, 30))
+               for _ in range(args.queries)]
+    timed_queries('rank matching activities', queries, lambda i, b, m: catalog.rank(i))
+    timed_queries('top 8, no limits', queries, lambda i, b, m: catalog.select(i))
+    timed_queries('top 8 within budget', queries, lambda i, b, m: catalog.select(i, budget=b))
+    timed_queries('top 8 within budget and time', queries, lambda i, b, m: catalog.select(i, budget=b, max_minutes=m))
+
+
+if __name__ == '__main__':
+    main()
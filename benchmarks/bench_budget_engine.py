@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark budget comparisons in budget_engine against per-country Python loops
+Usage: python benchmarks/bench_budget_engine.py [--iterations 500] [--scale 1 10 100]
+--scale repeats the catalog to show how both approaches grow with the number of countries.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget_engine import BUDGET_TIERS, BudgetEngine
+from country_data import COUNTRIES
+
+DURATIONS = list(range(1, 31))
+GROUP_SIZES = list(range(1, 9))
+
+
+def scaled_catalog(scale):
+    """The country catalog repeated under distinct names."""
+    if scale == 1:
+        return COUNTRIES
+    return {f"{name} {i}": country for i in range(scale) for name, country in COUNTRIES.items()}
+
+
+def loop_matrix(catalog, currency_rate):
+    """The same comparison matrix built one cell at a time."""
+    matrix = []
+    for country in catalog.values():
+        rate = country.exchange_rate or 1.0
+        matrix.append([[[(country.budget_ranges[tier].min / rate * currency_rate * days * people,
+                          country.budget_ranges[tier].max / rate * currency_rate * days * people)
+                         for people in GROUP_SIZES] for days in DURATIONS] for tier in BUDGET_TIERS])
+    return matrix
+
+
+def loop_ranking(catalog, amount, days, travelers):
+    """Best affordable tier per country, one country at a time."""
+    per_day = amount / (days * travelers)
+    ranked = []
+    for name, country in catalog.items():
+        rate = country.exchange_rate or 1.0
+        for index in range(len(BUDGET_TIERS) - 1, -1, -1):
+            budget_range = country.budget_ranges[BUDGET_TIERS[index]]
+            low, high = budget_range.min / rate, budget_range.max / rate
+            if low <= per_day:
+                ranked.append((-index, -min(1.0, (per_day - low) / (high - low)), name))
+                break
+    return [name for *_, name in sorted(ranked, key=lambda item: item[:2])]
+
+
+def timed(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'countries':>9} {'matrix numpy':>13} {'matrix loops':>13} {'rank numpy':>11} {'rank loops':>11}  (us/call)")
+    for scale in args.scale:
+        catalog = scaled_catalog(scale)
+        engine = BudgetEngine(catalog)
+        iterations = max(1, args.iterations // scale)
+        assert [r['country'] for r in engine.where_can_i_go(3000, 10, 2)] == loop_ranking(catalog, 3000, 10, 2)
+
+        timings = (
+            timed(lambda: engine.comparison_matrix(DURATIONS, GROUP_SIZES, 'EUR'), iterations),
+            timed(lambda: loop_matrix(catalog, engine.rate('EUR')), max(1, iterations // 10)),
+            timed(lambda: engine.where_can_i_go(3000, 10, 2, limit=10), iterations),
+            timed(lambda: loop_ranking(catalog, 3000, 10, 2)[:10], iterations),
+        )
+        print(f"{len(catalog):>9} " + ' '.join(f"{t * 1e6:>{w}.1f}" for t, w in zip(timings, (13, 13, 11, 11))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark flight searches against the seeded inventory in flight_inventory
+Usage: python benchmarks/bench_flight_inventory.py [--days 30] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flight_inventory import FlightInventory
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def timed_queries(label, queries, search):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(*query)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"{label:<38} p50 {percentile(timings, 0.5) * 1000:7.3f} ms   p99 {percentile(timings, 0.99) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    inventory = FlightInventory(days=args.days)
+    print(f"{len(inventory):,} fares over {len(inventory.city_keys)} cities x {args.days} days, "
+          f"{inventory.nbytes / 1e6:.1f} MB, built in {inventory.build_seconds:.2f} s")
+
+    rng = random.Random(42)
+    cities = inventory.city_keys
+    today = date.today()
+
+    def random_day():
+        return (today + timedelta(days=rng.randrange(args.days))).isoformat()
+
+    routes = [(rng.choice(cities), rng.choice(cities), random_day()) for _ in range(args.queries)]
+    timed_queries('route + date', routes, lambda o, d, day: inventory.search(o, d, day))
+    timed_queries('route + date, nonstop under $300', routes,
+                  lambda o, d, day: inventory.search(o, d, day, max_stops=0, max_price=300))
+    timed_queries('route, +/-3 days, sorted by duration', routes,
+                  lambda o, d, day: inventory.search(o, d, day, flexible_days=3, sort='duration'))
+    anywhere = [(rng.choice(cities), random_day()) for _ in range(max(1, args.queries // 4))]
+    timed_queries('origin to anywhere, +/-7 days', anywhere,
+                  lambda o, day: inventory.search(o, None, day, flexible_days=7))
+    outside = [(f"town {i}", f"village {i}", random_day()) for i in range(args.queries)]
+    timed_queries('non-catalog route (generated)', outside, lambda o, d, day: inventory.search(o, d, day))
+
+
+if __name__ == '__main__':
+    main()
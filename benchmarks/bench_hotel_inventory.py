@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark filtered, paginated hotel searches against one city's index in hotel_inventory
+Usage: python benchmarks/bench_hotel_inventory.py [--properties 100000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotel_inventory import AMENITIES, CityHotels
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def timed_queries(label, queries, search):
+    timings = []
+    matches = 0
+    for query in queries:
+        started = time.perf_counter()
+        _rows, total = search(query)
+        timings.append(time.perf_counter() - started)
+        matches += total
+    timings.sort()
+    print(f"{label:<40} p50 {percentile(timings, 0.5) * 1000:7.3f} ms   p99 {percentile(timings, 0.99) * 1000:7.3f} ms"
+          f"   avg matches {matches / len(queries):,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--properties', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    hotels = CityHotels('paris', size=args.properties)
+    print(f"{len(hotels):,} properties, {hotels.nbytes / 1e6:.1f} MB, built in {hotels.build_seconds:.2f} s")
+
+    rng = random.Random(42)
+    prices = sorted(hotels.columns['price'].tolist())
+
+    def price_range():
+        low, high = sorted(rng.sample(prices, 2))
+        return low, high
+
+    queries = [{'price_range': price_range(), 'min_stars': rng.randint(1, 5),
+                'amenities': rng.sample(AMENITIES, rng.randint(0, 3)), 'min_rating': rng.choice([None, 3.5, 4.0, 4.5]),
+                'page': rng.randint(1, 5)} for _ in range(args.queries)]
+
+    timed_queries('unfiltered, first page', queries, lambda q: hotels.search())
+    timed_queries('price range', queries, lambda q: hotels.search(min_price=q['price_range'][0],
+                                                                  max_price=q['price_range'][1], page=q['page']))
+    timed_queries('price + stars + amenities + rating', queries,
+                  lambda q: hotels.search(min_price=q['price_range'][0], max_price=q['price_range'][1],
+                                          min_stars=q['min_stars'], amenities=q['amenities'],
+                                          min_rating=q['min_rating'], page=q['page']))
+    timed_queries('stars + amenities, by rating', queries,
+                  lambda q: hotels.search(min_stars=q['min_stars'], amenities=q['amenities'],
+                                          min_rating=q['min_rating'], sort='rating', page=q['page']))
+
+
+if __name__ == '__main__':
+    main()
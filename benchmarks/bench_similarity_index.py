@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate prompt lookups in similarity_index
+Usage: python benchmarks/bench_similarity_index.py [--entries 1000000] [--queries 20000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from country_data import COUNTRY_DATA
+from similarity_index import SimilarityIndex
+
+BUDGETS = ['budget', 'cheap', 'mid-range', 'luxury']
+INTERESTS = ['food', 'museums', 'hiking', 'nightlife', 'beaches', 'temples', 'shopping', 'architecture',
+             'wine', 'photography']
+
+
+def generate_prompts(count):
+    """Synthetic plan requests: destination x days x group size x budget x interest."""
+    destinations = [name for info in COUNTRY_DATA.values() for name in info['popular_destinations']]
+    combos = itertools.product(destinations, range(1, 31), range(1, 9), BUDGETS, INTERESTS)
+    for destination, days, people, budget, interest in itertools.islice(combos, count):
+        yield (destination, days, people, budget, interest,
+               f"{days} days in {destination} for {people} people on a {budget} budget, into {interest}")
+
+
+def reworded(destination, days, people, budget, interest):
+    """The same request phrased differently."""
+    return f"{budget} {destination} trip {days} days, {people} people, {interest}"
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=20_000)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    args = parser.parse_args()
+
+    index = SimilarityIndex(threshold=args.threshold, max_entries=args.entries)
+    samples = []
+
+    started = time.perf_counter()
+    for i, (*fields, prompt) in enumerate(generate_prompts(args.entries)):
+        index.add(prompt, i)
+        if random.random() < args.queries / args.entries:
+            samples.append(fields)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(42)
+    queries = [reworded(*fields) for fields in samples]
+    queries += [f"{rng.randint(40, 90)} days in Atlantis on a {rng.choice(BUDGETS)} budget" for _ in samples]
+    rng.shuffle(queries)
+
+    latencies = []
+    hits = 0
+    for query in queries:
+        started = time.perf_counter()
+        hits += index.query(query) is not None
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"entries:        {len(index):,} ({index.stats()['buckets']:,} LSH buckets)")
+    print(f"build:          {build_seconds:.1f}s ({build_seconds / max(len(index), 1) * 1e6:.1f}us per insert)")
+    print(f"queries:        {len(queries):,} ({hits:,} near-duplicate hits)")
+    print(f"lookup p50:     {percentile(latencies, 0.50) * 1e6:.1f}us")
+    print(f"lookup p95:     {percentile(latencies, 0.95) * 1e6:.1f}us")
+    print(f"lookup p99:     {percentile(latencies, 0.99) * 1e6:.1f}us")
+    print(f"peak RSS:       {rss_mb:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
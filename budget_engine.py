@@ -0,0 +1,125 @@
+"""
+Vectorized budget comparison across the country catalog
+Holds every country's daily budget ranges and exchange rates as NumPy arrays, so trip costs for
+all countries x travel styles x durations x group sizes come from one broadcast, in any currency
+the catalog has a rate for, and "where can I go for $X" ranks every country without Python loops.
+"""
+
+import math
+
+import numpy as np
+
+from country_data import COUNTRIES
+
+BUDGET_TIERS = ('budget', 'mid_range', 'luxury', 'ultra_luxury')
+BASE_CURRENCY = 'USD'
+
+
+class BudgetEngine:
+    """Daily budget ranges of every catalog country, normalized to USD per person per day."""
+
+    def __init__(self, countries=COUNTRIES, tiers=BUDGET_TIERS):
+        self.countries = tuple(countries)
+        self.tiers = tuple(tiers)
+        self._country_index = {name.lower(): i for i, name in enumerate(self.countries)}
+        self._tier_index = {tier: i for i, tier in enumerate(self.tiers)}
+
+        # Units of each currency per USD, from the catalog entries that carry a rate
+        self.currency_rates = {BASE_CURRENCY: 1.0}
+        for name in self.countries:
+            country = countries[name]
+            if country.exchange_rate:
+                self.currency_rates.setdefault(country.currency, float(country.exchange_rate))
+
+        # A country without its own rate converts at its currency's rate (Germany uses the EUR rate
+        # France carries); ranges in a currency with no known rate are already on a USD scale
+        self.rates = np.array([countries[name].exchange_rate or self.currency_rates.get(countries[name].currency, 1.0)
+                               for name in self.countries])
+        local = np.array([
+            [(countries[name].budget_ranges[tier].min, countries[name].budget_ranges[tier].max) for tier in self.tiers]
+            for name in self.countries
+        ], dtype=np.float64)
+        # (countries, tiers, 2): min and max daily cost per person in USD
+        self.daily_usd = local / self.rates[:, None, None]
+        self.daily_usd.flags.writeable = False
+
+    def rate(self, currency: str) -> float:
+        """Units of currency per USD; raises ValueError for currencies without a known rate."""
+        try:
+            return self.currency_rates[currency.upper()]
+        except KeyError:
+            raise ValueError(f"Unsupported currency: {currency}") from None
+
+    def country_name(self, name: str) -> str:
+        """Catalog spelling of a country name (case-insensitive); raises KeyError if unknown."""
+        return self.countries[self._country_index[name.lower()]]
+
+    def _select(self, countries, tiers):
+        """Row and column indices for the requested countries and tiers (all when None)."""
+        rows = slice(None) if countries is None else [self._country_index[name.lower()] for name in countries]
+        cols = slice(None) if tiers is None else [self._tier_index[tier] for tier in tiers]
+        return rows, cols
+
+    def comparison_matrix(self, durations, group_sizes, currency=BASE_CURRENCY, countries=None, tiers=None):
+        """Total trip cost ranges with shape (countries, tiers, durations, group sizes, 2) for min and max.
+
+        Raises KeyError for unknown countries or tiers and ValueError for unsupported currencies.
+        """
+        rows, cols = self._select(countries, tiers)
+        daily = self.daily_usd[rows][:, cols] * self.rate(currency)
+        days = np.asarray(durations, dtype=np.float64)
+        people = np.asarray(group_sizes, dtype=np.float64)
+        return daily[:, :, None, None, :] * days[None, None, :, None, None] * people[None, None, None, :, None]
+
+    def where_can_i_go(self, amount: float, days: int, travelers: int = 1, currency=BASE_CURRENCY, limit=None):
+        """Rank countries by the most comfortable travel style the total budget covers.
+
+        Countries are ordered by the highest affordable tier, then by how far into that tier's daily
+        range the budget reaches; countries where even the cheapest tier is out of reach are omitted.
+        """
+        if days <= 0 or travelers <= 0:
+            raise ValueError("days and travelers must be positive")
+        if not math.isfinite(amount) or amount <= 0:
+            raise ValueError("amount must be a positive number")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        rate = self.rate(currency)
+        per_day = amount / rate / (days * travelers)
+
+        lows = self.daily_usd[:, :, 0]
+        highs = self.daily_usd[:, :, 1]
+        # Tiers are ordered cheapest first, so the number of affordable tiers is one past the best one
+        best_tier = np.count_nonzero(lows <= per_day, axis=1) - 1
+        rows = np.flatnonzero(best_tier >= 0)
+        tier_cols = best_tier[rows]
+        low = lows[rows, tier_cols]
+        high = highs[rows, tier_cols]
+        comfort = np.clip((per_day - low) / np.maximum(high - low, 1e-9), 0.0, 1.0)
+        order = np.lexsort((-comfort, -tier_cols))[:limit]
+
+        trip = days * travelers
+        daily = np.stack([low, high])[:, order] * rate
+        columns = zip(rows[order].tolist(), tier_cols[order].tolist(), comfort[order].round(3).tolist(),
+                      daily.round(2).T.tolist(), (daily * trip).round(2).T.tolist())
+        currency = currency.upper()
+        return [{
+            'country': self.countries[row],
+            'tier': self.tiers[tier],
+            'comfort': score,
+            'daily_min': daily_min,
+            'daily_max': daily_max,
+            'trip_min': trip_min,
+            'trip_max': trip_max,
+            'currency': currency
+        } for row, tier, score, (daily_min, daily_max), (trip_min, trip_max) in columns]
+
+
+_engine = None
+
+
+def get_budget_engine():
+    """Get the shared engine (the catalog is immutable, so it is built once)."""
+    global _engine
+    if _engine is None:
+        _engine = BudgetEngine()
+    return _engine
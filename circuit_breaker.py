@@ -0,0 +1,265 @@
+"""
+Circuit breaker and hedged requests for the Gemini upstream
+The breaker opens after repeated failures or slow calls so requests go straight to the
+fallback guides, then lets a single probe through after a cool-down (half-open). Streams are
+guarded until their last chunk, so errors and stalls partway through count as well.
+Hedging fires a duplicate call once the primary exceeds the observed p95 latency.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ai_dispatcher import DispatcherOverloaded
+
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('AI_BREAKER_FAILURES', 5))
+# Calls (or waits between stream chunks) this slow count as failures; keep it below the request timeout
+BREAKER_SLOW_CALL_SECONDS = float(os.environ.get('AI_BREAKER_SLOW_CALL_SECONDS', 10))
+BREAKER_RESET_SECONDS = float(os.environ.get('AI_BREAKER_RESET_SECONDS', 30))
+
+HEDGING_ENABLED = os.environ.get('AI_HEDGING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+HEDGE_MIN_DELAY_SECONDS = float(os.environ.get('AI_HEDGE_MIN_DELAY_SECONDS', 2))
+HEDGE_MIN_SAMPLES = 20
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Count consecutive failed or slow calls; open the circuit when they reach the threshold."""
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+                 reset_seconds=BREAKER_RESET_SECONDS, ignore_exceptions=()):
+        self.failure_threshold = failure_threshold
+        self.ignore_exceptions = ignore_exceptions
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.trips = 0
+        self.short_circuited = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        """Move from open to half-open once the cool-down has passed; callers must hold the lock."""
+        if self._state == OPEN and now - self._opened_at >= self.reset_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        """Whether a call may go upstream now; in half-open only one probe is allowed at a time."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, elapsed):
+        """Record a completed call; calls slower than the threshold count as failures."""
+        if elapsed >= self.slow_call_seconds:
+            with self._lock:
+                self.slow_calls += 1
+            self._record_failure()
+            return
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            self.failures += 1
+        self._record_failure()
+
+    def _record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.trips += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn through the breaker, raising CircuitOpenError when short-circuited."""
+        if not self.allow_request():
+            raise CircuitOpenError('Gemini circuit breaker is open')
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except self.ignore_exceptions:
+            # Not an upstream fault (e.g. local backpressure); just free the probe slot
+            with self._lock:
+                self._probe_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def stream(self, fn, *args, **kwargs):
+        """Yield the chunks of the stream fn opens, recording errors raised at any point as failures.
+
+        A stream is slow when the wait for any one chunk, the first included, reaches the
+        slow-call threshold; a long answer arriving steadily is not.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError('Gemini circuit breaker is open')
+        longest_wait = 0.0
+        last = time.monotonic()
+        try:
+            for chunk in fn(*args, **kwargs):
+                longest_wait = max(longest_wait, time.monotonic() - last)
+                yield chunk
+                last = time.monotonic()
+            longest_wait = max(longest_wait, time.monotonic() - last)
+        except (GeneratorExit, *self.ignore_exceptions):
+            # The client went away or the call never reached the upstream; just free the probe slot
+            with self._lock:
+                self._probe_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(longest_wait)
+
+    def stats(self) -> dict:
+        """Get breaker state and counters for this process."""
+        with self._lock:
+            return {
+                'state': self._current_state(time.monotonic()),
+                'consecutive_failures': self._consecutive_failures,
+                'trips': self.trips,
+                'short_circuited': self.short_circuited,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls
+            }
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies for percentile estimates."""
+
+    def __init__(self, window=200):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction):
+        """Latency at the given fraction of the window, or None with too few samples."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Hedger:
+    """Issue a backup call when the primary is slower than the recent p95 and take the first result."""
+
+    def __init__(self, enabled=HEDGING_ENABLED, min_delay=HEDGE_MIN_DELAY_SECONDS, max_workers=16):
+        self.enabled = enabled
+        self.min_delay = min_delay
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ai-hedge')
+        self._lock = threading.Lock()
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self):
+        """Seconds to wait for the primary before firing a backup, or None if not hedging."""
+        if not self.enabled:
+            return None
+        p95 = self.latency.percentile(0.95)
+        if p95 is None:
+            return None
+        return max(self.min_delay, p95)
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn, hedging with a duplicate call after the p95 delay."""
+        started = time.monotonic()
+        delay = self.hedge_delay()
+        if delay is None:
+            result = fn(*args, **kwargs)
+            self.latency.record(time.monotonic() - started)
+            return result
+
+        primary = self._executor.submit(fn, *args, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            self.latency.record(time.monotonic() - started)
+            return primary.result()
+
+        with self._lock:
+            self.hedges_fired += 1
+        backup = self._executor.submit(fn, *args, **kwargs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is backup:
+                    with self._lock:
+                        self.hedges_won += 1
+                self.latency.record(time.monotonic() - started)
+                return future.result()
+        raise error
+
+    def stats(self) -> dict:
+        """Get hedging counters for this process."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'hedge_delay_seconds': self.hedge_delay(),
+                'hedges_fired': self.hedges_fired,
+                'hedges_won': self.hedges_won
+            }
+
+
+_breaker = CircuitBreaker(ignore_exceptions=(DispatcherOverloaded,))
+_hedger = Hedger()
+
+
+def guarded_call(fn, *args, **kwargs):
+    """Call the upstream through the shared breaker and hedger."""
+    return _breaker.call(_hedger.call, fn, *args, **kwargs)
+
+
+def breaker_stream(fn, *args, **kwargs):
+    """Iterate the stream fn opens through the shared breaker, guarding every chunk."""
+    return _breaker.stream(fn, *args, **kwargs)
+
+
+def get_breaker_stats() -> dict:
+    """Get breaker state and hedge counters for the shared Gemini guard."""
+    return {'breaker': _breaker.stats(), 'hedging': _hedger.stats()}
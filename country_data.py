@@ -1,8 +1,14 @@
 """
 Country-specific data for the AI Travel Planner
-Contains budget ranges, popular destinations, and travel information by country
+Contains budget ranges, popular destinations, and travel information by country.
+COUNTRY_DATA is compiled once at import into immutable records; the accessors below are
+dictionary lookups that return shared read-only views (copy with dict() before modifying
+or JSON-encoding them).
 """
 
+from dataclasses import dataclass
+from types import MappingProxyType
+
 COUNTRY_DATA = {
     # North America
     "United States": {
@@ -280,275 +286,155 @@ COUNTRY_DATA = {
     }
 }
 
-def get_country_list():
-    """Get list of all supported countries"""
-    return list(COUNTRY_DATA.keys())
+# Common short or informal names for catalog countries
+COUNTRY_ALIASES = {
+    'usa': 'United States',
+    'america': 'United States',
+    'uk': 'United Kingdom',
+    'england': 'United Kingdom',
+    'britain': 'United Kingdom',
+    'uae': 'United Arab Emirates'
+}
+
+@dataclass(frozen=True, slots=True)
+class BudgetRange:
+    """Daily budget range for one travel style, in the country's currency."""
+    min: int
+    max: int
+    description: str
+    currency: str
+
+
+@dataclass(frozen=True, slots=True)
+class Country:
+    """Compiled COUNTRY_DATA entry with read-only views for the accessors."""
+    name: str
+    currency: str
+    currency_symbol: str | None
+    exchange_rate: float | None
+    language: str
+    best_time: str
+    visa_info: str
+    cultural_notes: str
+    time_zones: tuple
+    popular_destinations: tuple
+    budget_ranges: MappingProxyType
+    info: MappingProxyType
+    budget_range_views: MappingProxyType
 
-def get_country_info(country):
-    """Get country information including currency, language, etc."""
-    country_data = {
-        'Japan': {
-            'currency': 'JPY',
-            'language': 'Japanese',
-            'best_time': 'Spring (March-May) and Fall (September-November)',
-            'cultural_notes': 'Bowing is customary, remove shoes indoors, quiet on public transport',
-            'visa_info': 'Tourist visa required for most countries'
-        },
-        'Thailand': {
-            'currency': 'THB',
-            'language': 'Thai',
-            'best_time': 'Cool season (November-February)',
-            'cultural_notes': 'Dress modestly at temples, wai greeting, respect for monarchy',
-            'visa_info': 'Visa on arrival for many countries'
-        },
-        'India': {
-            'currency': 'INR',
-            'language': 'Hindi/English',
-            'best_time': 'Winter (October-March)',
-            'cultural_notes': 'Diverse cultures, respect religious customs, bargaining common',
-            'visa_info': 'E-visa available for most countries'
-        },
-        'United Kingdom': {
-            'currency': 'GBP',
-            'language': 'English',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Queuing culture, pub etiquette, politeness valued',
-            'visa_info': 'Visa required for most non-EU countries'
-        },
-        'France': {
-            'currency': 'EUR',
-            'language': 'French',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Greeting with kisses, dining etiquette, fashion conscious',
-            'visa_info': 'Schengen visa required for most countries'
-        },
-        'Italy': {
-            'currency': 'EUR',
-            'language': 'Italian',
-            'best_time': 'Spring (April-June) and Fall (September-October)',
-            'cultural_notes': 'Family-oriented, dining traditions, art appreciation',
-            'visa_info': 'Schengen visa required for most countries'
-        },
-        'Spain': {
-            'currency': 'EUR',
-            'language': 'Spanish',
-            'best_time': 'Spring (March-May) and Fall (September-November)',
-            'cultural_notes': 'Siesta culture, late dining, social gatherings',
-            'visa_info': 'Schengen visa required for most countries'
-        },
-        'Germany': {
-            'currency': 'EUR',
-            'language': 'German',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Punctuality valued, direct communication, recycling important',
-            'visa_info': 'Schengen visa required for most countries'
-        },
-        'Australia': {
-            'currency': 'AUD',
-            'language': 'English',
-            'best_time': 'Spring (September-November) and Fall (March-May)',
-            'cultural_notes': 'Laid-back culture, outdoor lifestyle, tipping not mandatory',
-            'visa_info': 'ETA or visa required for most countries'
-        },
-        'United States': {
-            'currency': 'USD',
-            'language': 'English',
-            'best_time': 'Varies by region',
-            'cultural_notes': 'Tipping culture, diverse regions, friendly demeanor',
-            'visa_info': 'ESTA or visa required for most countries'
-        }
-    }
 
-    return country_data.get(country, {
-        'currency': 'USD',
-        'language': 'Local language',
-        'best_time': 'Year-round',
-        'cultural_notes': 'Research local customs',
-        'visa_info': 'Check visa requirements'
+def _budget_view(budget_range):
+    return MappingProxyType({
+        'min': budget_range.min,
+        'max': budget_range.max,
+        'description': budget_range.description,
+        'currency': budget_range.currency
     })
 
-def get_popular_destinations(country):
-    """Get popular destinations for a country."""
-    destinations = {
-        'Japan': ['Tokyo', 'Kyoto', 'Osaka', 'Hiroshima', 'Nara'],
-        'Thailand': ['Bangkok', 'Chiang Mai', 'Phuket', 'Koh Samui', 'Pattaya'],
-        'India': ['Delhi', 'Mumbai', 'Jaipur', 'Agra', 'Goa'],
-        'United Kingdom': ['London', 'Edinburgh', 'Manchester', 'Bath', 'York'],
-        'France': ['Paris', 'Nice', 'Lyon', 'Marseille', 'Bordeaux'],
-        'Italy': ['Rome', 'Florence', 'Venice', 'Milan', 'Naples'],
-        'Spain': ['Madrid', 'Barcelona', 'Seville', 'Valencia', 'Bilbao'],
-        'Germany': ['Berlin', 'Munich', 'Hamburg', 'Cologne', 'Frankfurt'],
-        'Australia': ['Sydney', 'Melbourne', 'Brisbane', 'Perth', 'Adelaide'],
-        'United States': ['New York', 'Los Angeles', 'Chicago', 'San Francisco', 'Miami']
+
+def _compile_country(name, data):
+    """Build the immutable record and its precomputed views for one COUNTRY_DATA entry."""
+    currency = data['currency']
+    budget_ranges = {
+        budget_type: BudgetRange(values['min'], values['max'], values['description'], currency)
+        for budget_type, values in data['budget_ranges'].items()
+    }
+    info = {
+        'currency': currency,
+        'currency_symbol': data.get('currency_symbol'),
+        'exchange_rate': data.get('exchange_rate'),
+        'language': data['language'],
+        'best_time': data['best_time'],
+        'cultural_notes': data['cultural_notes'],
+        'visa_info': data['visa_info'],
+        'time_zones': tuple(data['time_zones'])
     }
+    return Country(
+        name=name,
+        currency=currency,
+        currency_symbol=data.get('currency_symbol'),
+        exchange_rate=data.get('exchange_rate'),
+        language=data['language'],
+        best_time=data['best_time'],
+        visa_info=data['visa_info'],
+        cultural_notes=data['cultural_notes'],
+        time_zones=tuple(data['time_zones']),
+        popular_destinations=tuple(data['popular_destinations']),
+        budget_ranges=MappingProxyType(budget_ranges),
+        info=MappingProxyType(info),
+        budget_range_views=MappingProxyType({
+            budget_type: _budget_view(budget_range) for budget_type, budget_range in budget_ranges.items()
+        })
+    )
 
-    return destinations.get(country, [f'Capital of {country}', f'Major city in {country}'])
 
-def get_budget_ranges(country):
-    """Get budget ranges for a country."""
-    ranges = {
-        'Japan': {'budget': 60, 'mid_range': 120, 'luxury': 300, 'ultra_luxury': 600},
-        'Thailand': {'budget': 25, 'mid_range': 50, 'luxury': 150, 'ultra_luxury': 400},
-        'India': {'budget': 15, 'mid_range': 40, 'luxury': 120, 'ultra_luxury': 300},
-        'United Kingdom': {'budget': 50, 'mid_range': 100, 'luxury': 250, 'ultra_luxury': 500},
-        'France': {'budget': 60, 'mid_range': 120, 'luxury': 280, 'ultra_luxury': 550},
-        'Italy': {'budget': 50, 'mid_range': 100, 'luxury': 220, 'ultra_luxury': 450},
-        'Spain': {'budget': 45, 'mid_range': 90, 'luxury': 200, 'ultra_luxury': 400},
-        'Germany': {'budget': 55, 'mid_range': 110, 'luxury': 250, 'ultra_luxury': 500},
-        'Australia': {'budget': 70, 'mid_range': 140, 'luxury': 350, 'ultra_luxury': 700},
-        'United States': {'budget': 60, 'mid_range': 120, 'luxury': 300, 'ultra_luxury': 600}
-    }
+# The catalog and its indexes, built once at import
+COUNTRIES = MappingProxyType({name: _compile_country(name, data) for name, data in COUNTRY_DATA.items()})
+COUNTRY_NAMES = tuple(COUNTRIES)
+_COUNTRIES_BY_LOWER_NAME = {name.lower(): country for name, country in COUNTRIES.items()}
+_COUNTRY_BY_DESTINATION = {
+    destination.lower(): country
+    for country in COUNTRIES.values()
+    for destination in country.popular_destinations
+}
 
-    return ranges.get(country, {'budget': 40, 'mid_range': 80, 'luxury': 200, 'ultra_luxury': 400})
+# Returned for countries outside the catalog
+_DEFAULT_INFO = MappingProxyType({
+    'currency': 'USD',
+    'currency_symbol': '$',
+    'exchange_rate': 1.0,
+    'language': 'Local language',
+    'best_time': 'Year-round',
+    'cultural_notes': 'Research local customs before traveling',
+    'visa_info': 'Check visa requirements',
+    'time_zones': ()
+})
+_DEFAULT_DESTINATIONS = ('Capital City', 'Major City', 'Coastal City')
+_DEFAULT_BUDGET_RANGES = MappingProxyType({
+    'budget': _budget_view(BudgetRange(30, 60, 'Budget traveler - hostels, street food, public transport', 'USD')),
+    'mid_range': _budget_view(BudgetRange(60, 150, 'Mid-range - hotels, restaurants, mix of transport', 'USD')),
+    'luxury': _budget_view(BudgetRange(150, 400, 'Luxury - 4-5 star hotels, fine dining, private transport', 'USD')),
+    'ultra_luxury': _budget_view(BudgetRange(400, 1000, 'Ultra luxury - premium everything, exclusive experiences', 'USD'))
+})
+
+
+def get_country(country):
+    """Get the compiled record for a country name (case-insensitive), or None."""
+    record = COUNTRIES.get(country)
+    if record is None and isinstance(country, str):
+        record = _COUNTRIES_BY_LOWER_NAME.get(country.strip().lower())
+    return record
+
+
+def get_country_for_destination(destination):
+    """Get the country whose popular destinations include this city (case-insensitive), or None."""
+    return _COUNTRY_BY_DESTINATION.get(destination.strip().lower()) if isinstance(destination, str) else None
+
+
+def get_country_list():
+    """Get all supported countries (read-only)."""
+    return COUNTRY_NAMES
 
-def suggest_daily_budget(country_name, budget_type="mid_range"):
-    """Suggest daily budget based on country and budget type"""
-    ranges = get_budget_ranges(country_name)
-    if budget_type in ranges:
-        budget_range = ranges[budget_type]
-        return {
-            "min": budget_range["min"],
-            "max": budget_range["max"],
-            "description": budget_range["description"],
-            "currency": COUNTRY_DATA[country_name]["currency"]
-        }
-    return None
-"""
-Country data and information for the AI Travel Planner
-"""
 
 def get_country_info(country):
-    """Get country-specific information."""
-    country_data = {
-        'Japan': {
-            'currency': 'JPY',
-            'language': 'Japanese',
-            'best_time': 'Spring (March-May) and Fall (September-November)',
-            'cultural_notes': 'Bow when greeting, remove shoes indoors, be quiet on public transport',
-            'visa_info': 'Tourist visa required for most countries'
-        },
-        'Thailand': {
-            'currency': 'THB',
-            'language': 'Thai',
-            'best_time': 'Cool season (November-February)',
-            'cultural_notes': 'Dress modestly at temples, respect the monarchy, remove shoes when entering homes',
-            'visa_info': 'Visa on arrival or visa exemption for many countries'
-        },
-        'India': {
-            'currency': 'INR',
-            'language': 'Hindi/English',
-            'best_time': 'Winter (October-March)',
-            'cultural_notes': 'Dress conservatively, use right hand for eating, respect religious customs',
-            'visa_info': 'e-Visa available for most countries'
-        },
-        'United Kingdom': {
-            'currency': 'GBP',
-            'language': 'English',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Queue politely, respect personal space, tipping 10-15% at restaurants',
-            'visa_info': 'Check visa requirements based on nationality'
-        },
-        'France': {
-            'currency': 'EUR',
-            'language': 'French',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Greet with bonjour/bonsoir, dress well, dining etiquette important',
-            'visa_info': 'Schengen visa for non-EU citizens'
-        },
-        'Italy': {
-            'currency': 'EUR',
-            'language': 'Italian',
-            'best_time': 'Spring (April-June) and Fall (September-October)',
-            'cultural_notes': 'Dress well, especially at religious sites, lunch is sacred time',
-            'visa_info': 'Schengen visa for non-EU citizens'
-        },
-        'Spain': {
-            'currency': 'EUR',
-            'language': 'Spanish',
-            'best_time': 'Spring (March-May) and Fall (September-November)',
-            'cultural_notes': 'Late dining times, siesta culture, dress smartly',
-            'visa_info': 'Schengen visa for non-EU citizens'
-        },
-        'Germany': {
-            'currency': 'EUR',
-            'language': 'German',
-            'best_time': 'Late spring to early autumn (May-September)',
-            'cultural_notes': 'Punctuality is important, direct communication style, respect quiet hours',
-            'visa_info': 'Schengen visa for non-EU citizens'
-        },
-        'Australia': {
-            'currency': 'AUD',
-            'language': 'English',
-            'best_time': 'Spring (September-November) and Autumn (March-May)',
-            'cultural_notes': 'Casual culture, sun safety important, tipping not mandatory',
-            'visa_info': 'Electronic Travel Authority (ETA) for many countries'
-        },
-        'United States': {
-            'currency': 'USD',
-            'language': 'English',
-            'best_time': 'Varies by region - Spring and Fall generally best',
-            'cultural_notes': 'Tipping culture (15-20%), diverse customs by region, friendly conversation',
-            'visa_info': 'ESTA for eligible countries, tourist visa for others'
-        }
-    }
-    
-    return country_data.get(country, {
-        'currency': 'USD',
-        'language': 'Local language',
-        'best_time': 'Year-round',
-        'cultural_notes': 'Research local customs before traveling',
-        'visa_info': 'Check visa requirements'
-    })
+    """Get country information including currency, language, etc. (read-only)."""
+    record = get_country(country)
+    return record.info if record is not None else _DEFAULT_INFO
+
 
 def get_popular_destinations(country):
-    """Get popular destinations for a country."""
-    destinations = {
-        'Japan': ['Tokyo', 'Kyoto', 'Osaka', 'Hiroshima', 'Nara'],
-        'Thailand': ['Bangkok', 'Chiang Mai', 'Phuket', 'Krabi', 'Koh Samui'],
-        'India': ['Delhi', 'Mumbai', 'Jaipur', 'Goa', 'Kerala'],
-        'United Kingdom': ['London', 'Edinburgh', 'Bath', 'York', 'Cambridge'],
-        'France': ['Paris', 'Nice', 'Lyon', 'Bordeaux', 'Marseille'],
-        'Italy': ['Rome', 'Florence', 'Venice', 'Milan', 'Naples'],
-        'Spain': ['Madrid', 'Barcelona', 'Seville', 'Valencia', 'Granada'],
-        'Germany': ['Berlin', 'Munich', 'Hamburg', 'Cologne', 'Dresden'],
-        'Australia': ['Sydney', 'Melbourne', 'Brisbane', 'Perth', 'Adelaide'],
-        'United States': ['New York', 'Los Angeles', 'Chicago', 'Miami', 'San Francisco']
-    }
-    
-    return destinations.get(country, ['Capital City', 'Major City', 'Coastal City'])
+    """Get popular destinations for a country (read-only)."""
+    record = get_country(country)
+    return record.popular_destinations if record is not None else _DEFAULT_DESTINATIONS
+
 
 def get_budget_ranges(country):
-    """Get budget ranges for a country."""
-    country_info = get_country_info(country)
-    currency = country_info['currency']
-    
-    # Base ranges in USD, adjust based on country
-    base_ranges = {
-        'budget': {'min': 30, 'max': 60},
-        'mid_range': {'min': 60, 'max': 150},
-        'luxury': {'min': 150, 'max': 400},
-        'ultra_luxury': {'min': 400, 'max': 1000}
-    }
-    
-    # Currency conversion factors (approximate)
-    conversion_factors = {
-        'JPY': 110,
-        'THB': 35,
-        'INR': 75,
-        'GBP': 0.8,
-        'EUR': 0.9,
-        'AUD': 1.4,
-        'USD': 1.0
-    }
-    
-    factor = conversion_factors.get(currency, 1.0)
-    
-    ranges = {}
-    for budget_type, range_data in base_ranges.items():
-        ranges[budget_type] = {
-            'min': int(range_data['min'] * factor),
-            'max': int(range_data['max'] * factor),
-            'currency': currency
-        }
-    
-    return ranges
+    """Get daily budget ranges by travel style, each with min, max, description and currency (read-only)."""
+    record = get_country(country)
+    return record.budget_range_views if record is not None else _DEFAULT_BUDGET_RANGES
+
+
+def suggest_daily_budget(country_name, budget_type="mid_range"):
+    """Suggest daily budget based on country and budget type, as a plain dict ready for jsonify (or None)"""
+    budget = get_budget_ranges(country_name).get(budget_type)
+    return dict(budget) if budget is not None else None
@@ -0,0 +1,225 @@
+"""
+Typo-tolerant destination search for the AI Travel Planner
+A trigram index over the catalog's cities and countries (plus the destinations we have images
+for) that backs autocomplete and turns free-text destinations like "Kyotoo" into a canonical
+"Kyoto, Japan" before they reach the prompt and the caches.
+"""
+
+import heapq
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from country_data import COUNTRIES, COUNTRY_ALIASES
+from destination_images import DESTINATION_IMAGES
+
+# Most likely names (by trigram similarity) checked by edit distance when correcting a typo
+TYPO_CANDIDATES = 10
+# Added to the score of names that start with the query, so partial input ranks completions first
+PREFIX_BONUS = 0.3
+
+CITY = 'city'
+COUNTRY = 'country'
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+# Input naming several places ("London and Paris", "Mumbai & Goa", "Rome/Florence") is never rewritten
+_MULTI_PLACE_RE = re.compile(r'\s(?:and|or|then|via)\s|[&/+;|]', re.I)
+
+
+@dataclass(frozen=True, slots=True)
+class Destination:
+    """A searchable place; cities carry the country they belong to when known."""
+    name: str
+    kind: str
+    country: str | None = None
+
+    @property
+    def label(self):
+        return f'{self.name}, {self.country}' if self.country else self.name
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    ascii_text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM_RE.sub(' ', ascii_text.lower()).strip()
+
+
+def trigrams(normalized: str) -> frozenset:
+    """Padded character trigrams of a normalized string."""
+    padded = f'  {normalized} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Inverted index from trigram to the names containing it, scored by Dice similarity."""
+
+    def __init__(self, entries):
+        self._names = []
+        self._sizes = []
+        self._destinations = []
+        self._postings = {}
+        for name, destination in entries:
+            normalized = normalize_place(name)
+            if not normalized:
+                continue
+            grams = trigrams(normalized)
+            entry_id = len(self._names)
+            self._names.append(normalized)
+            self._sizes.append(len(grams))
+            self._destinations.append(destination)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(entry_id)
+        self._postings = {gram: tuple(ids) for gram, ids in self._postings.items()}
+
+    def _scores(self, normalized):
+        """Dice similarity of every entry sharing at least one trigram with the query."""
+        grams = trigrams(normalized)
+        shared = {}
+        for gram in grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared[entry_id] = shared.get(entry_id, 0) + 1
+        size = len(grams)
+        return {entry_id: 2.0 * count / (size + self._sizes[entry_id]) for entry_id, count in shared.items()}
+
+    def search(self, query: str, limit: int = 8, prefix_bonus: float = PREFIX_BONUS):
+        """Top matches as (score, Destination), best first, one result per destination."""
+        normalized = normalize_place(query)
+        if not normalized:
+            return []
+
+        best = {}
+        for entry_id, score in self._scores(normalized).items():
+            if prefix_bonus and self._names[entry_id].startswith(normalized):
+                score += prefix_bonus
+            destination = self._destinations[entry_id]
+            if score > best.get(destination, 0.0):
+                best[destination] = score
+        return heapq.nlargest(limit, ((score, destination) for destination, score in best.items()),
+                              key=lambda item: item[0])
+
+
+def edit_distance(left: str, right: str) -> int:
+    """Damerau-Levenshtein distance (optimal string alignment): insertions, deletions,
+    substitutions and swaps of adjacent characters each count as one edit."""
+    previous, current = None, list(range(len(right) + 1))
+    for i, char in enumerate(left, 1):
+        before, previous, current = previous, current, [i] + [0] * len(right)
+        for j, other in enumerate(right, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if i > 1 and j > 1 and char == right[j - 2] and left[i - 2] == other:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+def max_typos(name: str) -> int:
+    """Edits tolerated when correcting input to name: one for names of up to 8 characters, two for longer."""
+    return 1 if len(name) <= 8 else 2
+
+
+def _catalog_entries():
+    """(searchable name, Destination) pairs for catalog cities, countries, aliases and image keys."""
+    entries = []
+    seen = set()
+    for country in COUNTRIES.values():
+        destination = Destination(country.name, COUNTRY)
+        entries.append((country.name, destination))
+        seen.add(normalize_place(country.name))
+        for city in country.popular_destinations:
+            entries.append((city, Destination(city, CITY, country.name)))
+            seen.add(normalize_place(city))
+    for alias, country in COUNTRY_ALIASES.items():
+        entries.append((alias, Destination(country, COUNTRY)))
+    for key in DESTINATION_IMAGES:
+        if normalize_place(key) not in seen:
+            entries.append((key, Destination(key.title(), CITY)))
+    return entries
+
+
+def _exact_names():
+    """Normalized catalog city, country and "city country" spellings; names shared by two places map to None."""
+    names = {}
+
+    def add(name, destination):
+        key = normalize_place(name)
+        names[key] = destination if names.get(key, destination) == destination else None
+
+    for country in COUNTRIES.values():
+        add(country.name, Destination(country.name, COUNTRY))
+        for city in country.popular_destinations:
+            destination = Destination(city, CITY, country.name)
+            add(city, destination)
+            add(destination.label, destination)
+    for key in DESTINATION_IMAGES:
+        if normalize_place(key) not in names:
+            add(key, Destination(key.title(), CITY))
+    return names
+
+
+_index = TrigramIndex(_catalog_entries())
+_exact = _exact_names()
+
+
+def search_destinations(query: str, limit: int = 8):
+    """Autocomplete suggestions for partially typed or misspelled input."""
+    return _index.search(query, limit)
+
+
+def _confident_match(text: str, kind: str = None):
+    """The destination text names exactly, or the single closest name within a typo or two, else None."""
+    normalized = normalize_place(text)
+    destination = _exact.get(normalized)
+    if destination is not None:
+        return destination if kind is None or destination.kind == kind else None
+    if normalized in _exact or len(normalized) < 3:
+        return None
+
+    # Trigram similarity only picks the candidates; the edit distance decides
+    closest, best_distance = [], None
+    for _score, destination in _index.search(normalized, TYPO_CANDIDATES, prefix_bonus=0.0):
+        if kind is not None and destination.kind != kind:
+            continue
+        name = normalize_place(destination.name)
+        distance = edit_distance(normalized, name)
+        if distance > max_typos(name) or (best_distance is not None and distance > best_distance):
+            continue
+        if best_distance is None or distance < best_distance:
+            closest, best_distance = [], distance
+        closest.append(destination)
+    if len({normalize_place(destination.name) for destination in closest}) != 1:
+        # No name close enough, or a tie between two different names
+        return None
+    # A city and a country spelled the same are the same correction; the city keeps its country
+    return min(closest, key=lambda destination: destination.kind != CITY)
+
+
+def canonicalize_destination(text: str) -> str:
+    """Rewrite a typed destination to its catalog spelling, or return it unchanged.
+
+    Only whole-input matches are rewritten: "barcelonna" becomes "Barcelona" and "kyoto, japan"
+    becomes "Kyoto, Japan". Extra words ("Berlin wall"), several places ("London and Paris"),
+    qualifiers naming another country ("Paris, Texas") and anything not matched with confidence
+    pass through as typed. A bare city keeps no country, since the same name can exist elsewhere.
+    """
+    stripped = text.strip()
+    exact = _exact.get(normalize_place(stripped))
+    if exact is not None:
+        return exact.label if ',' in stripped or normalize_place(exact.label) == normalize_place(stripped) \
+            else exact.name
+    if _MULTI_PLACE_RE.search(stripped) or stripped.count(',') > 1:
+        return text
+
+    head, comma, qualifier = stripped.partition(',')
+    destination = _confident_match(head)
+    if destination is None:
+        return text
+    if not comma:
+        return destination.name
+    if destination.kind != CITY:
+        return text
+    if destination.country is None:
+        return f'{destination.name}, {qualifier.strip()}'
+    country = _confident_match(qualifier, kind=COUNTRY)
+    if country is not None and country.name == destination.country:
+        return destination.label
+    return text
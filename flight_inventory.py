@@ -0,0 +1,285 @@
+"""
+Deterministic synthetic flight inventory for the AI Travel Planner
+Every fare is a pure function of (route, day, schedule slot) and a seed, computed with a
+counter-based hash, so the same search always returns the same flights and results can be cached
+and load-tested. Fares between catalog cities are pre-generated for a window of days into
+columnar NumPy arrays sorted by route and day; searches slice a route's rows, filter them
+vectorized and take the top k. Routes or dates outside the table are generated on the fly with
+the same function, so they agree with it exactly.
+"""
+
+import os
+import threading
+import time
+import zlib
+from datetime import date
+
+import numpy as np
+
+from country_data import COUNTRIES
+from destination_search import normalize_place
+
+FLIGHT_INVENTORY_SEED = int(os.environ.get('FLIGHT_INVENTORY_SEED', 20240601))
+# Days from today covered by the pre-generated table
+FLIGHT_INVENTORY_DAYS = int(os.environ.get('FLIGHT_INVENTORY_DAYS', 30))
+
+AIRLINES = ('SkyWings', 'AirTravel', 'CloudHopper', 'JetStream', 'FlyHigh')
+# Most flights a route operates on one day
+MAX_FLIGHTS_PER_DAY = 6
+SORT_KEYS = ('price', 'duration', 'departure')
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_U64 = np.uint64
+
+
+def _mix(x):
+    """splitmix64 finalizer: a well-spread 64-bit hash of each element."""
+    x = (x ^ (x >> _U64(30))) * _U64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> _U64(27))) * _U64(0x94D049BB133111EB)
+    return x ^ (x >> _U64(31))
+
+
+def _uniform(key, stream: int):
+    """A uniform [0, 1) value per key, independent for each stream number."""
+    return (_mix(key + _U64(stream) * _GOLDEN) >> _U64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def route_hash(origin: str, destination: str) -> int:
+    """Stable 64-bit identity of a directed route between two normalized place names.
+
+    The low 32 bits depend only on the pair, so both directions share a flight length.
+    """
+    pair = zlib.crc32('|'.join(sorted((origin, destination))).encode('utf-8'))
+    return pair | zlib.crc32(f"{origin}>{destination}".encode('utf-8')) << 32
+
+
+def generate_fares(route_hashes, short_haul, days, seed=FLIGHT_INVENTORY_SEED):
+    """Columns for every flight on routes x days (ordinals), in route, day, slot order.
+
+    route_hashes and short_haul are per-route arrays; the returned 'route' column indexes them.
+    """
+    with np.errstate(over='ignore'):
+        route_hashes = np.asarray(route_hashes, dtype=np.uint64)
+        days = np.asarray(days, dtype=np.int64)
+        routes, day_count = len(route_hashes), len(days)
+        route = np.repeat(np.arange(routes, dtype=np.int32), day_count * MAX_FLIGHTS_PER_DAY)
+        day = np.tile(np.repeat(days, MAX_FLIGHTS_PER_DAY), routes)
+        slot = np.tile(np.arange(MAX_FLIGHTS_PER_DAY, dtype=np.uint64), routes * day_count)
+        hashes = route_hashes[route] ^ _U64(seed)
+
+        # How many of the route's daily slots operate on this day
+        operating = 1 + _mix(hashes ^ (day.astype(np.uint64) * _GOLDEN)) % _U64(MAX_FLIGHTS_PER_DAY)
+        keep = slot < operating
+        route, day, slot, hashes = route[keep], day[keep], slot[keep], hashes[keep]
+
+        # A slot keeps its airline, flight number, departure time and stops every day; price varies by day
+        schedule = _mix(hashes + (slot + _U64(1)) * _GOLDEN)
+        daily = _mix(schedule ^ (day.astype(np.uint64) * _U64(0xD6E8FEB86659FD93)))
+        short = np.asarray(short_haul, dtype=bool)[route]
+        pair = _mix((route_hashes[route] & _U64(0xFFFFFFFF)) ^ _U64(seed))
+        base_minutes = np.where(short, 45 + pair % _U64(150), 90 + pair % _U64(690)).astype(np.float64)
+
+        stops_draw = _uniform(schedule, 1)
+        stops = np.where(stops_draw < np.where(short, 0.85, 0.5), 0, np.where(stops_draw < 0.9, 1, 2)).astype(np.int8)
+        duration = (base_minutes * (1 + 0.15 * stops) + 55 * stops + _uniform(schedule, 2) * 30).astype(np.int16)
+        # 05:00 to 22:55 in five-minute steps
+        departure = (300 + (_uniform(schedule, 3) * 216).astype(np.int16) * 5).astype(np.int16)
+        airline = (schedule % _U64(len(AIRLINES))).astype(np.int8)
+        flight_number = (100 + (schedule >> _U64(8)) % _U64(900)).astype(np.int16)
+
+        weekday = (day + 6) % 7
+        weekend = np.where((weekday == 4) | (weekday == 6), 1.12, 1.0)
+        price = (40 + base_minutes * 0.75) * (1 - 0.12 * stops) * (0.75 + 0.6 * _uniform(daily, 4)) * weekend
+
+    return {
+        'route': route,
+        'day': day.astype(np.int32),
+        'departure': departure,
+        'duration': duration,
+        'stops': stops,
+        'airline': airline,
+        'flight_number': flight_number,
+        'price': np.rint(price).astype(np.int32),
+    }
+
+
+def _catalog_cities():
+    """(normalized name, display name, country) for every catalog city."""
+    cities = {}
+    for country in COUNTRIES.values():
+        for city in country.popular_destinations:
+            cities.setdefault(normalize_place(city), (city, country.name))
+    return cities
+
+
+def _place_key(text: str) -> str:
+    """Normalized city part of 'City' or 'City, Country'."""
+    return normalize_place(str(text).split(',')[0])
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+
+
+class FlightInventory:
+    """Pre-generated fares between catalog cities, plus on-the-fly fares for anything else."""
+
+    def __init__(self, start: date = None, days: int = FLIGHT_INVENTORY_DAYS, seed: int = FLIGHT_INVENTORY_SEED):
+        self.seed = seed
+        self.start = (start or date.today()).toordinal()
+        self.end = self.start + days
+
+        self._cities = _catalog_cities()
+        self.city_keys = tuple(self._cities)
+        self._city_index = {key: i for i, key in enumerate(self.city_keys)}
+        countries = np.array([self._cities[key][1] for key in self.city_keys])
+
+        n = len(self.city_keys)
+        origins, destinations = np.divmod(np.arange(n * n), n)
+        self._route_hashes = np.array([route_hash(self.city_keys[o], self.city_keys[d])
+                                       for o, d in zip(origins.tolist(), destinations.tolist())], dtype=np.uint64)
+        self._short_haul = countries[origins] == countries[destinations]
+        # Routes from a city to itself get no flights
+        operating = origins != destinations
+
+        started = time.perf_counter()
+        route_ids = np.flatnonzero(operating)
+        columns = generate_fares(self._route_hashes[route_ids], self._short_haul[route_ids],
+                                 np.arange(self.start, self.end), seed)
+        columns['route'] = route_ids.astype(np.int32)[columns['route']]
+        self.columns = columns
+        # Rows of route r are route_starts[r]:route_starts[r + 1]; routes are indexed origin * n + destination
+        self._route_starts = np.searchsorted(columns['route'], np.arange(n * n + 1))
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self):
+        return len(self.columns['price'])
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    def _table_rows(self, origin_index, destination_index, first_day, last_day):
+        """Column slices for one origin (and destination, if given) within the table's days."""
+        n = len(self.city_keys)
+        if destination_index is None:
+            begin, end = self._route_starts[origin_index * n], self._route_starts[origin_index * n + n]
+        else:
+            route = origin_index * n + destination_index
+            begin, end = self._route_starts[route], self._route_starts[route + 1]
+        rows = {name: column[begin:end] for name, column in self.columns.items()}
+        if destination_index is not None:
+            # Within one route rows are sorted by day, so the date range is a slice too
+            low, high = np.searchsorted(rows['day'], [first_day, last_day + 1])
+            return {name: column[low:high] for name, column in rows.items()}
+        mask = (rows['day'] >= first_day) & (rows['day'] <= last_day)
+        return {name: column[mask] for name, column in rows.items()}
+
+    def _generated_rows(self, origin_key, destination_keys, first_day, last_day):
+        """The same fares as the table would hold, for routes or days outside it."""
+        destination_keys = [key for key in destination_keys if key != origin_key]
+        origin_country = self._cities.get(origin_key, (None, None))[1]
+        hashes = [route_hash(origin_key, key) for key in destination_keys]
+        short = [origin_country is not None and self._cities.get(key, (None, None))[1] == origin_country
+                 for key in destination_keys]
+        columns = generate_fares(hashes, short, np.arange(first_day, last_day + 1), self.seed)
+        return columns, destination_keys
+
+    def search(self, origin: str, destination: str = None, departure_date: str = None, flexible_days: int = 0,
+               max_stops: int = None, max_price: float = None, sort: str = 'price', limit: int = 5):
+        """Flights matching the filters as column arrays plus destination names, best first.
+
+        departure_date is YYYY-MM-DD (today when omitted) and flexible_days widens it both ways;
+        destination None searches every catalog city. Raises ValueError for bad dates or sort keys.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        day = date.fromisoformat(departure_date).toordinal() if departure_date else date.today().toordinal()
+        first_day, last_day = day - max(0, flexible_days), day + max(0, flexible_days)
+
+        origin_key = _place_key(origin)
+        destination_key = _place_key(destination) if destination else None
+        origin_index = self._city_index.get(origin_key)
+        destination_index = self._city_index.get(destination_key) if destination_key else None
+        in_window = self.start <= first_day and last_day < self.end
+
+        if in_window and origin_index is not None and (destination_key is None or destination_index is not None):
+            if destination_index == origin_index:
+                return {name: column[:0] for name, column in self.columns.items()}, []
+            rows = self._table_rows(origin_index, destination_index, first_day, last_day)
+            n = len(self.city_keys)
+            destination_of = lambda route: self.city_keys[route % n]
+        else:
+            destination_keys = [destination_key] if destination_key else list(self.city_keys)
+            rows, keys = self._generated_rows(origin_key, destination_keys, first_day, last_day)
+            destination_of = lambda route: keys[route]
+
+        mask = np.ones(len(rows['price']), dtype=bool)
+        if max_stops is not None:
+            mask &= rows['stops'] <= max_stops
+        if max_price is not None:
+            mask &= rows['price'] <= max_price
+        if not mask.all():
+            rows = {name: column[mask] for name, column in rows.items()}
+
+        key = {'price': rows['price'], 'duration': rows['duration'],
+               'departure': rows['day'].astype(np.int64) * 1440 + rows['departure']}[sort]
+        if limit is not None and len(key) > limit:
+            top = np.argpartition(key, limit - 1)[:limit]
+            order = top[np.argsort(key[top], kind='stable')]
+        else:
+            order = np.argsort(key, kind='stable')
+        rows = {name: column[order] for name, column in rows.items()}
+        return rows, [destination_of(route) for route in rows['route'].tolist()]
+
+    def display_name(self, key: str, fallback: str) -> str:
+        """Catalog spelling of a normalized city, or the text the user typed."""
+        return self._cities[key][0] if key in self._cities else fallback
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_flight_inventory():
+    """Get the shared inventory, building the table on first use."""
+    global _inventory
+    if _inventory is None or _inventory.start != date.today().toordinal():
+        with _inventory_lock:
+            if _inventory is None or _inventory.start != date.today().toordinal():
+                _inventory = FlightInventory()
+    return _inventory
+
+
+def search_flights(origin, destination, departure_date, return_date=None, passengers=1, **filters):
+    """Search the inventory and format results like TravelService.search_flights always has."""
+    inventory = get_flight_inventory()
+    passengers = max(1, int(passengers or 1))
+    rows, destinations = inventory.search(origin, destination, departure_date, **filters)
+
+    flights = []
+    for i, destination_key in enumerate(destinations):
+        airline = AIRLINES[rows['airline'][i]]
+        code = f"{airline[:2].upper()}{rows['flight_number'][i]}"
+        flight_date = date.fromordinal(int(rows['day'][i]))
+        departure, duration = int(rows['departure'][i]), int(rows['duration'][i])
+        price = int(rows['price'][i])
+        flights.append({
+            'id': f"flight_{code}_{flight_date:%Y%m%d}_{destination_key.replace(' ', '-')}",
+            'airline': airline,
+            'flight_number': code,
+            'origin': origin,
+            'destination': destination or inventory.display_name(destination_key, destination_key),
+            'departure_date': flight_date.isoformat(),
+            'return_date': return_date,
+            'departure_time': _format_minutes(departure),
+            'arrival_time': _format_minutes(departure + duration),
+            'price': price,
+            'passengers': passengers,
+            'total_price': price * passengers,
+            'duration': f"{duration // 60}h {duration % 60}m",
+            'stops': int(rows['stops'][i]),
+            'baggage': '1 checked bag included',
+            'provider': 'FlightBooking Pro'
+        })
+    return flights
@@ -1,5 +1,17 @@
 import os
 import logging
+import threading
+import time
+
+from ai_dispatcher import DispatcherOverloaded, dispatch
+from circuit_breaker import CircuitOpenError, breaker_stream, guarded_call
+from country_data import COUNTRY_ALIASES, COUNTRY_DATA
+from keyword_index import KeywordIndex
+from markdown_render import render_markdown
+from metrics import DEFAULT_SIZE_BUCKETS, Counter, Histogram
+from request_coalescing import coalesce_prompt
+from response_cache import get_response_cache
+from similarity_index import get_similarity_index
 
 try:
     import google.generativeai as genai
@@ -8,26 +20,109 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logging.warning("Google Generative AI not available. Install with: pip install google-generativeai")
 
-def get_travel_response(user_input):
-    """Generate travel response using Gemini AI or fallback."""
-
-    # Get API key from environment
-    api_key = os.environ.get('GEMINI_API_KEY')
-
-    if not GEMINI_AVAILABLE:
-        return get_fallback_response(user_input)
-
-    if not api_key:
-        logging.warning("GEMINI_API_KEY not found. Using fallback responses.")
-        return get_fallback_response(user_input)
-
-    try:
-        # Configure Gemini
+DEFAULT_MODEL_NAME = 'gemini-pro'
+
+# Long-lived Gemini model shared by every request in this worker
+_client_lock = threading.Lock()
+_client_model = None
+_client_settings = None
+_client_overrides = {'api_key': None, 'model_name': None}
+
+def _effective_client_settings():
+    """Resolve the API key, model name and endpoint, preferring explicit overrides over the environment."""
+    api_key = _client_overrides['api_key'] or os.environ.get('GEMINI_API_KEY')
+    model_name = _client_overrides['model_name'] or os.environ.get('GEMINI_MODEL', DEFAULT_MODEL_NAME)
+    api_endpoint = os.environ.get('GEMINI_API_ENDPOINT')
+    return api_key, model_name, api_endpoint
+
+def configure_client(api_key=None, model_name=None):
+    """Reconfigure the shared Gemini client with a new API key and/or model name."""
+    with _client_lock:
+        if api_key is not None:
+            _client_overrides['api_key'] = api_key
+        if model_name is not None:
+            _client_overrides['model_name'] = model_name
+        return _build_client(*_effective_client_settings())
+
+def _build_client(api_key, model_name, api_endpoint=None):
+    """Create the shared model; callers must hold _client_lock."""
+    global _client_model, _client_settings
+
+    if not GEMINI_AVAILABLE or not api_key:
+        _client_model = None
+        _client_settings = None
+        return None
+
+    # genai.configure drops cached transports, so only call it when the settings change
+    if api_endpoint:
+        # A custom endpoint (e.g. tools/stub_gemini.py) speaks the REST transport
+        genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': api_endpoint})
+    else:
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-
-        # Enhanced prompt for better travel responses
-        travel_prompt = f"""
+    _client_model = genai.GenerativeModel(model_name)
+    _client_settings = (api_key, model_name, api_endpoint)
+    logging.info(f"Gemini client initialized with model {model_name}")
+    return _client_model
+
+def get_client():
+    """Get the shared Gemini model, rebuilding it only when the key or model name changed."""
+    settings = _effective_client_settings()
+    model = _client_model
+    if model is not None and _client_settings == settings:
+        return model
+
+    with _client_lock:
+        if _client_model is not None and _client_settings == settings:
+            return _client_model
+        return _build_client(*settings)
+
+def is_ai_available():
+    """Check whether requests will reach Gemini rather than the fallback guides."""
+    return GEMINI_AVAILABLE and get_client() is not None
+
+def warm_up_client():
+    """Build the shared client and open its upstream connection before the first request."""
+    try:
+        model = get_client()
+        if model is not None:
+            model.count_tokens('ping')
+            logging.info("Gemini client warmed up")
+    except Exception as e:
+        logging.warning(f"Gemini client warm-up failed: {e}")
+
+# Per-call instrumentation, exported on /metrics
+AI_REQUEST_SECONDS = Histogram('ai_request_duration_seconds', 'Gemini call latency, including dispatcher queueing',
+                               ['mode', 'outcome'])
+AI_STREAM_FIRST_CHUNK_SECONDS = Histogram('ai_stream_first_chunk_seconds', 'Time until the first streamed Gemini chunk')
+AI_TOKENS = Counter('ai_tokens', 'Gemini tokens, estimated at 4 characters per token when usage is not reported',
+                    ['kind'])
+AI_RESPONSE_BYTES = Histogram('ai_response_bytes', 'Size of generated Gemini responses', ['mode'],
+                              buckets=DEFAULT_SIZE_BUCKETS)
+AI_RESPONSES = Counter('ai_responses', 'Travel responses by where they came from', ['source'])
+AI_FALLBACKS = Counter('ai_fallbacks', 'Fallback guide responses by reason', ['reason'])
+
+def _record_usage(mode, prompt, text, usage=None):
+    """Count tokens and response size for a completed Gemini call."""
+    prompt_tokens = getattr(usage, 'prompt_token_count', 0) or len(prompt) // 4
+    response_tokens = getattr(usage, 'candidates_token_count', 0) or len(text) // 4
+    AI_TOKENS.inc('prompt', amount=prompt_tokens)
+    AI_TOKENS.inc('response', amount=response_tokens)
+    AI_RESPONSE_BYTES.observe(len(text.encode('utf-8')), mode)
+    AI_RESPONSES.inc('gemini')
+
+class FallbackResponse(str):
+    """A fallback guide served instead of a Gemini answer; callers must not keep it as a result."""
+
+
+def _fallback(user_input, reason):
+    """Serve the fallback guide and count why."""
+    AI_RESPONSES.inc('fallback')
+    AI_FALLBACKS.inc(reason)
+    return FallbackResponse(get_fallback_response(user_input))
+
+def _build_travel_prompt(user_input):
+    """Wrap the user request in the travel assistant instructions."""
+    return f"""
         You are an expert travel assistant. Provide detailed, helpful travel advice.
 
         User Request: {user_input}
@@ -42,26 +137,169 @@ def get_travel_response(user_input):
         Format your response in a clear, organized way with bullet points and sections where appropriate.
         """
 
-        # Generate response
-        response = model.generate_content(travel_prompt)
+def _get_cached_response(cache, user_input, similarity_text=None, kind=None):
+    """Look up an exact prompt match, then a differently worded prompt about the same trip."""
+    if cache is None:
+        return None
+
+    cached_response = cache.get(user_input)
+    if cached_response is not None:
+        AI_RESPONSES.inc('cache')
+        return cached_response
+
+    index = get_similarity_index()
+    if index is None or not similarity_text:
+        return None
+    match = index.query(similarity_text, kind)
+    if match is None:
+        return None
+    cached_response = cache.get(match[0])
+    if cached_response is not None:
+        AI_RESPONSES.inc('similar_cache')
+    return cached_response
+
+def _store_response(cache, user_input, similarity_text, text, kind=None):
+    """Cache a generated answer with its rendered HTML and index its wording for near-duplicate lookups."""
+    if cache is None:
+        return
+
+    cache.set(user_input, text, render_markdown(text))
+    index = get_similarity_index()
+    if index is not None and similarity_text:
+        index.add(similarity_text, user_input, kind)
+
+def get_travel_response(user_input, similarity_text=None, raw=False, kind=None):
+    """Generate travel response using Gemini AI or fallback.
+
+    kind ('plan', 'question', a plan section) keeps near-duplicate matches among prompts of the
+    same sort, so a question is never answered with a cached plan. raw sends user_input to Gemini as is, without the general travel assistant instructions,
+    for callers that build a complete prompt of their own (plan sections).
+    """
+
+    # Serve repeated prompts from the response cache; similarity_text is the user-entered part
+    # of the prompt and lets differently worded requests for the same trip share an answer
+    cache = get_response_cache()
+    cached_response = _get_cached_response(cache, user_input, similarity_text, kind)
+    if cached_response is not None:
+        return cached_response
+
+    # Identical prompts already in flight share one upstream call
+    return coalesce_prompt(user_input, _generate_travel_response, user_input, cache, similarity_text, raw, kind)
+
+def get_response_html(user_input, text):
+    """Rendered HTML for a response: the copy cached alongside it, or rendered now."""
+    cache = get_response_cache()
+    html = cache.get_html(user_input) if cache is not None else None
+    return html if html is not None else render_markdown(text)
+
+def _generate_travel_response(user_input, cache, similarity_text=None, raw=False, kind=None):
+    """Call Gemini for a prompt that missed the cache, storing successful answers."""
+
+    if not GEMINI_AVAILABLE:
+        return _fallback(user_input, 'unavailable')
+
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        # Reuse the long-lived client for this worker
+        model = get_client()
+        if model is None:
+            logging.warning("GEMINI_API_KEY not found. Using fallback responses.")
+            outcome = None
+            return _fallback(user_input, 'no_api_key')
+
+        # Generate response under the circuit breaker, hedging and the shared concurrency limits
+        prompt = user_input if raw else _build_travel_prompt(user_input)
+        response = guarded_call(dispatch, model.generate_content, prompt)
 
         if response.text:
+            outcome = 'ok'
+            _record_usage('generate', prompt, response.text, getattr(response, 'usage_metadata', None))
+            _store_response(cache, user_input, similarity_text, response.text, kind)
             return response.text
         else:
-            return get_fallback_response(user_input)
-
+            outcome = 'empty'
+            return _fallback(user_input, 'empty')
+
+    except DispatcherOverloaded:
+        outcome = 'overloaded'
+        raise
+    except CircuitOpenError:
+        outcome = 'circuit_open'
+        return _fallback(user_input, 'circuit_open')
     except Exception as e:
         logging.error(f"Gemini API error: {e}")
-        return get_fallback_response(user_input)
+        return _fallback(user_input, 'error')
+    finally:
+        if outcome is not None:
+            AI_REQUEST_SECONDS.observe(time.perf_counter() - started, 'generate', outcome)
 
-def get_fallback_response(user_input):
-    """Provide fallback responses when Gemini is not available."""
+def stream_travel_response(user_input, similarity_text=None, kind=None):
+    """Yield a travel response in chunks as Gemini generates it, or the fallback as one chunk."""
+
+    cache = get_response_cache()
+    cached_response = _get_cached_response(cache, user_input, similarity_text, kind)
+    if cached_response is not None:
+        yield cached_response
+        return
 
-    user_lower = user_input.lower()
+    if not GEMINI_AVAILABLE:
+        yield _fallback(user_input, 'unavailable')
+        return
+
+    chunks = []
+    usage = None
+    started = time.perf_counter()
+    # Stays 'cancelled' if the client disconnects mid-stream
+    outcome = 'cancelled'
+    try:
+        model = get_client()
+        if model is None:
+            logging.warning("GEMINI_API_KEY not found. Using fallback responses.")
+            outcome = None
+            yield _fallback(user_input, 'no_api_key')
+            return
+
+        # The dispatcher slot covers opening the stream; chunks are read outside it but the
+        # breaker watches them all
+        prompt = _build_travel_prompt(user_input)
+        stream = breaker_stream(dispatch, model.generate_content, prompt, stream=True)
+        for chunk in stream:
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+            if chunk.text:
+                if not chunks:
+                    AI_STREAM_FIRST_CHUNK_SECONDS.observe(time.perf_counter() - started)
+                chunks.append(chunk.text)
+                yield chunk.text
+        outcome = 'ok' if chunks else 'empty'
+
+    except DispatcherOverloaded:
+        outcome = 'overloaded'
+        raise
+    except CircuitOpenError:
+        outcome = 'circuit_open'
+        yield _fallback(user_input, 'circuit_open')
+        return
+    except Exception as e:
+        outcome = 'error'
+        logging.error(f"Gemini streaming API error: {e}")
+        # Only fall back if nothing has been sent yet; a partial answer is left as is
+        if not chunks:
+            yield _fallback(user_input, 'error')
+        return
+    finally:
+        if outcome is not None:
+            AI_REQUEST_SECONDS.observe(time.perf_counter() - started, 'stream', outcome)
+
+    if not chunks:
+        yield _fallback(user_input, 'empty')
+    else:
+        text = ''.join(chunks)
+        _record_usage('stream', prompt, text, usage)
+        _store_response(cache, user_input, similarity_text, text, kind)
 
-    # Destination-specific responses
-    if any(dest in user_lower for dest in ['paris', 'france']):
-        return """
+# Handcrafted destination guides
+PARIS_GUIDE = """
         🇫🇷 **Paris Travel Guide**
 
         **Best Time to Visit:** April-June, September-October
@@ -88,8 +326,7 @@ def get_fallback_response(user_input):
         • Book restaurants in advance
         """
 
-    elif any(dest in user_lower for dest in ['tokyo', 'japan']):
-        return """
+TOKYO_GUIDE = """
         🇯🇵 **Tokyo Travel Guide**
 
         **Best Time to Visit:** March-May (Cherry Blossoms), September-November
@@ -117,8 +354,7 @@ def get_fallback_response(user_input):
         • Traditional tea ceremony
         """
 
-    elif any(dest in user_lower for dest in ['london', 'uk', 'england']):
-        return """
+LONDON_GUIDE = """
         🇬🇧 **London Travel Guide**
 
         **Best Time to Visit:** May-September (warmer weather)
@@ -145,9 +381,8 @@ def get_fallback_response(user_input):
         • Sunday roast at historic pubs
         """
 
-    # Budget-related responses
-    elif any(budget in user_lower for budget in ['budget', 'cheap', 'affordable']):
-        return """
+# Budget-related advice
+BUDGET_TRAVEL_TIPS = """
         💰 **Budget Travel Tips**
 
         **Accommodation:**
@@ -173,9 +408,8 @@ def get_fallback_response(user_input):
         • Local festivals and events
         """
 
-    # Duration-specific advice
-    elif any(duration in user_lower for duration in ['weekend', '2 days', 'short']):
-        return """
+# Duration-specific advice
+WEEKEND_TRAVEL_GUIDE = """
         ⏰ **Weekend Travel Guide**
 
         **Planning Tips:**
@@ -199,9 +433,8 @@ def get_fallback_response(user_input):
         • Food and market tours
         """
 
-    # General travel advice
-    else:
-        return """
+# General travel advice
+GENERAL_TRAVEL_GUIDE = """
         🌍 **General Travel Assistance**
 
         **Planning Your Trip:**
@@ -238,4 +471,98 @@ def get_fallback_response(user_input):
         *For more specific advice, please tell me about your destination, budget, and travel preferences!*
         """
 
-    return response
\ No newline at end of file
+# Fallback template priorities; the lowest value matched anywhere in the input wins
+_PRIORITY_HANDCRAFTED = 0
+_PRIORITY_DESTINATION = 1
+_PRIORITY_COUNTRY = 2
+_PRIORITY_BUDGET = 3
+_PRIORITY_DURATION = 4
+
+# Destination names that are also everyday English words and would misfire on ordinary prose
+_AMBIGUOUS_DESTINATIONS = {'nice', 'bath'}
+
+# City guides are only used when the city itself is named; "Kyoto, Japan" gets the Kyoto guide,
+# and a bare country name or alias gets the country guide
+_HANDCRAFTED_KEYWORDS = {
+    'paris': PARIS_GUIDE,
+    'tokyo': TOKYO_GUIDE,
+    'london': LONDON_GUIDE
+}
+
+_BUDGET_KEYWORDS = ['budget', 'cheap', 'affordable']
+_DURATION_KEYWORDS = ['weekend', '2 days', 'short']
+
+def _build_country_guide(country, info, destination=None):
+    """Build a fallback travel guide from the country data."""
+    title = f"{destination}, {country}" if destination else country
+    symbol = info.get('currency_symbol', '')
+    currency = info['currency']
+
+    budget_lines = []
+    for tier in info['budget_ranges'].values():
+        label, _, details = tier['description'].partition(' - ')
+        amount = f"{symbol}{tier['min']:,}-{symbol}{tier['max']:,} {currency}/day"
+        budget_lines.append(f"        • {label} ({amount}): {details}")
+
+    destination_lines = [f"        • {name}" for name in info['popular_destinations']]
+
+    return "\n".join([
+        "",
+        f"        🌍 **{title} Travel Guide**",
+        "",
+        f"        **Best Time to Visit:** {info['best_time']}",
+        "",
+        f"        **Popular Destinations in {country}:**",
+        *destination_lines,
+        "",
+        "        **Daily Budget Guide:**",
+        *budget_lines,
+        "",
+        "        **Practical Information:**",
+        f"        • Language: {info['language']}",
+        f"        • Currency: {currency}",
+        f"        • Visa: {info['visa_info']}",
+        "",
+        "        **Cultural Tips:**",
+        f"        • {info['cultural_notes']}",
+        "        "
+    ])
+
+def _build_fallback_index():
+    """Index every destination, country and topic keyword against its fallback guide."""
+    keywords = {}
+    country_guides = {}
+
+    for country, info in COUNTRY_DATA.items():
+        country_guides[country] = _build_country_guide(country, info)
+        keywords[country] = (_PRIORITY_COUNTRY, country_guides[country])
+        for destination in info['popular_destinations']:
+            if destination.lower() not in _AMBIGUOUS_DESTINATIONS:
+                keywords[destination] = (_PRIORITY_DESTINATION, _build_country_guide(country, info, destination))
+
+    for alias, country in COUNTRY_ALIASES.items():
+        keywords[alias] = (_PRIORITY_COUNTRY, country_guides[country])
+    for keyword, guide in _HANDCRAFTED_KEYWORDS.items():
+        keywords[keyword] = (_PRIORITY_HANDCRAFTED, guide)
+    for keyword in _BUDGET_KEYWORDS:
+        keywords[keyword] = (_PRIORITY_BUDGET, BUDGET_TRAVEL_TIPS)
+    for keyword in _DURATION_KEYWORDS:
+        keywords[keyword] = (_PRIORITY_DURATION, WEEKEND_TRAVEL_GUIDE)
+
+    return KeywordIndex(keywords)
+
+_FALLBACK_INDEX = _build_fallback_index()
+
+def get_fallback_response(user_input):
+    """Provide fallback responses when Gemini is not available."""
+
+    # Single pass over the input; earlier, then longer, matches break ties within a priority
+    best_rank = None
+    best_guide = GENERAL_TRAVEL_GUIDE
+    for start, end, (priority, guide) in _FALLBACK_INDEX.find_all(user_input):
+        rank = (priority, start, start - end)
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            best_guide = guide
+
+    return best_guide
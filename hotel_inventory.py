@@ -0,0 +1,237 @@
+"""
+Seeded hotel inventory index for the AI Travel Planner
+Each city's properties are generated once from a seed and kept as NumPy columns sorted by nightly
+price, with a second ordering by rating, so price and rating ranges are array slices. Amenities are
+stored as bitmasks, so "has all of these" is one AND per property. Stays are priced night by night
+from the check-in and check-out dates, and pages come back in a stable order.
+"""
+
+import os
+import time
+import zlib
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from budget_engine import get_budget_engine
+from country_data import COUNTRIES
+from destination_search import normalize_place
+
+HOTEL_INVENTORY_SEED = int(os.environ.get('HOTEL_INVENTORY_SEED', 20240601))
+# Properties generated per city
+HOTEL_INVENTORY_SIZE = int(os.environ.get('HOTEL_INVENTORY_SIZE', 5000))
+# Cities whose indexes are kept in memory at once
+HOTEL_INVENTORY_CITIES = int(os.environ.get('HOTEL_INVENTORY_CITIES', 32))
+HOTEL_MAX_PAGE_SIZE = int(os.environ.get('HOTEL_MAX_PAGE_SIZE', 50))
+
+HOTEL_TYPES = ('Hotel', 'Resort', 'Boutique Hotel', 'Business Hotel', 'Luxury Hotel')
+NAME_PREFIXES = ('Grand', 'Central', 'Royal', 'Park', 'Harbour', 'Old Town', 'Garden', 'Riverside',
+                 'Plaza', 'Metropole', 'Palace', 'Station', 'Panorama', 'Heritage', 'City', 'Imperial')
+# Bit i of a property's amenity mask is AMENITIES[i]
+AMENITIES = ('Free WiFi', 'Pool', 'Gym', 'Spa', 'Restaurant', 'Bar', 'Room Service', 'Concierge', 'Parking',
+             'Free Breakfast', 'Airport Shuttle', 'Air Conditioning', 'Pet Friendly', 'Family Rooms',
+             'Kitchen', 'Beach Access')
+# Chance a property has each amenity at one star; each extra star adds AMENITY_STAR_BONUS
+AMENITY_BASE_CHANCE = (0.9, 0.1, 0.1, 0.0, 0.3, 0.2, 0.0, 0.0, 0.3, 0.3, 0.1, 0.5, 0.2, 0.2, 0.1, 0.05)
+AMENITY_STAR_BONUS = 0.12
+# Typical nightly rate in USD by star rating (index 1-5)
+STAR_BASE_RATE = (0, 40, 60, 95, 170, 300)
+# Friday and Saturday nights cost this much more than the listed nightly rate
+WEEKEND_MULTIPLIER = 1.15
+SORT_KEYS = ('price', 'rating')
+
+
+def amenity_mask(names) -> int:
+    """Bitmask for amenity names (case-insensitive). Raises ValueError for unknown names."""
+    lookup = {name.lower(): bit for bit, name in enumerate(AMENITIES)}
+    mask = 0
+    for name in names or ():
+        bit = lookup.get(str(name).strip().lower())
+        if bit is None:
+            raise ValueError(f"Unknown amenity: {name}")
+        mask |= 1 << bit
+    return mask
+
+
+def amenity_names(mask: int) -> list:
+    return [name for bit, name in enumerate(AMENITIES) if mask >> bit & 1]
+
+
+def stay_nights(check_in: str, check_out: str):
+    """(nights, weekend nights) for a stay given as YYYY-MM-DD dates. Raises ValueError for bad dates."""
+    first, last = date.fromisoformat(check_in), date.fromisoformat(check_out)
+    nights = (last - first).days
+    if nights < 1:
+        raise ValueError("check_out must be after check_in")
+    # Every full week has one Friday and one Saturday night; count the rest one by one
+    weekend = 2 * (nights // 7) + sum(1 for i in range(nights % 7) if (first.weekday() + i) % 7 in (4, 5))
+    return nights, weekend
+
+
+def page_bounds(page=1, page_size=6):
+    """(page, page_size) as searched: page at least 1, page size between 1 and HOTEL_MAX_PAGE_SIZE."""
+    return max(1, int(page)), max(1, min(int(page_size), HOTEL_MAX_PAGE_SIZE))
+
+
+def _city_key(destination: str) -> str:
+    """Normalized city part of 'City' or 'City, Country'."""
+    return normalize_place(str(destination).split(',')[0])
+
+
+@lru_cache(maxsize=1)
+def _price_levels() -> dict:
+    """Normalized catalog city: its country's mid-range daily budget over the catalog average."""
+    engine = get_budget_engine()
+    mid_range = engine.daily_usd[:, engine.tiers.index('mid_range')].mean(axis=1)
+    levels = mid_range / mid_range.mean()
+    return {normalize_place(city): float(levels[engine.countries.index(country.name)])
+            for country in COUNTRIES.values() for city in country.popular_destinations}
+
+
+def _cost_factor(city_key: str) -> float:
+    level = _price_levels().get(city_key)
+    # Cities outside the catalog still get a stable price level of their own
+    return level if level is not None else 0.7 + (zlib.crc32(city_key.encode('utf-8')) % 600) / 1000
+
+
+class CityHotels:
+    """Every property in one city, indexed for price, rating, star and amenity queries."""
+
+    def __init__(self, city_key: str, size: int = HOTEL_INVENTORY_SIZE, seed: int = HOTEL_INVENTORY_SEED):
+        started = time.perf_counter()
+        self.city_key = city_key
+        rng = np.random.default_rng([seed, zlib.crc32(city_key.encode('utf-8'))])
+
+        stars = rng.choice(np.arange(1, 6, dtype=np.int8), size=size, p=[0.05, 0.15, 0.35, 0.3, 0.15])
+        hotel_type = rng.integers(0, len(HOTEL_TYPES) - 1, size=size, dtype=np.int8)
+        hotel_type[(stars == 5) & (rng.random(size) < 0.4)] = HOTEL_TYPES.index('Luxury Hotel')
+        hotel_type[(stars <= 2) & (hotel_type == HOTEL_TYPES.index('Resort'))] = HOTEL_TYPES.index('Hotel')
+        prefix = rng.integers(0, len(NAME_PREFIXES), size=size, dtype=np.int8)
+
+        price = np.array(STAR_BASE_RATE, dtype=np.float64)[stars] * _cost_factor(city_key) \
+            * rng.lognormal(0, 0.3, size=size)
+        rating = np.clip(np.rint((3.1 + 0.3 * stars + rng.normal(0, 0.35, size=size)) * 10), 10, 50)
+        reviews = rng.integers(5, 2500, size=size, dtype=np.int32)
+
+        chance = np.array(AMENITY_BASE_CHANCE) + AMENITY_STAR_BONUS * (stars[:, None] - 1)
+        has = rng.random((size, len(AMENITIES))) < chance
+        amenities = (has.astype(np.uint32) << np.arange(len(AMENITIES), dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+
+        columns = {
+            'hotel': np.arange(size, dtype=np.int32),
+            'price': np.maximum(np.rint(price), 15).astype(np.int32),
+            'rating': rating.astype(np.int16),  # tenths of a point
+            'reviews': reviews,
+            'stars': stars,
+            'type': hotel_type,
+            'prefix': prefix,
+            'amenities': amenities,
+        }
+        # Rows are stored cheapest first; ties keep generation order, so pages never shuffle
+        by_price = np.argsort(columns['price'], kind='stable')
+        self.columns = {name: column[by_price] for name, column in columns.items()}
+        # Best rated first, then most reviewed, then the cheaper row
+        self._by_rating = np.lexsort((np.arange(size), -self.columns['reviews'].astype(np.int64),
+                                      -self.columns['rating'])).astype(np.int32)
+        # Negated so it ascends along the rating order, ready for searchsorted
+        self._rating_rank = -self.columns['rating'][self._by_rating]
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self):
+        return len(self.columns['price'])
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values()) + self._by_rating.nbytes + self._rating_rank.nbytes
+
+    def search(self, min_stars: int = None, max_stars: int = None, amenities=None, min_price: float = None,
+               max_price: float = None, min_rating: float = None, sort: str = 'price', page: int = 1,
+               page_size: int = 6):
+        """One page of matching properties as column arrays, plus the total number of matches.
+
+        Prices are per night in USD; amenities is a list of names every result must have.
+        Raises ValueError for unknown amenities or sort keys.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        required = np.uint32(amenity_mask(amenities))
+        page, page_size = page_bounds(page, page_size)
+        offset = (page - 1) * page_size
+
+        prices = self.columns['price']
+        if sort == 'price':
+            # Price bounds are a slice of the price-sorted rows
+            low = 0 if min_price is None else np.searchsorted(prices, min_price, side='left')
+            high = len(prices) if max_price is None else np.searchsorted(prices, max_price, side='right')
+            rows = np.arange(low, high)
+            rows_rating = self.columns['rating'][low:high] if min_rating is not None else None
+        else:
+            # Rating bound is a prefix of the rating order
+            high = len(prices) if min_rating is None else \
+                np.searchsorted(self._rating_rank, -round(min_rating * 10), side='right')
+            rows = self._by_rating[:high]
+            rows_rating = None
+
+        mask = np.ones(len(rows), dtype=bool)
+        if sort == 'rating' and (min_price is not None or max_price is not None):
+            row_prices = prices[rows]
+            if min_price is not None:
+                mask &= row_prices >= min_price
+            if max_price is not None:
+                mask &= row_prices <= max_price
+        if rows_rating is not None:
+            mask &= rows_rating >= round(min_rating * 10)
+        if min_stars is not None or max_stars is not None:
+            row_stars = self.columns['stars'][rows]
+            if min_stars is not None:
+                mask &= row_stars >= min_stars
+            if max_stars is not None:
+                mask &= row_stars <= max_stars
+        if required:
+            mask &= (self.columns['amenities'][rows] & required) == required
+
+        matches = rows[mask] if not mask.all() else rows
+        selected = matches[offset:offset + page_size]
+        return {name: column[selected] for name, column in self.columns.items()}, len(matches)
+
+
+@lru_cache(maxsize=HOTEL_INVENTORY_CITIES)
+def get_city_hotels(city_key: str) -> CityHotels:
+    """Get a city's index, generating it on first use."""
+    return CityHotels(city_key)
+
+
+def search_hotels(destination, check_in, check_out, guests=1, page=1, page_size=6, **filters):
+    """Search a city's hotels: {'hotels': one page in TravelService's hotel format, 'total': all matches,
+    'page', 'page_size'}."""
+    nights, weekend_nights = stay_nights(check_in, check_out)
+    city_key = _city_key(destination)
+    page, page_size = page_bounds(page, page_size)
+    rows, total = get_city_hotels(city_key).search(page=page, page_size=page_size, **filters)
+    city_slug = city_key.replace(' ', '-')
+    city_name = str(destination).split(',')[0].strip()
+
+    hotels = []
+    for i in range(len(rows['hotel'])):
+        hotel_type = HOTEL_TYPES[rows['type'][i]]
+        price = int(rows['price'][i])
+        hotels.append({
+            'id': f"hotel_{city_slug}_{int(rows['hotel'][i])}",
+            'name': f"{NAME_PREFIXES[rows['prefix'][i]]} {city_name} {hotel_type}",
+            'type': hotel_type,
+            'stars': int(rows['stars'][i]),
+            'destination': destination,
+            'check_in': check_in,
+            'check_out': check_out,
+            'guests': guests,
+            'nights': nights,
+            'price_per_night': price,
+            'total_price': round(price * (nights + (WEEKEND_MULTIPLIER - 1) * weekend_nights)),
+            'rating': int(rows['rating'][i]) / 10,
+            'reviews': int(rows['reviews'][i]),
+            'amenities': amenity_names(int(rows['amenities'][i])),
+            'description': f'Comfortable {hotel_type.lower()} in the heart of {city_name}',
+            'provider': 'HotelBooking Plus'
+        })
+    return {'hotels': hotels, 'total': total, 'page': page, 'page_size': page_size}
@@ -0,0 +1,111 @@
+"""
+Response compression and HTTP caching for the AI Travel Planner
+Compresses large text responses with brotli (when installed) or gzip, adds strong ETags and
+conditional-GET handling to cacheable GET responses, and serves pre-compressed static assets
+written by tools/precompress_static.py
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+    logging.info("Brotli not available, compressing with gzip only. Install with: pip install brotli")
+
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+    'application/json', 'application/xml', 'image/svg+xml'
+}
+
+# File suffix of each pre-compressed static variant, in order of preference
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _accepted_encodings():
+    """Content codings this server can produce, in preference order."""
+    return ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+
+def choose_encoding(available=None):
+    """Pick the best coding the client accepts, or None for identity."""
+    return request.accept_encodings.best_match(available or _accepted_encodings())
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content coding."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def _is_compressible(response):
+    return response.mimetype in COMPRESSIBLE_MIMETYPES and response.content_length is not None \
+        and response.content_length >= COMPRESS_MIN_SIZE
+
+
+def finalize_response(response):
+    """after_request hook: add ETag/Cache-Control to GET responses, answer conditional GETs, compress."""
+    # File responses handle their own ETags, and streamed responses (SSE, NDJSON) must not be buffered
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return response
+    if response.status_code != 200:
+        return response
+
+    compressible = COMPRESSION_ENABLED and _is_compressible(response)
+    encoding = choose_encoding() if compressible else None
+    if compressible:
+        response.vary.add('Accept-Encoding')
+
+    if request.method in ('GET', 'HEAD') and not response.get_etag()[0]:
+        # Strong ETag of the uncompressed body, suffixed so each coding is a distinct representation
+        etag = hashlib.sha256(response.get_data()).hexdigest()[:32]
+        response.set_etag(f'{etag}-{encoding}' if encoding else etag)
+        if 'Cache-Control' not in response.headers:
+            response.cache_control.no_cache = True
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding:
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Register compression and conditional-GET handling, and serve pre-compressed static files."""
+    static_view = app.view_functions['static']
+
+    def static_with_precompressed(filename):
+        encoding = choose_encoding([name for name, _ in STATIC_ENCODINGS])
+        path = safe_join(app.static_folder, filename)
+        if encoding and path and os.path.isfile(path):
+            suffix = dict(STATIC_ENCODINGS)[encoding]
+            compressed_path = path + suffix
+            # Only use the variant if it was written after the original last changed
+            if os.path.isfile(compressed_path) and os.path.getmtime(compressed_path) >= os.path.getmtime(path):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                response.vary.add('Accept-Encoding')
+                return response
+        response = static_view(filename=filename)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    app.view_functions['static'] = static_with_precompressed
+    app.after_request(finalize_response)
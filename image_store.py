@@ -0,0 +1,233 @@
+"""
+Local image store and responsive variants for destination cards
+Original photos are kept in a content-addressed disk store and resized into thumbnail, card and
+hero variants by a background pool. Cards link the local variants (served with immutable cache
+headers) once they exist and the remote Unsplash images until then. Resizing needs Pillow; without
+it every card uses responsive remote URLs.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from destination_images import get_destination_photo_ids, remote_image_url
+
+try:
+    from PIL import Image, features
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+    logging.info("Pillow not available, destination images are served from Unsplash. Install with: pip install pillow")
+
+IMAGE_STORE_ENABLED = os.environ.get('IMAGE_STORE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+IMAGE_STORE_DIR = os.environ.get('IMAGE_STORE_DIR', 'image_store')
+# Directory of originals named <photo id>.jpg used instead of downloading (local fixtures, offline installs)
+IMAGE_SOURCE_DIR = os.environ.get('IMAGE_SOURCE_DIR', '')
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+IMAGE_FETCH_TIMEOUT = float(os.environ.get('IMAGE_FETCH_TIMEOUT', 10))
+IMAGE_FORMAT = os.environ.get('IMAGE_FORMAT', 'webp').lower()
+IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 80))
+# Seconds before a photo that failed to download or convert is tried again
+IMAGE_RETRY_SECONDS = float(os.environ.get('IMAGE_RETRY_SECONDS', 300))
+
+# Variant name: width in pixels
+IMAGE_VARIANTS = {'thumb': 320, 'card': 640, 'hero': 1280}
+# Width of the original fetched from Unsplash, enough for the largest variant
+SOURCE_WIDTH = 1600
+# Local variant URLs contain the content hash, so they never change
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# format: (Pillow format, file extension, mimetype)
+IMAGE_FORMATS = {
+    'avif': ('AVIF', '.avif', 'image/avif'),
+    'webp': ('WEBP', '.webp', 'image/webp'),
+    'jpeg': ('JPEG', '.jpg', 'image/jpeg'),
+}
+
+_PHOTO_ID_RE = re.compile(r'^[0-9A-Za-z_-]+$')
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _atomic_write(path, data: bytes):
+    """Write a file so readers see either nothing or the complete contents."""
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def remote_image_set(photo_id: str) -> dict:
+    """src/srcset for a photo resized by Unsplash, used until the local variants exist."""
+    return {
+        'src': remote_image_url(photo_id, IMAGE_VARIANTS['card']),
+        'srcset': ', '.join(f"{remote_image_url(photo_id, width)} {width}w" for width in IMAGE_VARIANTS.values()),
+        'local': False
+    }
+
+
+class ImageStore:
+    """Content-addressed originals and their resized variants on disk.
+
+    Layout under root: blobs/<digest> (original bytes), variants/<digest>/<variant><ext>, and
+    refs/<photo id> holding the digest of that photo's original once all its variants exist.
+    """
+
+    def __init__(self, root=IMAGE_STORE_DIR, source_dir=IMAGE_SOURCE_DIR, workers=IMAGE_WORKERS,
+                 image_format=IMAGE_FORMAT):
+        self.root = root
+        self.source_dir = source_dir
+        if image_format not in IMAGE_FORMATS or image_format != 'jpeg' and not features.check(image_format):
+            logging.error(f"Image format {image_format} is not supported by this Pillow build, using jpeg")
+            image_format = 'jpeg'
+        self.pillow_format, self.extension, self.mimetype = IMAGE_FORMATS[image_format]
+        for directory in ('blobs', 'variants', 'refs'):
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+        self._ready = {}
+        self._pending = set()
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-store')
+
+    def _ref_path(self, photo_id):
+        return os.path.join(self.root, 'refs', photo_id)
+
+    def _variant_path(self, digest, variant):
+        return os.path.join(self.root, 'variants', digest, variant + self.extension)
+
+    def lookup(self, photo_id: str):
+        """Digest of a photo whose variants are all on disk, or None."""
+        digest = self._ready.get(photo_id)
+        if digest is not None:
+            return digest
+        try:
+            with open(self._ref_path(photo_id)) as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        # Another worker may have written the ref; variants are written before it
+        if _DIGEST_RE.match(digest) and all(os.path.isfile(self._variant_path(digest, v)) for v in IMAGE_VARIANTS):
+            self._ready[photo_id] = digest
+            return digest
+        return None
+
+    def ensure(self, photo_id: str):
+        """Return the digest if the photo is ready, otherwise queue it for processing and return None."""
+        if not _PHOTO_ID_RE.match(photo_id):
+            return None
+        digest = self.lookup(photo_id)
+        if digest is not None:
+            return digest
+        with self._lock:
+            failed_at = self._failed.get(photo_id)
+            if photo_id in self._pending or failed_at is not None and time.monotonic() - failed_at < IMAGE_RETRY_SECONDS:
+                return None
+            self._pending.add(photo_id)
+        self._executor.submit(self._process_queued, photo_id)
+        return None
+
+    def _process_queued(self, photo_id):
+        try:
+            self.process(photo_id)
+            with self._lock:
+                self._failed.pop(photo_id, None)
+        except Exception as e:
+            logging.error(f"Error preparing destination image {photo_id}: {e}")
+            with self._lock:
+                self._failed[photo_id] = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending.discard(photo_id)
+
+    def _load_original(self, photo_id):
+        """Original bytes from the local source directory, or downloaded from Unsplash."""
+        if self.source_dir:
+            for extension in ('.jpg', '.jpeg', '.png', '.webp'):
+                path = os.path.join(self.source_dir, photo_id + extension)
+                if os.path.isfile(path):
+                    with open(path, 'rb') as f:
+                        return f.read()
+        with urllib.request.urlopen(remote_image_url(photo_id, SOURCE_WIDTH), timeout=IMAGE_FETCH_TIMEOUT) as response:
+            return response.read()
+
+    def process(self, photo_id: str) -> str:
+        """Store the original and write every variant; returns the digest. Runs in the background pool."""
+        original = self._load_original(photo_id)
+        digest = hashlib.sha256(original).hexdigest()
+        blob_path = os.path.join(self.root, 'blobs', digest)
+        if not os.path.isfile(blob_path):
+            _atomic_write(blob_path, original)
+
+        os.makedirs(os.path.join(self.root, 'variants', digest), exist_ok=True)
+        with Image.open(BytesIO(original)) as image:
+            image = image.convert('RGB')
+            for variant, width in IMAGE_VARIANTS.items():
+                path = self._variant_path(digest, variant)
+                if os.path.isfile(path):
+                    continue
+                resized = image
+                if image.width > width:
+                    resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+                buffer = BytesIO()
+                resized.save(buffer, self.pillow_format, quality=IMAGE_QUALITY)
+                _atomic_write(path, buffer.getvalue())
+
+        _atomic_write(self._ref_path(photo_id), digest.encode('ascii'))
+        self._ready[photo_id] = digest
+        return digest
+
+    def variant_file(self, digest: str, filename: str):
+        """Path of a stored variant named like 'card.webp', or None for anything else."""
+        variant, extension = os.path.splitext(filename)
+        if not _DIGEST_RE.match(digest) or variant not in IMAGE_VARIANTS or extension != self.extension:
+            return None
+        path = self._variant_path(digest, variant)
+        return path if os.path.isfile(path) else None
+
+    def image_set(self, photo_id: str) -> dict:
+        """src/srcset for a photo: local variants when ready, otherwise remote (and queue the photo)."""
+        digest = self.ensure(photo_id)
+        if digest is None:
+            return remote_image_set(photo_id)
+        urls = {variant: f"/images/{digest}/{variant}{self.extension}" for variant in IMAGE_VARIANTS}
+        return {
+            'src': urls['card'],
+            'srcset': ', '.join(f"{urls[variant]} {width}w" for variant, width in IMAGE_VARIANTS.items()),
+            'local': True
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_image_store():
+    """Get the image store, or None when it is disabled or Pillow is not installed."""
+    global _store
+    if not (IMAGE_STORE_ENABLED and PILLOW_AVAILABLE):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ImageStore()
+    return _store
+
+
+def get_destination_image_sets(destination_names) -> list:
+    """Responsive image sources for a list of destinations, resolved in one call."""
+    store = get_image_store()
+    photo_ids = get_destination_photo_ids(destination_names)
+    if store is None:
+        return [remote_image_set(photo_id) for photo_id in photo_ids]
+    return [store.image_set(photo_id) for photo_id in photo_ids]
@@ -21,6 +21,7 @@ def main():
         "flask",
         "flask-sqlalchemy", 
         "google-generativeai",
+        "numpy",
         "python-dotenv",
         "requests"
     ]
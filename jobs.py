@@ -0,0 +1,198 @@
+"""
+Background plan generation jobs for the AI Travel Planner
+POST returns a job id immediately while a local thread pool runs the AI request; jobs and
+their results are stored in SQLite so any worker can answer a poll and a repeated submission
+of the same request returns the existing job instead of generating again (unless that job
+only produced a fallback guide)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_dispatcher import DispatcherOverloaded
+from gemini import FallbackResponse
+from response_cache import make_cache_key
+
+JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', 'jobs.db')
+JOBS_WORKERS = int(os.environ.get('JOBS_WORKERS', 4))
+JOBS_TTL_SECONDS = int(os.environ.get('JOBS_TTL', 24 * 60 * 60))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+# Finished with a fallback guide because Gemini was unavailable; reported as done but never
+# reused for a repeated request, so the next submission tries Gemini again
+FALLBACK = 'fallback'
+
+_CLEANUP_INTERVAL_SECONDS = 300
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite table of jobs shared by every worker process."""
+
+    def __init__(self, path: str = JOBS_DB_PATH, ttl_seconds: int = JOBS_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                request_key TEXT NOT NULL,
+                request TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                owner_pid INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_request_key ON jobs (request_key)')
+
+    def create_or_get(self, kind: str, request_key: str, request_data: dict):
+        """Create a queued job, or return (id, False) for a live or finished job with the same request."""
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE serializes the lookup and insert across worker processes
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT id, status, owner_pid FROM jobs WHERE request_key = ? AND kind = ? '
+                    'AND status NOT IN (?, ?) AND updated_at > ? ORDER BY created_at DESC LIMIT 1',
+                    (request_key, kind, FAILED, FALLBACK, now - self.ttl_seconds)
+                ).fetchone()
+                if row is not None and (row[1] == DONE or _pid_alive(row[2])):
+                    self._conn.execute('COMMIT')
+                    return row[0], False
+
+                job_id = uuid.uuid4().hex
+                self._conn.execute(
+                    'INSERT INTO jobs (id, kind, request_key, request, status, owner_pid, created_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, kind, request_key, json.dumps(request_data), QUEUED, os.getpid(), now, now)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        self._maybe_cleanup(now)
+        return job_id, True
+
+    def update(self, job_id: str, status: str, result=None, error=None):
+        """Set a job's status and, when finished, its result or error."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?',
+                (status, result, error, time.time(), job_id)
+            )
+
+    def get(self, job_id: str):
+        """Return a job as a dict, or None if it does not exist or has expired."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, kind, request, status, result, error, owner_pid, created_at, updated_at '
+                'FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip(('id', 'kind', 'request', 'status', 'result', 'error', 'owner_pid', 'created_at',
+                        'updated_at'), row))
+        if time.time() - job['updated_at'] > self.ttl_seconds:
+            return None
+        job['request'] = json.loads(job['request'])
+        job['fallback'] = job['status'] == FALLBACK
+        if job['fallback']:
+            job['status'] = DONE
+        if job['status'] in (QUEUED, RUNNING) and not _pid_alive(job['owner_pid']):
+            # The worker that owned the job exited before finishing it
+            job['status'] = FAILED
+            job['error'] = 'The job was interrupted. Please submit it again.'
+            self.update(job_id, FAILED, error=job['error'])
+        return job
+
+    def _maybe_cleanup(self, now):
+        """Drop expired jobs every few minutes."""
+        if now - self._last_cleanup < _CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = now
+        with self._lock:
+            self._conn.execute('DELETE FROM jobs WHERE updated_at < ?', (now - self.ttl_seconds,))
+
+
+class JobRunner:
+    """Run submitted jobs on a local thread pool and record their results in the store."""
+
+    def __init__(self, store: JobStore, max_workers: int = JOBS_WORKERS):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='plan-job')
+        self._finished = threading.Condition()
+
+    def submit(self, kind: str, request_data: dict, fn, *args):
+        """Queue fn(*args) as a job keyed by its request; returns (job_id, created)."""
+        request_key = make_cache_key(json.dumps(request_data, sort_keys=True))
+        job_id, created = self.store.create_or_get(kind, request_key, request_data)
+        if created:
+            self._executor.submit(self._run, job_id, fn, *args)
+        return job_id, created
+
+    def _run(self, job_id, fn, *args):
+        self.store.update(job_id, RUNNING)
+        try:
+            result = fn(*args)
+            self.store.update(job_id, FALLBACK if isinstance(result, FallbackResponse) else DONE, result=result)
+        except DispatcherOverloaded:
+            self.store.update(job_id, FAILED, error='The travel assistant is busy right now. Please try again shortly.')
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {e}")
+            self.store.update(job_id, FAILED, error='Failed to generate travel plan. Please try again.')
+        with self._finished:
+            self._finished.notify_all()
+
+    def wait(self, job_id: str, timeout: float):
+        """Block until the job finishes or the timeout passes, then return it."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in (DONE, FAILED) or remaining <= 0:
+                return job
+            # Jobs run by this worker wake us directly; other workers' jobs are re-read from the store
+            with self._finished:
+                self._finished.wait(min(remaining, 0.5))
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """Get the process-wide job runner, creating its store on first use."""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = JobRunner(JobStore())
+    return _runner
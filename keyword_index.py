@@ -0,0 +1,80 @@
+"""
+Aho-Corasick keyword automaton
+Finds every occurrence of a fixed keyword set in a single pass over the text
+"""
+
+from collections import deque
+
+
+class KeywordIndex:
+    """Multi-keyword matcher built once; matching is linear in the length of the text."""
+
+    def __init__(self, keywords, whole_words=True):
+        """Build the automaton from a mapping of keyword -> payload (keywords are lowercased)."""
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for keyword, payload in keywords.items():
+            self._add(keyword.lower(), payload)
+        self._build_failure_links()
+
+    def _add(self, keyword, payload):
+        """Insert a keyword into the trie."""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + ((len(keyword), payload),)
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text):
+        """Return (start, end, payload) for every keyword occurrence in text (lowercased)."""
+        text = text.lower()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        matches = []
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in output[state]:
+                start = index - length + 1
+                end = index + 1
+                if self.whole_words and not _is_word_boundary(text, start, end):
+                    continue
+                matches.append((start, end, payload))
+
+        return matches
+
+
+def _is_word_boundary(text, start, end):
+    """Check that a match is not part of a longer word."""
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum():
+        return False
+    return True
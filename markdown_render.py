@@ -0,0 +1,96 @@
+"""
+Markdown to HTML rendering for AI responses
+A single-pass, line-based renderer for the markdown subset Gemini and the fallback guides use
+(bold, italics, headings, bullet and numbered lists, paragraphs). Text is HTML-escaped before
+any markup is added, and the renderer can be fed streamed chunks as they arrive.
+"""
+
+import html
+import re
+from functools import lru_cache
+
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'(?<![\*\w])\*(?!\s)([^*]+?)\*(?!\*)')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*)$')
+_BULLET_RE = re.compile(r'^(?:[•\-\*])\s+(.*)$')
+_NUMBERED_RE = re.compile(r'^\d+[.)]\s+(.*)$')
+
+# Response headings sit inside a card, so markdown levels start at h4
+_HEADING_TAGS = ('h4', 'h5', 'h6', 'h6', 'h6', 'h6')
+
+
+def render_inline(line: str) -> str:
+    """Escape one line of text and apply bold and italic markup."""
+    text = html.escape(line, quote=False)
+    if '*' not in text:
+        return text
+    text = _BOLD_RE.sub(r'<strong>\1</strong>', text)
+    return _ITALIC_RE.sub(r'<em>\1</em>', text)
+
+
+class IncrementalMarkdownRenderer:
+    """Render markdown fed in chunks, returning the HTML for each completed line as it arrives.
+
+    Concatenating every feed() result and close() gives the full document; a prefix of that
+    output is safe to show while streaming because browsers close any open list or paragraph.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._block = None
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text and return HTML for the lines it completed."""
+        self._pending += chunk
+        if '\n' not in self._pending:
+            return ''
+        *lines, self._pending = self._pending.split('\n')
+        return ''.join(self._render_line(line) for line in lines)
+
+    def close(self) -> str:
+        """Render any unfinished line and close the open block."""
+        parts = []
+        if self._pending:
+            parts.append(self._render_line(self._pending))
+            self._pending = ''
+        parts.append(self._switch_block(None))
+        return ''.join(parts)
+
+    def _switch_block(self, block):
+        """Close the current block and open a new one when the block type changes."""
+        if block == self._block:
+            return ''
+        html_parts = f'</{self._block}>' if self._block else ''
+        if block:
+            html_parts += f'<{block}>'
+        self._block = block
+        return html_parts
+
+    def _render_line(self, line):
+        stripped = line.strip()
+        if not stripped:
+            return self._switch_block(None)
+
+        match = _BULLET_RE.match(stripped)
+        if match:
+            return self._switch_block('ul') + f'<li>{render_inline(match.group(1))}</li>'
+
+        match = _NUMBERED_RE.match(stripped)
+        if match:
+            return self._switch_block('ol') + f'<li>{render_inline(match.group(1))}</li>'
+
+        match = _HEADING_RE.match(stripped)
+        if match:
+            tag = _HEADING_TAGS[len(match.group(1)) - 1]
+            return self._switch_block(None) + f'<{tag}>{render_inline(match.group(2))}</{tag}>'
+
+        if self._block == 'p':
+            return f'<br>{render_inline(stripped)}'
+        return self._switch_block('p') + render_inline(stripped)
+
+
+@lru_cache(maxsize=256)
+def render_markdown(text: str) -> str:
+    """Render a complete response to HTML (memoized, so fallback guides are rendered once)."""
+    renderer = IncrementalMarkdownRenderer()
+    return renderer.feed(text) + renderer.close()
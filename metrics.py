@@ -0,0 +1,321 @@
+"""
+Lightweight metrics for the AI Travel Planner
+Counters, gauges and histograms rendered in the Prometheus text format. When METRICS_DIR is
+set, each worker process periodically writes a snapshot there and /metrics aggregates all of
+them, so numbers are correct across gunicorn workers.
+"""
+
+import bisect
+import glob
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+DEFAULT_SIZE_BUCKETS = (256, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+_registry = []
+_collectors = []
+_registry_lock = threading.Lock()
+
+
+class _Metric:
+    """Base class holding label handling and registration."""
+
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(value) for value in labels)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name + '_total', key, value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def set(self, value, *labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with sum and count."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def time(self, *labels):
+        """Context manager observing the elapsed wall time."""
+        return _Timer(self, labels)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((self.name + '_bucket', key + (_format_bound(bound),), cumulative))
+            samples.append((self.name + '_sum', key, total))
+            samples.append((self.name + '_count', key, cumulative))
+        return samples
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+def _format_bound(bound):
+    if bound == math.inf:
+        return '+Inf'
+    return repr(float(bound))
+
+
+def register_collector(collect):
+    """Register a callable read at snapshot time, returning (name, help, type, labelnames, {labels: value}) families.
+
+    A family may carry a sixth item, 'max', for gauges of state every worker shares (e.g. a
+    database's size), which are merged across workers by taking the largest value instead of the sum.
+    """
+    with _registry_lock:
+        _collectors.append(collect)
+
+
+def register_stats(prefix, documentation, stats_fn, counters=(), exclude=(), shared=()):
+    """Expose a get_*_stats() style dict: keys in counters become counters, other numbers gauges.
+
+    String values are exported as a state gauge ({prefix}_{key}{key="value"} 1). Ratios and
+    maxima do not sum across workers, so leave them out via exclude. Keys in shared are gauges
+    that every worker reads from the same place, so workers report the same value and it must not be summed.
+    """
+    def collect():
+        stats = stats_fn() or {}
+        for key, value in stats.items():
+            if key in exclude:
+                continue
+            name = f'{prefix}_{key}'
+            if key in counters and name.endswith('_total'):
+                name = name[:-len('_total')]
+            if isinstance(value, str):
+                yield name, f'{documentation}: {key}', 'gauge', (key,), {(value,): 1}
+            elif isinstance(value, (int, float)):
+                metric_type = 'counter' if key in counters else 'gauge'
+                values = {(): int(value) if isinstance(value, bool) else value}
+                family = (name, f'{documentation}: {key}', metric_type, (), values)
+                yield family + ('max',) if key in shared else family
+
+    register_collector(collect)
+
+
+def _snapshot():
+    """All metric families of this process as plain data."""
+    families = {}
+    with _registry_lock:
+        metrics = list(_registry)
+        collectors = list(_collectors)
+
+    for metric in metrics:
+        families[metric.name] = {
+            'type': metric.type,
+            'help': metric.documentation,
+            'labelnames': list(metric.labelnames),
+            'samples': [[sample, list(key), value] for sample, key, value in metric.samples()]
+        }
+
+    for collect in collectors:
+        try:
+            collected = list(collect())
+        except Exception as e:
+            logging.warning(f"Metrics collector failed: {e}")
+            continue
+        for name, documentation, metric_type, labelnames, values, *aggregate in collected:
+            sample_name = name + '_total' if metric_type == 'counter' else name
+            families[name] = {
+                'type': metric_type,
+                'help': documentation,
+                'labelnames': list(labelnames),
+                'samples': [[sample_name, [str(v) for v in key], value] for key, value in values.items()]
+            }
+            if aggregate:
+                families[name]['aggregate'] = aggregate[0]
+    return families
+
+
+def _snapshot_path(pid):
+    return os.path.join(METRICS_DIR, f'metrics_{pid}.json')
+
+
+def flush():
+    """Write this process's snapshot to METRICS_DIR (atomically)."""
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    payload = {'pid': os.getpid(), 'time': time.time(), 'families': _snapshot()}
+    fd, tmp_path = tempfile.mkstemp(dir=METRICS_DIR, prefix='.metrics_', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, _snapshot_path(os.getpid()))
+
+
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def ensure_flusher():
+    """Start the periodic snapshot writer once per process (including after a fork)."""
+    global _flusher_pid
+    if not METRICS_DIR or _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError as e:
+            logging.warning(f"Metrics flush failed: {e}")
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _aggregate_snapshots():
+    """Merge snapshots of every worker: counters and histograms are summed; gauges only from live workers,
+    and shared-state gauges take the largest value rather than the sum."""
+    flush()
+    merged = {}
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics_*.json')):
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _pid_alive(payload['pid'])
+        for name, family in payload['families'].items():
+            if family['type'] == 'gauge' and not alive:
+                continue
+            target = merged.setdefault(name, {**family, 'samples': {}})
+            for sample, key, value in family['samples']:
+                sample_key = (sample, tuple(key))
+                if sample_key not in target['samples']:
+                    target['samples'][sample_key] = value
+                elif family.get('aggregate') == 'max':
+                    target['samples'][sample_key] = max(target['samples'][sample_key], value)
+                else:
+                    target['samples'][sample_key] += value
+    return {
+        name: {**family, 'samples': [[s, list(k), v] for (s, k), v in family['samples'].items()]}
+        for name, family in merged.items()
+    }
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_latest():
+    """Render all metrics (aggregated across workers when METRICS_DIR is set) in Prometheus text format."""
+    families = _aggregate_snapshots() if METRICS_DIR else _snapshot()
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {_escape(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family['labelnames']
+        for sample, key, value in family['samples']:
+            names = labelnames + ['le'] if sample.endswith('_bucket') else labelnames
+            labels = ','.join(f'{label}="{_escape(v)}"' for label, v in zip(names, key))
+            lines.append(f"{sample}{{{labels}}} {value}" if labels else f"{sample} {value}")
+    return '\n'.join(lines) + '\n'
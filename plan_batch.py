@@ -0,0 +1,51 @@
+"""
+Bulk travel plan generation
+Runs a deduplicated list of plan requests on a shared pool, keeping at most a fixed number
+of each batch's requests in flight and yielding results in completion order
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 100))
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', 4))
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 16))
+
+_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='plan-batch')
+
+
+def dedupe_requests(items, key_fn):
+    """Group items that share key_fn(item), returning the groups as lists in first-seen order."""
+    groups = {}
+    for item in items:
+        groups.setdefault(key_fn(item), []).append(item)
+    return list(groups.values())
+
+
+def iter_batch_results(tasks, fn, max_concurrency=BATCH_MAX_CONCURRENCY):
+    """Run fn(task) for each task with at most max_concurrency in flight.
+
+    Yields (task, result, error) as each call finishes; error is the raised exception or None.
+    """
+    pending_tasks = iter(tasks)
+    in_flight = {}
+
+    def submit_next():
+        task = next(pending_tasks, None)
+        if task is not None:
+            in_flight[_executor.submit(fn, task)] = task
+
+    for _ in range(max(1, max_concurrency)):
+        submit_next()
+    try:
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = in_flight.pop(future)
+                submit_next()
+                error = future.exception()
+                yield task, None if error else future.result(), error
+    finally:
+        # The client went away: drop anything that has not started
+        for future in in_flight:
+            future.cancel()
@@ -0,0 +1,116 @@
+"""
+Parallel section fan-out for travel plan generation
+Splits a travel plan into smaller per-section AI requests that run concurrently and are
+merged back in order; each section prompt only carries the fields it depends on, so
+sections like culture and packing are cached across durations and budgets
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from gemini import FallbackResponse, get_travel_response, is_ai_available
+
+FANOUT_ENABLED = os.environ.get('PLAN_FANOUT_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+FANOUT_WORKERS = int(os.environ.get('PLAN_FANOUT_WORKERS', 8))
+
+# (key, title, request, form fields the section depends on), in plan order
+PLAN_SECTIONS = (
+    ('weather', 'Best Time to Visit & Weather',
+     'the best time to visit and what weather to expect through the year', ('destination',)),
+    ('itinerary', 'Daily Itinerary',
+     'a day-by-day itinerary with specific activities', ('destination', 'duration', 'interests', 'additional_info')),
+    ('budget', 'Budget Breakdown',
+     'a budget breakdown for accommodation, food, activities and transport', ('destination', 'duration', 'budget')),
+    ('attractions', 'Must-See Attractions & Hidden Gems',
+     'must-see attractions and lesser-known hidden gems', ('destination', 'interests')),
+    ('cuisine', 'Local Cuisine',
+     'local dishes to try and where to try them', ('destination', 'budget')),
+    ('transport', 'Getting Around',
+     'transportation options and tips for getting around', ('destination', 'budget')),
+    ('culture', 'Cultural Insights & Travel Tips',
+     'cultural insights, etiquette and practical travel tips', ('destination',)),
+    ('packing', 'Packing Suggestions',
+     'packing suggestions', ('destination',)),
+)
+
+_FIELD_LABELS = {
+    'destination': 'Destination',
+    'duration': 'Duration',
+    'budget': 'Budget',
+    'interests': 'Interests',
+    'additional_info': 'Additional Information'
+}
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix='plan-section')
+
+
+def build_section_prompt(section, fields):
+    """Build the prompt for one plan section from only the fields it depends on."""
+    _, title, request, depends_on = section
+    details = '\n'.join(
+        f"        {_FIELD_LABELS[name]}: {fields[name]}" for name in depends_on if fields.get(name)
+    )
+    return f"""
+        You are an expert travel assistant writing one section of a travel plan.
+        Write only the "{title}" section.
+{details}
+
+        Cover {request}. Do not cover other parts of the trip; the other sections are written separately.
+        Format it with bullet points and short sub-headings where appropriate.
+        """
+
+
+def _section_similarity_text(section, fields):
+    """The user-entered fields a section depends on, for near-duplicate cache lookups."""
+    key, _, _, depends_on = section
+    return ' '.join([key] + [fields[name] for name in depends_on if fields.get(name)])
+
+
+def _generate_section(index, section, fields):
+    """Generate one section; runs on the fan-out pool."""
+    # Sent without the general travel wrapper, whose "comprehensive response" instructions would
+    # pull every section back into a whole plan
+    key, title, _, _ = section
+    text = get_travel_response(build_section_prompt(section, fields), _section_similarity_text(section, fields),
+                               raw=True, kind=f'section:{key}')
+    return index, key, title, text
+
+
+def iter_plan_sections(fields):
+    """Yield (index, key, title, text) for each plan section as soon as it completes."""
+    futures = [
+        _executor.submit(_generate_section, index, section, fields)
+        for index, section in enumerate(PLAN_SECTIONS)
+    ]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def merge_plan_sections(sections):
+    """Merge completed sections in plan order, dropping repeated fallback text."""
+    seen = set()
+    parts = []
+    for _, _, title, text in sorted(sections):
+        if text in seen:
+            continue
+        seen.add(text)
+        parts.append(f"**{title}**\n\n{text.strip()}")
+    return '\n\n'.join(parts)
+
+
+def generate_plan_sections(fields):
+    """Generate every section in parallel and return the merged plan (a FallbackResponse if any section fell back)."""
+    sections = list(iter_plan_sections(fields))
+    merged = merge_plan_sections(sections)
+    return FallbackResponse(merged) if any(isinstance(text, FallbackResponse) for *_, text in sections) else merged
+
+
+def use_fanout(requested_mode=None):
+    """Decide whether a plan request should be fanned out into parallel sections."""
+    if requested_mode:
+        return requested_mode == 'sections' and is_ai_available()
+    return FANOUT_ENABLED and is_ai_available()
@@ -0,0 +1,151 @@
+"""
+Per-session and per-IP rate limiting for AI routes
+Each client gets a token bucket per limit, kept in an LRU map so checks are O(1) and memory is
+bounded; buckets idle long enough to have refilled are dropped since they hold no state.
+Limits apply per worker process.
+"""
+
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request, session
+
+from metrics import Counter
+from token_bucket import TokenBucket
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))
+
+# name: (requests per minute per session, per IP, burst per session); IP buckets get a proportionally larger burst
+RATE_LIMITS = {
+    'ai': (float(os.environ.get('RATE_LIMIT_AI_PER_MINUTE', 10)),
+           float(os.environ.get('RATE_LIMIT_AI_PER_MINUTE_PER_IP', 30)),
+           float(os.environ.get('RATE_LIMIT_AI_BURST', 5))),
+    'batch': (float(os.environ.get('RATE_LIMIT_BATCH_PER_MINUTE', 2)),
+              float(os.environ.get('RATE_LIMIT_BATCH_PER_MINUTE_PER_IP', 6)),
+              float(os.environ.get('RATE_LIMIT_BATCH_BURST', 2))),
+}
+
+RATE_LIMIT_MESSAGE = 'Too many requests. Please wait a moment and try again.'
+
+RATE_LIMITED = Counter('rate_limited_requests', 'Requests rejected by the rate limiter', ['limit', 'key_type'])
+
+
+class RateLimiter:
+    """Token buckets keyed by client, with LRU eviction of idle buckets."""
+
+    def __init__(self, requests_per_minute: float, burst: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1.0, burst)
+        self.max_keys = max_keys
+        # A bucket unused for this long has refilled completely, so dropping it changes nothing
+        self.idle_seconds = self.burst / self.rate if self.rate > 0 else float('inf')
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key, cost: float = 1.0) -> float:
+        """Take cost tokens for key; return 0 if allowed, otherwise the seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            else:
+                self._buckets.move_to_end(key)
+            self._evict(now)
+        return bucket.try_acquire(cost)
+
+    def release(self, key, cost: float = 1.0):
+        """Give back tokens taken by check() for a request that was rejected elsewhere."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.release(cost)
+
+    def _evict(self, now):
+        """Drop idle buckets from the LRU end, and the oldest ones beyond max_keys; callers hold the lock."""
+        while self._buckets:
+            oldest_key, oldest = next(iter(self._buckets.items()))
+            # bucket.updated is the time of its last check
+            if len(self._buckets) <= self.max_keys and now - oldest.updated < self.idle_seconds:
+                break
+            del self._buckets[oldest_key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+def build_limiters(limits=RATE_LIMITS):
+    """(per-session, per-IP) limiters for each named limit."""
+    return {
+        name: (RateLimiter(per_session, burst), RateLimiter(per_ip, burst * per_ip / max(per_session, 1)))
+        for name, (per_session, per_ip, burst) in limits.items()
+    }
+
+
+_limiters = build_limiters()
+
+
+def _session_key():
+    """A random id stored in the Flask session cookie."""
+    if 'rate_limit_id' not in session:
+        session['rate_limit_id'] = uuid.uuid4().hex
+    return session['rate_limit_id']
+
+
+def rate_limit_capacity(name: str) -> float:
+    """The most tokens one request can take from the named limit (its per-session burst)."""
+    return _limiters[name][0].burst
+
+
+def check_rate_limit(name: str, cost: float = 1.0) -> float:
+    """Take cost tokens from the named limit for the current request; returns 0 or the seconds to wait."""
+    session_limiter, ip_limiter = _limiters[name]
+    ip_key = request.remote_addr or 'unknown'
+    # The IP bucket is checked first so clients that drop their cookie are still limited
+    wait = ip_limiter.check(ip_key, cost)
+    if wait:
+        RATE_LIMITED.inc(name, 'ip')
+        return wait
+    wait = session_limiter.check(_session_key(), cost)
+    if wait:
+        RATE_LIMITED.inc(name, 'session')
+        ip_limiter.release(ip_key, cost)
+    return wait
+
+
+def rate_limit_response(wait: float, message: str = RATE_LIMIT_MESSAGE):
+    """A 429 JSON response telling the client how long to wait."""
+    retry_after = max(1, math.ceil(wait)) if wait != float('inf') else 60
+    response = jsonify({'error': message, 'retry_after': retry_after})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limited(name: str):
+    """Decorate a view so requests over the named limit get 429 with Retry-After."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if RATE_LIMIT_ENABLED:
+                wait = check_rate_limit(name)
+                if wait:
+                    return rate_limit_response(wait)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_rate_limiter_stats() -> dict:
+    """Get the number of tracked clients per limit for this process."""
+    return {
+        f'{name}_{key_type}_keys': len(limiter)
+        for name, limiters in _limiters.items()
+        for key_type, limiter in zip(('session', 'ip'), limiters)
+    }
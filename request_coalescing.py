@@ -0,0 +1,87 @@
+"""
+Single-flight coalescing for AI requests
+Concurrent callers asking for the same normalized prompt share one upstream call
+"""
+
+import threading
+
+from response_cache import make_cache_key
+
+
+class _Call:
+    """An upstream call in flight and the callers waiting on it."""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; duplicate callers wait and share the result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced_waiters = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call fn for key, or wait for the identical call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced_waiters += 1
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        """Get coalescing counters for this process."""
+        return {
+            'leaders': self.leaders,
+            'coalesced_waiters': self.coalesced_waiters,
+            'in_flight': self.in_flight()
+        }
+
+
+_prompt_flight = SingleFlight()
+
+
+def coalesce_prompt(prompt, fn, *args, **kwargs):
+    """Coalesce identical concurrent AI calls keyed by the normalized prompt."""
+    return _prompt_flight.do(make_cache_key(prompt), fn, *args, **kwargs)
+
+
+def get_coalescing_stats() -> dict:
+    """Get coalescing counters for the shared prompt single-flight group."""
+    return _prompt_flight.stats()
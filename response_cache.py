@@ -0,0 +1,165 @@
+"""
+Persistent response cache for the AI Travel Planner
+Stores Gemini responses and their rendered HTML on disk (SQLite) keyed by a normalized prompt,
+with TTL and LRU eviction
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH', 'response_cache.db')
+CACHE_TTL_SECONDS = int(os.environ.get('RESPONSE_CACHE_TTL', 24 * 60 * 60))
+CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt so trivially different requests share a cache entry."""
+    return _WHITESPACE_RE.sub(' ', prompt or '').strip().lower()
+
+
+def make_cache_key(prompt: str) -> str:
+    """Build a stable cache key from the normalized prompt."""
+    return hashlib.sha256(normalize_prompt(prompt).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache with per-entry TTL and least-recently-used eviction."""
+
+    def __init__(self, path: str = CACHE_PATH, ttl_seconds: int = CACHE_TTL_SECONDS,
+                 max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                prompt TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL,
+                html TEXT
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(responses)')}
+        if 'html' not in columns:
+            # Caches created before rendered HTML was stored
+            self._conn.execute('ALTER TABLE responses ADD COLUMN html TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)')
+        self._conn.commit()
+
+    def get(self, prompt: str):
+        """Return the cached response for a prompt, or None on a miss or expired entry."""
+        key = make_cache_key(prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET last_accessed = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def get_html(self, prompt: str):
+        """Return the rendered HTML stored with a prompt's response, or None (not counted as a lookup)."""
+        key = make_cache_key(prompt)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT html, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return row[0]
+
+    def set(self, prompt: str, response: str, html: str = None):
+        """Store a response (and optionally its rendered HTML) and evict expired and least recently used entries."""
+        key = make_cache_key(prompt)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, prompt, response, created_at, last_accessed, html) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, normalize_prompt(prompt), response, now, now, html)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the oldest entries beyond max_entries."""
+        expired = self._conn.execute(
+            'DELETE FROM responses WHERE created_at < ?', (now - self.ttl_seconds,)
+        ).rowcount
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY last_accessed ASC LIMIT ?)',
+                (overflow,)
+            )
+        self.evictions += expired + max(overflow, 0)
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for this process and the current entry count."""
+        with self._lock:
+            (entries,) = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Get the process-wide response cache, or None when caching is disabled or unavailable."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = ResponseCache()
+                except sqlite3.Error as e:
+                    logging.error(f"Response cache unavailable: {e}")
+                    return None
+    return _cache
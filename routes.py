@@ -1,30 +1,36 @@
-
-from flask import render_template, request, jsonify
+from flask import render_template, request, jsonify, Response, g, send_file, stream_with_context
 from app import app
-from gemini import get_travel_response
+from gemini import get_response_html, get_travel_response, stream_travel_response
+from ai_dispatcher import DispatcherOverloaded, get_dispatcher_stats
+from circuit_breaker import get_breaker_stats
+from request_coalescing import get_coalescing_stats
+from response_cache import get_response_cache, make_cache_key
+from similarity_index import get_similarity_index
+from plan_sections import generate_plan_sections, iter_plan_sections, use_fanout
+from jobs import DONE, FAILED, get_job_runner
+from rate_limiter import (RATE_LIMIT_ENABLED, check_rate_limit, get_rate_limiter_stats, rate_limit_capacity,
+                          rate_limit_response, rate_limited)
+from markdown_render import IncrementalMarkdownRenderer, render_markdown
+from plan_batch import BATCH_MAX_CONCURRENCY, BATCH_MAX_ITEMS, dedupe_requests, iter_batch_results
+from destination_search import canonicalize_destination, search_destinations
+from budget_engine import get_budget_engine
+from hotel_inventory import search_hotels
+from image_store import IMMUTABLE_MAX_AGE, get_destination_image_sets, get_image_store
+import metrics
+import json
 import logging
+import time
+from functools import partial
 
-@app.route('/')
-def index():
-    """Homepage with travel assistant interface."""
-    return render_template('index.html')
-
-@app.route('/generate_plan', methods=['POST'])
-def generate_plan():
-    """Generate AI travel plan based on user input."""
-    try:
-        # Get form data
-        destination = request.form.get('destination', '').strip()
-        duration = request.form.get('duration', '').strip()
-        budget = request.form.get('budget', '').strip()
-        interests = request.form.get('interests', '').strip()
-        additional_info = request.form.get('additional_info', '').strip()
-
-        if not destination:
-            return jsonify({'error': 'Please enter a destination'}), 400
+BUSY_MESSAGE = 'The travel assistant is busy right now. Please try again shortly.'
+# Longest a poll may block with ?wait=, and the keep-alive interval for job event streams
+JOB_MAX_WAIT_SECONDS = 30
+JOB_EVENTS_KEEPALIVE_SECONDS = 15
+AUTOCOMPLETE_MAX_RESULTS = 20
 
-        # Create detailed user prompt
-        user_prompt = f"""
+def build_plan_prompt(destination, duration='', budget='', interests='', additional_info=''):
+    """Build the travel plan prompt sent to the AI."""
+    return f"""
         Create a detailed travel plan for:
         Destination: {destination}
         Duration: {duration if duration else 'Not specified'}
@@ -43,20 +49,325 @@ def generate_plan():
         8. Packing suggestions
         """
 
-        # Get AI response
-        ai_response = get_travel_response(user_prompt)
+def build_question_prompt(question):
+    """Build the prompt for a general travel question."""
+    return f"Travel question: {question}\n\nPlease provide detailed, helpful travel advice."
+
+PLAN_FIELDS = ('destination', 'duration', 'budget', 'interests', 'additional_info')
+
+def _plan_fields(source):
+    """Read the travel plan fields from a form or a JSON object, with the destination canonicalized."""
+    fields = {name: str(source.get(name) or '').strip() for name in PLAN_FIELDS}
+    if fields['destination']:
+        fields['destination'] = canonicalize_destination(fields['destination'])
+    return fields
+
+def _plan_form_fields():
+    """Read the travel plan form fields from the current request."""
+    return _plan_fields(request.form)
+
+def _similarity_text(fields):
+    """The user-entered part of a plan request, used for near-duplicate cache lookups."""
+    return ' '.join(value for value in fields.values() if value)
+
+def _sse_event(data, event=None):
+    """Format a payload as a Server-Sent Events message."""
+    message = f"event: {event}\n" if event else ''
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def _overloaded_response(error):
+    """Build a JSON 429/503 response for an AI call rejected by the dispatcher."""
+    response = jsonify({'error': BUSY_MESSAGE})
+    response.status_code = error.status_code
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def _text_events(chunks):
+    """Wrap streamed text chunks as SSE 'message' events carrying the HTML rendered so far."""
+    renderer = IncrementalMarkdownRenderer()
+    for chunk in chunks:
+        yield None, {'text': chunk, 'html': renderer.feed(chunk)}
+    yield None, {'text': '', 'html': renderer.close()}
+
+def _section_events(fields):
+    """Emit each plan section as an SSE 'section' event as soon as it completes."""
+    for index, key, title, text in iter_plan_sections(fields):
+        yield 'section', {'index': index, 'key': key, 'title': title, 'text': text,
+                          'html': render_markdown(f"**{title}**\n\n{text.strip()}")}
+
+def _sse_response(events, **done_fields):
+    """Stream (event, data) pairs as SSE messages followed by a final 'done' event."""
+    def generate():
+        try:
+            for event, data in events:
+                yield _sse_event(data, event=event)
+            yield _sse_event(dict(success=True, **done_fields), event='done')
+        except DispatcherOverloaded as e:
+            yield _sse_event({
+                'error': BUSY_MESSAGE,
+                'retry_after': e.retry_after
+            }, event='error')
+        except Exception as e:
+            logging.error(f"Error streaming AI response: {e}")
+            yield _sse_event({'error': 'Failed to generate response. Please try again.'}, event='error')
+
+    return _event_stream(generate())
+
+def _event_stream(messages):
+    """Wrap a generator of formatted SSE messages in an unbuffered streaming response."""
+    return Response(stream_with_context(messages), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def _job_payload(job):
+    """JSON body describing a job and, once finished, its result."""
+    payload = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'destination': job['request'].get('destination'),
+        'status_url': f"/jobs/{job['id']}",
+        'events_url': f"/jobs/{job['id']}/events"
+    }
+    if job['status'] == DONE:
+        payload['success'] = True
+        payload['fallback'] = job['fallback']
+        payload['response'] = job['result']
+        payload['html'] = render_markdown(job['result'])
+    elif job['status'] == FAILED:
+        payload['error'] = job['error']
+    return payload
+
+# Request instrumentation; streamed responses are timed until their headers are sent
+HTTP_REQUEST_SECONDS = metrics.Histogram('http_request_duration_seconds', 'Flask request latency',
+                                         ['endpoint', 'method', 'status'])
+
+metrics.register_stats('ai_response_cache', 'Response cache', lambda: get_response_cache() and get_response_cache().stats(),
+                       counters=('hits', 'misses', 'evictions'), exclude=('hit_rate',), shared=('entries',))
+metrics.register_stats('ai_similar_prompt', 'Near-duplicate prompt index',
+                       lambda: get_similarity_index() and get_similarity_index().stats(), counters=('hits', 'misses'))
+metrics.register_stats('ai_coalescing', 'Prompt coalescing', get_coalescing_stats,
+                       counters=('leaders', 'coalesced_waiters'))
+metrics.register_stats('ai_dispatcher', 'AI dispatcher', get_dispatcher_stats,
+                       counters=('submitted', 'completed', 'rejected', 'wait_seconds_total'),
+                       exclude=('wait_seconds_avg', 'wait_seconds_max'))
+metrics.register_stats('ai_breaker', 'Gemini circuit breaker', lambda: get_breaker_stats()['breaker'],
+                       counters=('trips', 'short_circuited', 'failures', 'slow_calls'))
+metrics.register_stats('rate_limiter', 'Rate limiter tracked clients', get_rate_limiter_stats)
+metrics.register_stats('ai_hedging', 'Gemini request hedging', lambda: get_breaker_stats()['hedging'],
+                       counters=('hedges_fired', 'hedges_won'))
+
+@app.before_request
+def _start_request_timer():
+    metrics.ensure_flusher()
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _observe_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Label by route pattern rather than path to keep the series count bounded
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, request.method, response.status_code)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics, aggregated across worker processes when METRICS_DIR is set."""
+    return Response(metrics.render_latest(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/')
+def index():
+    """Homepage with travel assistant interface."""
+    return render_template('index.html')
+
+@app.route('/generate_plan', methods=['POST'])
+@rate_limited('ai')
+def generate_plan():
+    """Generate AI travel plan based on user input."""
+    try:
+        # Get form data
+        fields = _plan_form_fields()
+
+        if not fields['destination']:
+            return jsonify({'error': 'Please enter a destination'}), 400
+
+        # Get AI response, optionally as parallel per-section requests
+        if use_fanout(request.form.get('mode')):
+            ai_response = generate_plan_sections(fields)
+            html = render_markdown(ai_response)
+        else:
+            prompt = build_plan_prompt(**fields)
+            ai_response = get_travel_response(prompt, _similarity_text(fields), kind='plan')
+            html = get_response_html(prompt, ai_response)
 
         return jsonify({
             'success': True,
             'response': ai_response,
-            'destination': destination
+            'html': html,
+            'destination': fields['destination']
         })
 
+    except DispatcherOverloaded as e:
+        return _overloaded_response(e)
+
     except Exception as e:
         logging.error(f"Error generating travel plan: {e}")
         return jsonify({'error': 'Failed to generate travel plan. Please try again.'}), 500
 
+@app.route('/generate_plan/stream', methods=['POST'])
+@rate_limited('ai')
+def generate_plan_stream():
+    """Stream an AI travel plan as Server-Sent Events while it is generated."""
+    fields = _plan_form_fields()
+
+    if not fields['destination']:
+        return jsonify({'error': 'Please enter a destination'}), 400
+
+    if use_fanout(request.form.get('mode')):
+        return _sse_response(_section_events(fields), destination=fields['destination'])
+
+    chunks = stream_travel_response(build_plan_prompt(**fields), _similarity_text(fields), kind='plan')
+    return _sse_response(_text_events(chunks), destination=fields['destination'])
+
+@app.route('/generate_plan/batch', methods=['POST'])
+@rate_limited('batch')
+def generate_plan_batch():
+    """Generate many travel plans concurrently, streaming one NDJSON line per plan as it finishes."""
+    body = request.get_json(silent=True)
+    if isinstance(body, list):
+        body = {'plans': body}
+    if not isinstance(body, dict) or not isinstance(body.get('plans'), list):
+        return jsonify({'error': 'Send a JSON object with a "plans" list'}), 400
+
+    plans = body['plans']
+    if not plans:
+        return jsonify({'error': 'The "plans" list is empty'}), 400
+    if len(plans) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'A batch can contain at most {BATCH_MAX_ITEMS} plans'}), 400
+
+    invalid = []
+    valid = []
+    for index, plan in enumerate(plans):
+        fields = _plan_fields(plan) if isinstance(plan, dict) else None
+        if fields and fields['destination']:
+            valid.append((index, fields))
+        else:
+            invalid.append(index)
+
+    # Identical requests (after prompt normalization) are generated once and reported for every copy
+    groups = dedupe_requests(valid, lambda item: make_cache_key(build_plan_prompt(**item[1])))
+    try:
+        concurrency = max(1, min(int(body.get('concurrency') or BATCH_MAX_CONCURRENCY), BATCH_MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({'error': '"concurrency" must be a number'}), 400
+    fanout = use_fanout(body.get('mode'))
+
+    # Every plan generated counts against the same per-session/IP plan limit as /generate_plan
+    if RATE_LIMIT_ENABLED and groups:
+        max_plans = int(rate_limit_capacity('ai'))
+        if len(groups) > max_plans:
+            response = jsonify({'error': f'A batch can generate at most {max_plans} different plans at a time '
+                                         'under the current rate limits', 'max_plans': max_plans})
+            response.status_code = 429
+            return response
+        wait = check_rate_limit('ai', cost=len(groups))
+        if wait:
+            return rate_limit_response(wait)
+
+    def generate_one(group):
+        _, fields = group[0]
+        if fanout:
+            return generate_plan_sections(fields)
+        return get_travel_response(build_plan_prompt(**fields), _similarity_text(fields), kind='plan')
+
+    def generate():
+        for index in invalid:
+            yield json.dumps({'index': index, 'success': False, 'error': 'Please enter a destination'}) + '\n'
+
+        for group, ai_response, error in iter_batch_results(groups, generate_one, concurrency):
+            (index, fields), copies = group[0], group[1:]
+            line = {'index': index, 'duplicates': [copy_index for copy_index, _ in copies],
+                    'destination': fields['destination']}
+            if error is None:
+                line.update(success=True, response=ai_response, html=render_markdown(ai_response))
+            elif isinstance(error, DispatcherOverloaded):
+                line.update(success=False, error=BUSY_MESSAGE, retry_after=error.retry_after)
+            else:
+                logging.error(f"Error generating batch travel plan: {error}")
+                line.update(success=False, error='Failed to generate travel plan. Please try again.')
+            yield json.dumps(line) + '\n'
+
+        yield json.dumps({'done': True, 'total': len(plans), 'unique': len(groups), 'invalid': len(invalid)}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/jobs/generate_plan', methods=['POST'])
+@rate_limited('ai')
+def submit_plan_job():
+    """Queue a travel plan for background generation and return its job id at once."""
+    fields = _plan_form_fields()
+
+    if not fields['destination']:
+        return jsonify({'error': 'Please enter a destination'}), 400
+
+    runner = get_job_runner()
+    if use_fanout(request.form.get('mode')):
+        job_id, _ = runner.submit('generate_plan', dict(fields, mode='sections'), generate_plan_sections, fields)
+    else:
+        job_id, _ = runner.submit('generate_plan', fields, partial(get_travel_response, kind='plan'),
+                                  build_plan_prompt(**fields), _similarity_text(fields))
+
+    response = jsonify(_job_payload(runner.store.get(job_id)))
+    response.status_code = 202
+    response.headers['Location'] = f'/jobs/{job_id}'
+    return response
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Poll a job; ?wait=N blocks up to N seconds for it to finish."""
+    wait = min(request.args.get('wait', 0, type=float), JOB_MAX_WAIT_SECONDS)
+    runner = get_job_runner()
+    job = runner.wait(job_id, wait) if wait > 0 else runner.store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(_job_payload(job))
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a job's status changes and final result as Server-Sent Events."""
+    runner = get_job_runner()
+    if runner.store.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        status = None
+        job = runner.store.get(job_id)
+        while True:
+            if job is None:
+                yield _sse_event({'error': 'Job not found'}, event='error')
+                return
+            if job['status'] != status:
+                status = job['status']
+                yield _sse_event({'status': status}, event='status')
+            else:
+                yield ': keep-alive\n\n'
+            if status == DONE:
+                yield _sse_event({'text': job['result'], 'html': render_markdown(job['result'])})
+                yield _sse_event({'success': True, 'job_id': job_id}, event='done')
+                return
+            if status == FAILED:
+                yield _sse_event({'error': job['error']}, event='error')
+                return
+            job = runner.wait(job_id, JOB_EVENTS_KEEPALIVE_SECONDS)
+
+    return _event_stream(generate())
+
 @app.route('/ask_question', methods=['POST'])
+@rate_limited('ai')
 def ask_question():
     """Handle general travel questions."""
     try:
@@ -66,29 +377,157 @@ def ask_question():
             return jsonify({'error': 'Please enter a question'}), 400
 
         # Get AI response with travel context
-        travel_question = f"Travel question: {question}\n\nPlease provide detailed, helpful travel advice."
-        ai_response = get_travel_response(travel_question)
+        prompt = build_question_prompt(question)
+        ai_response = get_travel_response(prompt, question, kind='question')
 
         return jsonify({
             'success': True,
             'response': ai_response,
+            'html': get_response_html(prompt, ai_response),
             'question': question
         })
 
+    except DispatcherOverloaded as e:
+        return _overloaded_response(e)
+
     except Exception as e:
         logging.error(f"Error answering question: {e}")
         return jsonify({'error': 'Failed to answer question. Please try again.'}), 500
 
+@app.route('/ask_question/stream', methods=['POST'])
+@rate_limited('ai')
+def ask_question_stream():
+    """Stream the answer to a travel question as Server-Sent Events."""
+    question = request.form.get('question', '').strip()
+
+    if not question:
+        return jsonify({'error': 'Please enter a question'}), 400
+
+    chunks = stream_travel_response(build_question_prompt(question), question, kind='question')
+    return _sse_response(_text_events(chunks), question=question)
+
 @app.route('/preferences')
 def preferences():
     """Travel preferences page."""
     return render_template('preferences.html')
 
+@app.template_global('destination_image_sets')
+def destination_image_sets(destination_names):
+    """Resolve the responsive image for every destination card in one call while rendering."""
+    return get_destination_image_sets(str(name or '') for name in destination_names)
+
+@app.route('/images/<digest>/<filename>')
+def destination_image(digest, filename):
+    """Serve a locally stored destination image variant."""
+    store = get_image_store()
+    path = store.variant_file(digest, filename) if store is not None else None
+    if path is None:
+        return jsonify({'error': 'Image not found'}), 404
+
+    response = send_file(path, mimetype=store.mimetype, max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/destinations')
 def destinations():
     """Destinations page."""
     return render_template('destinations.html')
 
+@app.route('/destinations/autocomplete')
+def destinations_autocomplete():
+    """Suggest catalog destinations for partially typed or misspelled input."""
+    query = request.args.get('q', '').strip()
+    try:
+        limit = min(max(int(request.args.get('limit', 8)), 1), AUTOCOMPLETE_MAX_RESULTS)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    results = [{
+        'name': destination.name,
+        'country': destination.country,
+        'kind': destination.kind,
+        'label': destination.label,
+        'score': round(score, 3)
+    } for score, destination in search_destinations(query, limit)]
+    response = jsonify({'query': query, 'results': results})
+    # The catalog only changes on deploy, so browsers can reuse suggestions for a while
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+def _int_list(value, default):
+    """Parse a comma-separated list of positive integers from a query parameter."""
+    if not value:
+        return default
+    numbers = [int(part) for part in value.split(',') if part.strip()]
+    if not numbers or min(numbers) <= 0:
+        raise ValueError(value)
+    return numbers
+
+@app.route('/budget/where')
+def budget_where():
+    """Rank every catalog country by the travel style a total trip budget affords."""
+    try:
+        amount = float(request.args['amount'])
+        days = int(request.args.get('days', 7))
+        travelers = int(request.args.get('travelers', 1))
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        results = get_budget_engine().where_can_i_go(amount, days, travelers,
+                                                     request.args.get('currency', 'USD'), limit)
+    except KeyError:
+        return jsonify({'error': 'amount is required'}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid budget query: {e}'}), 400
+
+    return jsonify({'amount': amount, 'days': days, 'travelers': travelers, 'results': results})
+
+@app.route('/budget/compare')
+def budget_compare():
+    """Trip cost ranges for countries x travel styles x durations x group sizes."""
+    engine = get_budget_engine()
+    countries = [c.strip() for c in request.args.get('countries', '').split(',') if c.strip()] or list(engine.countries)
+    tiers = [t.strip() for t in request.args.get('tiers', '').split(',') if t.strip()] or list(engine.tiers)
+    currency = request.args.get('currency', 'USD').upper()
+    try:
+        durations = _int_list(request.args.get('days'), [7])
+        group_sizes = _int_list(request.args.get('travelers'), [1])
+        matrix = engine.comparison_matrix(durations, group_sizes, currency, countries, tiers)
+    except KeyError as e:
+        return jsonify({'error': f'Unknown country or budget tier: {e.args[0]}'}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid budget query: {e}'}), 400
+
+    return jsonify({
+        'currency': currency,
+        'countries': [engine.country_name(c) for c in countries],
+        'tiers': tiers,
+        'days': durations,
+        'travelers': group_sizes,
+        # costs[country][tier][duration][group size] = [min, max]
+        'costs': matrix.round(2).tolist()
+    })
+
+@app.route('/hotels/search')
+def hotels_search():
+    """One page of a city's hotels for a stay, with the total number of matches for paging."""
+    args = request.args
+    try:
+        destination, check_in, check_out = args['destination'], args['check_in'], args['check_out']
+        optional = {name: cast(args[name]) for name, cast in (
+            ('min_stars', int), ('max_stars', int), ('min_price', float), ('max_price', float),
+            ('min_rating', float)) if args.get(name)}
+        amenities = [a.strip() for a in args.get('amenities', '').split(',') if a.strip()]
+        result = search_hotels(destination, check_in, check_out, int(args.get('guests', 1)),
+                               page=int(args.get('page', 1)), page_size=int(args.get('page_size', 6)),
+                               amenities=amenities, sort=args.get('sort', 'price'), **optional)
+    except KeyError as e:
+        return jsonify({'error': f'{e.args[0]} is required'}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid hotel search: {e}'}), 400
+
+    return jsonify(result)
+
 @app.route('/itinerary')
 def itinerary():
     """Itinerary page."""
@@ -0,0 +1,262 @@
+"""
+Near-duplicate prompt index for the AI response cache
+Uses MinHash signatures with LSH banding to find previously answered prompts that are worded
+differently. Prompts only match within an exact scope: the same kind of prompt (plan, question
+or plan section), destinations, numbers, budget tier, season or month, travel style and traveler
+type. The index is in memory and per worker
+process; it starts empty after a restart and is not shared between workers.
+"""
+
+import os
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+
+from country_data import COUNTRY_DATA
+from keyword_index import KeywordIndex
+
+SIMILARITY_ENABLED = os.environ.get('SIMILAR_PROMPT_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+SIMILARITY_THRESHOLD = float(os.environ.get('SIMILAR_PROMPT_THRESHOLD', 0.8))
+SIMILARITY_MAX_ENTRIES = int(os.environ.get('SIMILAR_PROMPT_MAX_ENTRIES', 50000))
+
+NUM_PERMUTATIONS = 32
+NUM_BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset("""
+    a an the in on at of for to from and or with without about into my me i we our us you your
+    is are be it this that what which how where when should can could would do does please
+    trip travel visit visiting vacation holiday plan planning tips advice
+""".split())
+
+
+def _permutations(count, seed=1):
+    """Deterministic (a, b) coefficients for the MinHash hash family."""
+    state = seed
+    coefficients = []
+    for _ in range(count):
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        a = (state >> 3) % (_MERSENNE_PRIME - 1) + 1
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        b = (state >> 3) % _MERSENNE_PRIME
+        coefficients.append((a, b))
+    return tuple(coefficients)
+
+
+_PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+
+# Facets a prompt mentions must be identical for two prompts to match; phrases are matched as whole
+# words in lowercased text with '_' and '-' read as spaces ("mid_range", "high-end")
+_FACET_PHRASES = {
+    'budget:low': ('budget', 'cheap', 'cheapest', 'affordable', 'inexpensive', 'economical', 'low cost',
+                   'shoestring', 'backpacker', 'backpacking', 'hostel', 'hostels'),
+    'budget:mid': ('mid range', 'midrange', 'moderate', 'mid budget', 'standard'),
+    'budget:high': ('luxury', 'luxurious', 'upscale', 'premium', 'high end', 'splurge', '5 star', 'five star'),
+    'budget:ultra': ('ultra luxury', 'ultra luxurious', 'no expense spared'),
+    'season:winter': ('winter', 'christmas', 'new year', 'ski', 'skiing', 'snow'),
+    'season:spring': ('spring', 'easter', 'cherry blossom', 'cherry blossoms'),
+    'season:summer': ('summer', 'summertime'),
+    'season:autumn': ('autumn', 'fall', 'thanksgiving'),
+    'season:monsoon': ('monsoon', 'rainy season', 'wet season'),
+    'season:dry': ('dry season',),
+    'style:adventure': ('adventure', 'adventurous', 'hiking', 'trekking', 'extreme'),
+    'style:relaxation': ('relax', 'relaxing', 'relaxation', 'spa', 'slow travel'),
+    'style:culture': ('culture', 'cultural', 'history', 'historical', 'museum', 'museums'),
+    'style:food': ('food', 'foodie', 'culinary', 'cuisine', 'street food'),
+    'style:nightlife': ('nightlife', 'party', 'partying', 'clubbing', 'bars'),
+    'style:nature': ('nature', 'wildlife', 'national park', 'national parks'),
+    'style:beach': ('beach', 'beaches', 'island hopping'),
+    'style:shopping': ('shopping',),
+    'style:romantic': ('romantic', 'honeymoon', 'anniversary'),
+    'style:road trip': ('road trip', 'roadtrip', 'driving'),
+    'travelers:solo': ('solo', 'alone', 'by myself'),
+    'travelers:couple': ('couple', 'couples', 'honeymoon', 'partner', 'wife', 'husband', 'girlfriend', 'boyfriend'),
+    'travelers:family': ('family', 'families', 'kid', 'kids', 'child', 'children', 'toddler', 'toddlers', 'baby'),
+    'travelers:friends': ('friends', 'group', 'bachelor', 'bachelorette'),
+    'travelers:business': ('business', 'work trip', 'conference'),
+    'travelers:senior': ('senior', 'seniors', 'elderly', 'retired', 'retirees'),
+    'travelers:accessible': ('wheelchair', 'accessible', 'accessibility', 'disabled', 'limited mobility'),
+}
+_MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october',
+           'november', 'december')
+for _number, _month in enumerate(_MONTHS, 1):
+    _FACET_PHRASES[f'month:{_number}'] = (_month, _month[:3]) if _month != 'september' else (_month, 'sep', 'sept')
+
+
+def _build_facet_index():
+    """One regex over every facet phrase, longest first, and the facets each phrase implies."""
+    facets_by_phrase = {}
+    for facet, phrases in _FACET_PHRASES.items():
+        for phrase in phrases:
+            facets_by_phrase.setdefault(phrase, []).append(facet)
+    alternatives = '|'.join(re.escape(phrase) for phrase in sorted(facets_by_phrase, key=len, reverse=True))
+    return re.compile(rf'\b(?:{alternatives})\b'), {phrase: tuple(f) for phrase, f in facets_by_phrase.items()}
+
+
+_FACET_RE, _FACETS_BY_PHRASE = _build_facet_index()
+_FACET_SEPARATORS_RE = re.compile(r'[_\-]+')
+
+
+def prompt_facets(text):
+    """Budget tier, season/month, travel style and traveler type terms a prompt mentions."""
+    normalized = _FACET_SEPARATORS_RE.sub(' ', text.lower())
+    return frozenset(facet for match in _FACET_RE.finditer(normalized) for facet in _FACETS_BY_PHRASE[match.group(0)])
+
+
+def _build_entity_index():
+    """Index country and destination names so prompts can be scoped to the places they mention."""
+    keywords = {}
+    for country, info in COUNTRY_DATA.items():
+        keywords[country] = country
+        for destination in info['popular_destinations']:
+            keywords[destination] = destination
+    return KeywordIndex(keywords)
+
+
+_ENTITY_INDEX = _build_entity_index()
+
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed and a light plural strip."""
+    tokens = set()
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.add(token)
+    return tokens
+
+
+def prompt_scope(text, tokens=None):
+    """Prompts may only match within the same destinations, numbers (days, budget, people) and facets."""
+    if tokens is None:
+        tokens = tokenize(text)
+    entities = frozenset(payload for _, _, payload in _ENTITY_INDEX.find_all(text))
+    numbers = frozenset(token for token in tokens if token.isdigit())
+    return entities, numbers, prompt_facets(text)
+
+
+@lru_cache(maxsize=100000)
+def _token_hashes(token):
+    """Every permuted hash of one token; the vocabulary is small, so these are memoized."""
+    h = zlib.crc32(token.encode('utf-8'))
+    return tuple(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in _PERMUTATIONS)
+
+
+def minhash_signature(tokens):
+    """MinHash signature of a token set as an array of 32-bit values."""
+    vectors = [_token_hashes(token) for token in tokens] or [_token_hashes('')]
+    return array('I', map(min, *vectors)) if len(vectors) > 1 else array('I', vectors[0])
+
+
+def estimate_similarity(left, right):
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class SimilarityIndex:
+    """Bounded in-memory LSH index mapping prompts to the cache key of their answer."""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, max_entries=SIMILARITY_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _band_keys(self, scope, signature):
+        """One bucket key per LSH band, namespaced by scope."""
+        return [
+            hash((scope, band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])))
+            for band in range(NUM_BANDS)
+        ]
+
+    def add(self, text, value, kind=None):
+        """Index a prompt's text against a value (typically the exact cache prompt).
+
+        kind names the sort of prompt ('plan', 'question', a plan section); only prompts of the
+        same kind match each other.
+        """
+        tokens = tokenize(text)
+        scope = (kind, prompt_scope(text, tokens))
+        signature = minhash_signature(tokens)
+        band_keys = self._band_keys(scope, signature)
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, band_keys, value)
+            for key in band_keys:
+                self._buckets.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        """Drop the least recently used entry; callers must hold the lock."""
+        entry_id, (_, band_keys, _) = self._entries.popitem(last=False)
+        for key in band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def query(self, text, kind=None):
+        """Return (value, similarity) for the closest indexed prompt of this kind above the threshold, or None."""
+        tokens = tokenize(text)
+        scope = (kind, prompt_scope(text, tokens))
+        signature = minhash_signature(tokens)
+
+        best = None
+        with self._lock:
+            seen = set()
+            for key in self._band_keys(scope, signature):
+                for entry_id in self._buckets.get(key, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    candidate, _, value = self._entries[entry_id]
+                    similarity = estimate_similarity(signature, candidate)
+                    if similarity >= self.threshold and (best is None or similarity > best[2]):
+                        best = (entry_id, value, similarity)
+
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best[0])
+            self.hits += 1
+            return best[1], best[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and size for this process."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'buckets': len(self._buckets)
+            }
+
+
+_similarity_index = SimilarityIndex()
+
+
+def get_similarity_index():
+    """Get the process-wide near-duplicate prompt index, or None when disabled."""
+    return _similarity_index if SIMILARITY_ENABLED else None
@@ -22,8 +22,8 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    // Display response
-    function displayResponse(response, isError = false) {
+    // Display response, preferring HTML already rendered by the server
+    function displayResponse(response, isError = false, html = null) {
         hideLoading();
         if (responseDiv) {
             responseDiv.style.display = 'block';
@@ -34,7 +34,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         ${isError ? 'Error' : 'Travel Recommendation'}
                     </h5>
                     <div class="response-content">
-                        ${formatResponse(response)}
+                        ${html !== null ? html : formatResponse(response)}
                     </div>
                 </div>
             `;
@@ -44,7 +44,7 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    // Format response text
+    // Format response text (fallback for responses without server-rendered HTML)
     function formatResponse(text) {
         // Convert markdown-like formatting to HTML
         return text
@@ -60,6 +60,134 @@ document.addEventListener('DOMContentLoaded', function() {
             .replace(/$/, '</p>');
     }
 
+    // Render a response that is still streaming in, without re-scrolling on every chunk
+    function displayStreamingResponse(text, isFirstChunk, html = null) {
+        hideLoading();
+        if (!responseDiv) {
+            return;
+        }
+        let content = responseDiv.querySelector('.response-content');
+        if (isFirstChunk || !content) {
+            displayResponse(text, false, html);
+            return;
+        }
+        content.innerHTML = html !== null ? html : formatResponse(text);
+    }
+
+    // POST a form and render the JSON response in one go
+    function submitForm(url, formData, errorMessage) {
+        return fetch(url, {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                displayResponse(data.response, false, data.html !== undefined ? data.html : null);
+            } else {
+                displayResponse(data.error || errorMessage, true);
+            }
+        });
+    }
+
+    // POST a form to a Server-Sent Events endpoint and render chunks as they arrive
+    function streamForm(url, formData, errorMessage) {
+        return fetch(url, {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => {
+            const contentType = response.headers.get('Content-Type') || '';
+            if (!contentType.startsWith('text/event-stream')) {
+                return response.json().then(data => {
+                    displayResponse(data.error || errorMessage, true);
+                });
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let text = '';
+            let html = null;
+            const sections = [];
+
+            // Sections can finish in any order; render them in plan order
+            function mergeSections() {
+                return sections
+                    .filter(section => section)
+                    .map(section => `**${section.title}**\n\n${section.text.trim()}`)
+                    .join('\n\n');
+            }
+
+            function handleEvent(rawEvent) {
+                let eventType = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) {
+                        eventType = line.slice(7);
+                    } else if (line.startsWith('data: ')) {
+                        data += line.slice(6);
+                    }
+                });
+                if (!data) {
+                    return;
+                }
+                const payload = JSON.parse(data);
+                if (eventType === 'message') {
+                    const isFirstChunk = text === '';
+                    text += payload.text;
+                    // The server sends HTML for each completed line, so append it as it arrives
+                    if (payload.html !== undefined) {
+                        html = (html || '') + payload.html;
+                    }
+                    displayStreamingResponse(text, isFirstChunk, html);
+                } else if (eventType === 'section') {
+                    const isFirstChunk = text === '';
+                    sections[payload.index] = payload;
+                    text = mergeSections();
+                    if (payload.html !== undefined) {
+                        html = sections.filter(section => section).map(section => section.html).join('');
+                    }
+                    displayStreamingResponse(text, isFirstChunk, html);
+                } else if (eventType === 'error') {
+                    displayResponse(payload.error || errorMessage, true);
+                }
+            }
+
+            function read() {
+                return reader.read().then(({ done, value }) => {
+                    if (done) {
+                        if (!text) {
+                            displayResponse(errorMessage, true);
+                        }
+                        return;
+                    }
+                    buffer += decoder.decode(value, { stream: true });
+                    const events = buffer.split('\n\n');
+                    buffer = events.pop();
+                    events.forEach(handleEvent);
+                    return read();
+                });
+            }
+
+            return read();
+        });
+    }
+
+    // Prefer the streaming endpoint when the browser can read response bodies incrementally
+    function submitTravelRequest(url, formData, errorMessage) {
+        showLoading();
+        const canStream = window.ReadableStream && window.TextDecoder;
+        const request = canStream
+            ? streamForm(url + '/stream', formData, errorMessage)
+            : submitForm(url, formData, errorMessage);
+
+        request.catch(error => {
+            console.error('Error:', error);
+            displayResponse('Network error. Please check your connection and try again.', true);
+        });
+    }
+
     // Handle travel plan form submission
     if (planForm) {
         planForm.addEventListener('submit', function(e) {
@@ -73,24 +201,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
 
-            showLoading();
-
-            fetch('/generate_plan', {
-                method: 'POST',
-                body: formData
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    displayResponse(data.response);
-                } else {
-                    displayResponse(data.error || 'Failed to generate travel plan.', true);
-                }
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                displayResponse('Network error. Please check your connection and try again.', true);
-            });
+            submitTravelRequest('/generate_plan', formData, 'Failed to generate travel plan.');
         });
     }
 
@@ -107,28 +218,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
 
-            showLoading();
-
-            fetch('/ask_question', {
-                method: 'POST',
-                body: formData
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    displayResponse(data.response);
-                } else {
-                    displayResponse(data.error || 'Failed to answer question.', true);
-                }
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                displayResponse('Network error. Please check your connection and try again.', true);
-            });
+            submitTravelRequest('/ask_question', formData, 'Failed to answer question.');
         });
     }
 
-    // Add example destination suggestions
+    // Destination autocomplete: example suggestions until the user types, then typo-tolerant matches
     const destinationInput = document.getElementById('destination');
     if (destinationInput) {
         const suggestions = [
@@ -136,8 +230,54 @@ document.addEventListener('DOMContentLoaded', function() {
             'Rome, Italy', 'Bangkok, Thailand', 'Sydney, Australia', 'Cairo, Egypt'
         ];
 
+        const datalist = document.createElement('datalist');
+        datalist.id = 'destination-suggestions';
+        destinationInput.insertAdjacentElement('afterend', datalist);
+        destinationInput.setAttribute('list', datalist.id);
+        destinationInput.setAttribute('autocomplete', 'off');
+
+        function showSuggestions(labels) {
+            datalist.replaceChildren(...labels.map(label => {
+                const option = document.createElement('option');
+                option.value = label;
+                return option;
+            }));
+        }
+
+        let debounceTimer = null;
+        let pendingRequest = null;
+
+        function fetchSuggestions(query) {
+            if (pendingRequest) {
+                pendingRequest.abort();
+            }
+            pendingRequest = new AbortController();
+            fetch(`/destinations/autocomplete?q=${encodeURIComponent(query)}&limit=8`, {
+                signal: pendingRequest.signal
+            })
+            .then(response => response.ok ? response.json() : { results: [] })
+            .then(data => showSuggestions(data.results.map(result => result.label)))
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    console.error('Autocomplete error:', error);
+                }
+            });
+        }
+
         destinationInput.addEventListener('focus', function() {
-            // You can add autocomplete functionality here
+            if (!this.value.trim()) {
+                showSuggestions(suggestions);
+            }
+        });
+
+        destinationInput.addEventListener('input', function() {
+            const query = this.value.trim();
+            clearTimeout(debounceTimer);
+            if (query.length < 2) {
+                showSuggestions(query ? [] : suggestions);
+                return;
+            }
+            debounceTimer = setTimeout(() => fetchSuggestions(query), 150);
         });
     }
 
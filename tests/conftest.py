@@ -0,0 +1,50 @@
+import pytest
+
+import gemini
+from response_cache import ResponseCache
+from similarity_index import SimilarityIndex
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class StubModel:
+    """Stands in for the Gemini model: answers each prompt with a numbered reply and records it."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        response = StubResponse(f'Answer {len(self.prompts)}')
+        return iter([response]) if stream else response
+
+
+@pytest.fixture
+def stub_gemini(tmp_path, monkeypatch):
+    """Route gemini calls to a StubModel with a fresh response cache and near-duplicate index."""
+    model = StubModel()
+    cache = ResponseCache(str(tmp_path / 'responses.db'))
+    index = SimilarityIndex()
+    monkeypatch.setattr(gemini, 'GEMINI_AVAILABLE', True)
+    monkeypatch.setattr(gemini, 'get_client', lambda: model)
+    monkeypatch.setattr(gemini, 'get_response_cache', lambda: cache)
+    monkeypatch.setattr(gemini, 'get_similarity_index', lambda: index)
+    # Skip the shared dispatcher's requests-per-minute pacing; it has tests of its own
+    monkeypatch.setattr(gemini, 'dispatch', lambda fn, *args, **kwargs: fn(*args, **kwargs))
+    model.cache, model.index = cache, index
+    return model
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Flask test client with fresh rate limits."""
+    import rate_limiter
+    import routes  # noqa: F401 (registers the routes)
+    from app import app
+
+    monkeypatch.setattr(rate_limiter, '_limiters', rate_limiter.build_limiters())
+    return app.test_client()
@@ -0,0 +1,120 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from activity_catalog import (ACTIVITY_CANDIDATES, FULL_DAY_MINUTES, Activity, ActivityCatalog, _knapsack, _steps,
+                              get_activities, parse_duration)
+
+INTERESTS = ('culture', 'food', 'nature', 'adventure')
+
+
+def random_catalog(rng, size, price_unit=5, minute_unit=15):
+    activities = []
+    for i in range(size):
+        interests = tuple(rng.choice(INTERESTS, size=rng.integers(1, 3), replace=False).tolist())
+        minutes = int(rng.integers(1, 17)) * minute_unit
+        activities.append(Activity(f'Activity {i}', '', float(rng.integers(1, 25) * price_unit), f'{minutes} minutes',
+                                   minutes, interests))
+    return ActivityCatalog(activities)
+
+
+def brute_force_value(catalog, interests, budget, max_minutes, limit):
+    """Best total value over every subset of the candidates select() considers."""
+    ids, values = catalog.rank(interests)
+    fits = (catalog.prices[ids] <= budget) & (catalog.minutes[ids] <= max_minutes)
+    ids, values = ids[fits][:ACTIVITY_CANDIDATES], values[fits][:ACTIVITY_CANDIDATES]
+    best = 0.0
+    for size in range(1, min(limit, len(ids)) + 1):
+        for subset in combinations(range(len(ids)), size):
+            subset = list(subset)
+            if catalog.prices[ids[subset]].sum() <= budget and catalog.minutes[ids[subset]].sum() <= max_minutes:
+                best = max(best, values[subset].sum())
+    return best
+
+
+def selected_value(catalog, interests, selected):
+    ids, values = catalog.rank(interests)
+    value_of = dict(zip(ids.tolist(), values.tolist()))
+    return sum(value_of[i] for i in selected)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_select_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    catalog = random_catalog(rng, 12)
+    interests = rng.choice(INTERESTS, size=2, replace=False).tolist()
+    budget = float(rng.integers(4, 40) * 5)
+    max_minutes = int(rng.integers(4, 40)) * 15
+    limit = int(rng.integers(1, 6))
+
+    selected = catalog.select(interests, budget, max_minutes, limit)
+
+    assert len(selected) <= limit
+    assert catalog.prices[selected].sum() <= budget
+    assert catalog.minutes[selected].sum() <= max_minutes
+    assert selected_value(catalog, interests, selected) == pytest.approx(
+        brute_force_value(catalog, interests, budget, max_minutes, limit))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_select_never_exceeds_budget_or_time_with_coarse_steps(seed):
+    # Odd prices and large limits force steps wider than the sizes' common divisor
+    rng = np.random.default_rng(seed)
+    catalog = random_catalog(rng, 40, price_unit=7.3, minute_unit=7)
+    budget = float(rng.uniform(100, 5000))
+    max_minutes = int(rng.integers(60, 3000))
+
+    selected = catalog.select(INTERESTS, budget, max_minutes, limit=10)
+
+    assert selected
+    assert catalog.prices[selected].sum() <= budget
+    assert catalog.minutes[selected].sum() <= max_minutes
+
+
+def test_steps_round_sizes_up():
+    sizes, capacity = _steps(np.array([25.0, 40.0, 65.0]), 1000, 50)
+    assert capacity == 50
+    assert sizes.tolist() == [2, 2, 4]
+    assert _steps(np.array([25.0]), None, 50) is None
+
+
+def test_knapsack_respects_item_limit():
+    values = np.array([5.0, 4.0, 3.0, 2.0])
+    sizes = (np.array([1, 1, 1, 1]), 10)
+    assert sorted(_knapsack(values, sizes, None, 2).tolist()) == [0, 1]
+
+
+def test_select_without_limits_returns_ranking():
+    catalog = ActivityCatalog.from_data()
+    ids, _values = catalog.rank(['food'])
+    assert catalog.select(['food'], limit=3) == ids[:3].tolist()
+
+
+def test_rank_alternates_between_interests():
+    catalog = ActivityCatalog.from_data()
+    ids, _values = catalog.rank(['adventure', 'relaxation'])
+    first_two = [catalog.activities[i].interests for i in ids[:2]]
+    assert any('adventure' in interests for interests in first_two)
+    assert any('relaxation' in interests for interests in first_two)
+
+
+@pytest.mark.parametrize('text, minutes', [
+    ('2 hours', 120), ('1-2 hours', 120), ('2.5 hours', 150), ('90 minutes', 90), ('Full day', FULL_DAY_MINUTES),
+    ('half day', FULL_DAY_MINUTES // 2),
+])
+def test_parse_duration(text, minutes):
+    assert parse_duration(text) == minutes
+
+
+def test_parse_duration_rejects_unknown_text():
+    with pytest.raises(ValueError):
+        parse_duration('a while')
+
+
+def test_get_activities_falls_back_to_default_interests():
+    activities = get_activities('Lisbon', ['underwater basket weaving'], budget=100, max_hours=6)
+    assert activities
+    assert sum(activity['price'] for activity in activities) <= 100
+    assert sum(activity['duration_minutes'] for activity in activities) <= 360
+    assert all('{destination}' not in activity['name'] for activity in activities)
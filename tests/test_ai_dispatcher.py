@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from ai_dispatcher import AIDispatcher, DispatcherOverloaded
+
+
+def wait_for(dispatcher, key, value):
+    while dispatcher.stats()[key] != value:
+        time.sleep(0.01)
+
+
+def test_calls_run_and_are_counted():
+    dispatcher = AIDispatcher(max_concurrency=2, requests_per_minute=600)
+    assert dispatcher.submit(lambda destination: f'A {destination} plan', 'Kyoto') == 'A Kyoto plan'
+    stats = dispatcher.stats()
+    assert (stats['submitted'], stats['completed'], stats['queue_depth'], stats['running']) == (1, 1, 0, 0)
+
+
+def test_concurrency_is_capped():
+    dispatcher = AIDispatcher(max_concurrency=2, requests_per_minute=6000)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def call():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=dispatcher.submit, args=(call,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert peak[0] == 2
+    assert dispatcher.stats()['completed'] == 6
+
+
+def test_exhausted_rate_budget_is_rejected_with_429():
+    dispatcher = AIDispatcher(max_concurrency=2, requests_per_minute=1, queue_timeout=0.5)
+    dispatcher.submit(lambda: None)
+    with pytest.raises(DispatcherOverloaded) as excinfo:
+        dispatcher.submit(lambda: None)
+    assert excinfo.value.status_code == 429
+    assert dispatcher.stats()['rejected'] == 1
+
+
+def test_full_queue_fails_fast_with_503():
+    dispatcher = AIDispatcher(max_concurrency=1, requests_per_minute=6000, max_queue=1)
+    release = threading.Event()
+    threads = [threading.Thread(target=dispatcher.submit, args=(lambda: release.wait(5),)) for _ in range(2)]
+    # One call running and one waiting for its slot fill the queue
+    threads[0].start()
+    wait_for(dispatcher, 'running', 1)
+    threads[1].start()
+    wait_for(dispatcher, 'queue_depth', 1)
+    with pytest.raises(DispatcherOverloaded) as excinfo:
+        dispatcher.submit(lambda: None)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert excinfo.value.status_code == 503
+    assert dispatcher.stats()['completed'] == 2
+
+
+def test_slot_timeout_gives_the_token_back():
+    dispatcher = AIDispatcher(max_concurrency=1, requests_per_minute=60, queue_timeout=0.1)
+    release = threading.Event()
+    thread = threading.Thread(target=dispatcher.submit, args=(lambda: release.wait(5),))
+    thread.start()
+    wait_for(dispatcher, 'running', 1)
+    tokens = dispatcher.bucket.tokens
+    with pytest.raises(DispatcherOverloaded) as excinfo:
+        dispatcher.submit(lambda: None)
+    release.set()
+    thread.join(5)
+    assert excinfo.value.status_code == 503
+    assert dispatcher.bucket.tokens >= tokens
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pytest
+
+from budget_engine import BUDGET_TIERS, get_budget_engine
+from country_data import COUNTRIES
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return get_budget_engine()
+
+
+def test_eurozone_countries_without_a_rate_use_the_eur_rate(engine):
+    eur = engine.rate('EUR')
+    for i, name in enumerate(engine.countries):
+        if COUNTRIES[name].currency == 'EUR':
+            assert engine.rates[i] == pytest.approx(eur), name
+
+
+def test_daily_costs_are_converted_to_usd(engine):
+    i = engine.countries.index('Germany')
+    local = COUNTRIES['Germany'].budget_ranges['mid_range']
+    assert engine.daily_usd[i, BUDGET_TIERS.index('mid_range')].tolist() == \
+        pytest.approx([local.min / engine.rate('EUR'), local.max / engine.rate('EUR')])
+
+
+def test_comparison_matrix_shape_and_scaling(engine):
+    matrix = engine.comparison_matrix([3, 7], [1, 2, 4], currency='eur', countries=['france', 'Japan'])
+    assert matrix.shape == (2, len(BUDGET_TIERS), 2, 3, 2)
+    assert np.allclose(matrix[:, :, 1, 2], matrix[:, :, 0, 0] * 7 / 3 * 4)
+
+
+@pytest.mark.parametrize('amount', [0, -100, math.nan, math.inf])
+def test_where_can_i_go_rejects_bad_amounts(engine, amount):
+    with pytest.raises(ValueError):
+        engine.where_can_i_go(amount, days=7)
+
+
+@pytest.mark.parametrize('kwargs', [{'days': 0}, {'days': 7, 'travelers': 0}, {'days': 7, 'limit': 0},
+                                    {'days': 7, 'currency': 'XYZ'}])
+def test_where_can_i_go_rejects_bad_arguments(engine, kwargs):
+    with pytest.raises(ValueError):
+        engine.where_can_i_go(2000, **kwargs)
+
+
+def test_where_can_i_go_ranks_by_tier_then_comfort(engine):
+    results = engine.where_can_i_go(3000, days=7, travelers=2)
+    assert results
+    ranks = [(-BUDGET_TIERS.index(result['tier']), -result['comfort']) for result in results]
+    assert ranks == sorted(ranks)
+    for result in results:
+        assert result['trip_min'] <= 3000
+        assert result['trip_min'] == pytest.approx(result['daily_min'] * 14, abs=0.05)
+
+
+def test_where_can_i_go_in_another_currency(engine):
+    in_usd = engine.where_can_i_go(2000, days=5, limit=5)
+    in_eur = engine.where_can_i_go(2000 * engine.rate('EUR'), days=5, currency='eur', limit=5)
+    assert [r['country'] for r in in_usd] == [r['country'] for r in in_eur]
+    assert all(r['currency'] == 'EUR' for r in in_eur)
+
+
+def test_tiny_budget_fits_nowhere(engine):
+    assert engine.where_can_i_go(1, days=30) == []
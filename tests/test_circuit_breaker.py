@@ -0,0 +1,166 @@
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, Hedger
+
+
+class Ignored(Exception):
+    pass
+
+
+def fail():
+    raise RuntimeError('upstream error')
+
+
+def make_breaker(**kwargs):
+    options = dict(failure_threshold=2, slow_call_seconds=0.05, reset_seconds=0.05, ignore_exceptions=(Ignored,))
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+
+
+def test_opens_after_consecutive_failures_and_short_circuits():
+    breaker = make_breaker()
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'never called')
+    assert breaker.stats()['short_circuited'] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker()
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_probe():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    assert breaker.stats()['trips'] == 2
+
+
+def test_slow_calls_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(2):
+        breaker.call(time.sleep, 0.06)
+    assert breaker.state == OPEN
+    assert breaker.stats()['slow_calls'] == 2
+
+
+def test_ignored_exceptions_free_the_probe_without_counting():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+
+    def overloaded():
+        raise Ignored()
+
+    with pytest.raises(Ignored):
+        breaker.call(overloaded)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_stream_records_mid_stream_errors():
+    breaker = make_breaker()
+
+    def broken_stream():
+        yield 'first chunk'
+        raise RuntimeError('connection reset')
+
+    for _ in range(2):
+        chunks = []
+        with pytest.raises(RuntimeError):
+            for chunk in breaker.stream(broken_stream):
+                chunks.append(chunk)
+        assert chunks == ['first chunk']
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        list(breaker.stream(broken_stream))
+
+
+def test_stream_stalls_count_as_slow_calls():
+    breaker = make_breaker()
+
+    def stalled_stream():
+        yield 'a'
+        time.sleep(0.06)
+        yield 'b'
+
+    assert list(breaker.stream(stalled_stream)) == ['a', 'b']
+    assert breaker.stats()['slow_calls'] == 1
+
+
+def test_long_steady_stream_is_not_slow():
+    breaker = make_breaker()
+
+    def steady_stream():
+        for i in range(5):
+            time.sleep(0.02)
+            yield i
+
+    assert list(breaker.stream(steady_stream)) == [0, 1, 2, 3, 4]
+    assert breaker.stats()['slow_calls'] == 0
+
+
+def test_abandoned_stream_frees_the_probe():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.06)
+    stream = breaker.stream(lambda: iter('abc'))
+    assert next(stream) == 'a'
+    stream.close()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_hedger_takes_the_faster_call():
+    hedger = Hedger(enabled=True, min_delay=0.01)
+    for _ in range(20):
+        hedger.latency.record(0.01)
+    calls = []
+
+    def call():
+        calls.append(None)
+        time.sleep(0.3 if len(calls) == 1 else 0.0)
+        return len(calls)
+
+    assert hedger.call(call) == 2
+    assert hedger.stats()['hedges_fired'] == 1
+    assert hedger.stats()['hedges_won'] == 1
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from country_data import (COUNTRY_DATA, get_budget_ranges, get_country, get_country_for_destination,
+                          get_country_info, suggest_daily_budget)
+
+
+def test_suggest_daily_budget_is_json_serializable():
+    budget = suggest_daily_budget('japan', 'luxury')
+    assert type(budget) is dict
+    assert json.loads(json.dumps(budget)) == {**COUNTRY_DATA['Japan']['budget_ranges']['luxury'], 'currency': 'JPY'}
+
+
+def test_suggest_daily_budget_for_unknown_country_and_tier():
+    assert type(suggest_daily_budget('Atlantis')) is dict
+    assert suggest_daily_budget('Japan', 'backpacker') is None
+
+
+def test_suggestion_is_a_copy():
+    budget = suggest_daily_budget('Japan')
+    budget['min'] = 0
+    assert suggest_daily_budget('Japan')['min'] == COUNTRY_DATA['Japan']['budget_ranges']['mid_range']['min']
+
+
+def test_lookups_are_case_insensitive():
+    assert get_country(' FRANCE ').name == 'France'
+    assert get_country_for_destination('kyoto').name == 'Japan'
+    assert get_country_info('france')['currency'] == 'EUR'
+
+
+def test_catalog_views_are_read_only():
+    with pytest.raises(TypeError):
+        get_budget_ranges('France')['budget'] = {}
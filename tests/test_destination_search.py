@@ -0,0 +1,37 @@
+import pytest
+
+from destination_search import canonicalize_destination, edit_distance, search_destinations
+
+
+@pytest.mark.parametrize('typed, expected', [
+    ('Kyotoo', 'Kyoto'), ('Sydny', 'Sydney'), ('Edinburg', 'Edinburgh'), ('Singapor', 'Singapore'),
+    ('Marakech', 'Marrakech'), ('Pragu', 'Prague'), ('Amsterdm', 'Amsterdam'), ('Bangkock', 'Bangkok'),
+    ('Barcelonna', 'Barcelona'), ('Tokio', 'Tokyo'), ('kyotoo, japan', 'Kyoto, Japan'), ('kyoto', 'Kyoto'),
+])
+def test_typos_are_corrected(typed, expected):
+    assert canonicalize_destination(typed) == expected
+
+
+@pytest.mark.parametrize('typed', [
+    # One edit from two different names
+    'Bati', 'Aara',
+    # Too many edits for a short name
+    'Kyotooo', 'Sdyny x',
+    'Paris, Texas', 'Berlin wall', 'London and Paris', 'Rome/Florence', 'Atlantis',
+])
+def test_uncertain_input_passes_through(typed):
+    assert canonicalize_destination(typed) == typed
+
+
+@pytest.mark.parametrize('left, right, distance', [
+    ('kyoto', 'kyoto', 0), ('kyotoo', 'kyoto', 1), ('tokoy', 'tokyo', 1), ('amsterdm', 'amsterdam', 1),
+    ('bati', 'bali', 1), ('bati', 'bath', 1), ('ca', 'abc', 3), ('', 'abc', 3),
+])
+def test_edit_distance(left, right, distance):
+    assert edit_distance(left, right) == distance
+    assert edit_distance(right, left) == distance
+
+
+def test_autocomplete_ranks_completions_first():
+    results = search_destinations('barc', limit=3)
+    assert results[0][1].name == 'Barcelona'
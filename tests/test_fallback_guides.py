@@ -0,0 +1,37 @@
+import pytest
+
+from country_data import COUNTRY_DATA
+from gemini import (BUDGET_TRAVEL_TIPS, GENERAL_TRAVEL_GUIDE, PARIS_GUIDE, TOKYO_GUIDE, WEEKEND_TRAVEL_GUIDE,
+                    get_fallback_response)
+from keyword_index import KeywordIndex
+
+
+def title(guide):
+    return guide.strip().splitlines()[0]
+
+
+@pytest.mark.parametrize('prompt, expected', [
+    ('3 days in Kyoto', 'Kyoto, Japan'), ('Edinburgh in spring', 'Edinburgh, United Kingdom'),
+    ('UK castles', 'United Kingdom'), ('Kyoto on a budget', 'Kyoto, Japan'),
+])
+def test_country_data_guides(prompt, expected):
+    assert title(get_fallback_response(prompt)) == f'🌍 **{expected} Travel Guide**'
+
+
+@pytest.mark.parametrize('prompt, guide', [
+    ('trip to Paris', PARIS_GUIDE), ('Tokyo nightlife', TOKYO_GUIDE), ('Kyoto and Paris', PARIS_GUIDE),
+    ('cheap trip somewhere', BUDGET_TRAVEL_TIPS), ('weekend getaway', WEEKEND_TRAVEL_GUIDE),
+    ('parisian cafes', GENERAL_TRAVEL_GUIDE), ('holiday ideas', GENERAL_TRAVEL_GUIDE),
+])
+def test_guide_priority(prompt, guide):
+    assert get_fallback_response(prompt) == guide
+
+
+def test_every_catalog_country_has_a_guide():
+    for country in COUNTRY_DATA:
+        assert country in title(get_fallback_response(f'Thinking about {country}')), country
+
+
+def test_keyword_index_matches_whole_words_in_one_pass():
+    index = KeywordIndex({'new york': 'ny', 'york': 'york', 'he': 'he'})
+    assert list(index.find_all('New York then York, the end')) == [(0, 8, 'ny'), (4, 8, 'york'), (14, 18, 'york')]
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from flight_inventory import MAX_FLIGHTS_PER_DAY, FlightInventory, search_flights
+
+START = date(2030, 1, 7)
+
+
+@pytest.fixture(scope='module')
+def inventory():
+    return FlightInventory(start=START, days=5)
+
+
+@pytest.fixture(scope='module')
+def outside_inventory():
+    # Same seed, but its table covers other days, so searches in the first window are generated on the fly
+    return FlightInventory(start=START + timedelta(days=100), days=1)
+
+
+def assert_same_rows(first, second):
+    assert first[1] == second[1]
+    for name in ('day', 'departure', 'duration', 'stops', 'airline', 'flight_number', 'price'):
+        assert np.array_equal(first[0][name], second[0][name]), name
+
+
+@pytest.mark.parametrize('origin, destination', [('Paris', 'Tokyo'), ('London', 'Paris'), ('New York', 'Los Angeles'),
+                                                 ('Tokyo', None)])
+@pytest.mark.parametrize('sort', ['price', 'duration', 'departure'])
+def test_table_and_generated_fares_agree(inventory, outside_inventory, origin, destination, sort):
+    query = dict(departure_date=(START + timedelta(days=2)).isoformat(), flexible_days=1, sort=sort, limit=None)
+    assert_same_rows(inventory.search(origin, destination, **query),
+                     outside_inventory.search(origin, destination, **query))
+
+
+def test_unknown_cities_get_stable_fares(inventory):
+    query = dict(departure_date=START.isoformat(), limit=None)
+    first = inventory.search('Springfield', 'Shelbyville', **query)
+    assert len(first[1]) >= 1
+    assert_same_rows(first, FlightInventory(start=START, days=1).search('Springfield', 'Shelbyville', **query))
+
+
+def test_filters_and_limits(inventory):
+    rows, destinations = inventory.search('Paris', None, START.isoformat(), flexible_days=2, max_stops=0,
+                                          max_price=600, sort='price', limit=20)
+    assert len(destinations) == 20
+    assert np.all(rows['stops'] == 0)
+    assert np.all(rows['price'] <= 600)
+    assert np.all(np.diff(rows['price']) >= 0)
+    assert 'paris' not in destinations
+
+
+def test_top_k_matches_full_sort(inventory):
+    query = dict(departure_date=START.isoformat(), flexible_days=2, sort='duration')
+    top, _ = inventory.search('London', None, limit=7, **query)
+    everything, _ = inventory.search('London', None, limit=None, **query)
+    assert top['duration'].tolist() == everything['duration'][:7].tolist()
+
+
+def test_route_to_itself_has_no_flights(inventory):
+    rows, destinations = inventory.search('Paris', 'Paris, France', START.isoformat())
+    assert destinations == []
+    assert len(rows['price']) == 0
+
+
+def test_flights_per_route_and_day(inventory):
+    rows, _ = inventory.search('Rome', 'Paris', START.isoformat(), limit=None)
+    assert 1 <= len(rows['price']) <= MAX_FLIGHTS_PER_DAY
+
+
+def test_search_rejects_bad_sort_and_dates(inventory):
+    with pytest.raises(ValueError):
+        inventory.search('Paris', 'Tokyo', START.isoformat(), sort='comfort')
+    with pytest.raises(ValueError):
+        inventory.search('Paris', 'Tokyo', 'next week')
+
+
+def test_search_flights_format():
+    departure = (date.today() + timedelta(days=3)).isoformat()
+    flights = search_flights('Paris', 'Tokyo', departure, passengers=2, limit=3)
+    assert 1 <= len(flights) <= 3
+    for flight in flights:
+        assert flight['departure_date'] == departure
+        assert flight['total_price'] == flight['price'] * 2
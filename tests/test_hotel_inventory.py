@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from hotel_inventory import (HOTEL_MAX_PAGE_SIZE, WEEKEND_MULTIPLIER, CityHotels, amenity_mask, amenity_names,
+                             search_hotels, stay_nights)
+
+
+@pytest.fixture(scope='module')
+def hotels():
+    return CityHotels('lisbon', size=2000)
+
+
+def count_weekend_nights(check_in, nights):
+    return sum(1 for i in range(nights) if (check_in + timedelta(days=i)).weekday() in (4, 5))
+
+
+@pytest.mark.parametrize('start_offset', range(7))
+@pytest.mark.parametrize('nights', [1, 2, 3, 6, 7, 8, 13, 14, 15, 30])
+def test_stay_nights_counts_friday_and_saturday_nights(start_offset, nights):
+    check_in = date(2024, 6, 3) + timedelta(days=start_offset)
+    check_out = check_in + timedelta(days=nights)
+    assert stay_nights(check_in.isoformat(), check_out.isoformat()) == \
+        (nights, count_weekend_nights(check_in, nights))
+
+
+@pytest.mark.parametrize('check_in, check_out', [('2024-06-03', '2024-06-03'), ('2024-06-05', '2024-06-03'),
+                                                 ('2024-06-03', 'soon')])
+def test_stay_nights_rejects_bad_dates(check_in, check_out):
+    with pytest.raises(ValueError):
+        stay_nights(check_in, check_out)
+
+
+@pytest.mark.parametrize('sort', ['price', 'rating'])
+def test_pages_cover_every_match_once(hotels, sort):
+    filters = {'min_stars': 3, 'amenities': ['Free WiFi'], 'max_price': 250, 'min_rating': 4.0, 'sort': sort}
+    first, total = hotels.search(page=1, page_size=50, **filters)
+    ids = []
+    for page in range(1, total // 50 + 2):
+        rows, page_total = hotels.search(page=page, page_size=50, **filters)
+        assert page_total == total
+        ids.extend(rows['hotel'].tolist())
+    assert len(ids) == total == len(set(ids))
+    assert ids[:len(first['hotel'])] == first['hotel'].tolist()
+
+
+def test_search_matches_a_full_scan(hotels):
+    rows, total = hotels.search(min_stars=2, max_stars=4, amenities=['Pool', 'Gym'], min_price=80, max_price=200,
+                                min_rating=3.5, page_size=50)
+    columns = hotels.columns
+    required = amenity_mask(['Pool', 'Gym'])
+    expected = ((columns['stars'] >= 2) & (columns['stars'] <= 4) & (columns['price'] >= 80)
+                & (columns['price'] <= 200) & (columns['rating'] >= 35)
+                & ((columns['amenities'] & required) == required))
+    assert total == int(expected.sum())
+    assert rows['hotel'].tolist() == columns['hotel'][expected][:50].tolist()
+
+
+def test_sort_orders(hotels):
+    by_price, _ = hotels.search(sort='price', page_size=50)
+    assert np.all(np.diff(by_price['price']) >= 0)
+    by_rating, _ = hotels.search(sort='rating', page_size=50)
+    assert np.all(np.diff(by_rating['rating']) <= 0)
+
+
+def test_search_rejects_unknown_sort_and_amenity(hotels):
+    with pytest.raises(ValueError):
+        hotels.search(sort='distance')
+    with pytest.raises(ValueError):
+        hotels.search(amenities=['Helipad'])
+
+
+def test_amenity_mask_round_trips():
+    assert amenity_names(amenity_mask(['spa', 'Free WiFi'])) == ['Free WiFi', 'Spa']
+
+
+def test_inventory_is_deterministic():
+    first, second = CityHotels('porto', size=500), CityHotels('porto', size=500)
+    for name, column in first.columns.items():
+        assert np.array_equal(column, second.columns[name])
+
+
+def test_search_hotels_prices_weekend_nights():
+    # Thursday to Sunday: Friday and Saturday are weekend nights
+    result = search_hotels('Lisbon, Portugal', '2024-06-06', '2024-06-09', guests=2, page_size=3)
+    assert len(result['hotels']) == 3
+    for hotel in result['hotels']:
+        assert hotel['nights'] == 3
+        assert hotel['total_price'] == round(hotel['price_per_night'] * (3 + (WEEKEND_MULTIPLIER - 1) * 2))
+
+
+def test_search_hotels_returns_the_total_for_paging():
+    query = ('Lisbon', '2024-06-06', '2024-06-09')
+    first = search_hotels(*query, amenities=['Pool'], page=1, page_size=20)
+    assert first['page'] == 1 and first['page_size'] == 20
+    assert first['total'] > 20
+    last_page = -(-first['total'] // 20)
+    last = search_hotels(*query, amenities=['Pool'], page=last_page, page_size=20)
+    assert len(last['hotels']) == first['total'] - 20 * (last_page - 1)
+    assert search_hotels(*query, page_size=500)['page_size'] == HOTEL_MAX_PAGE_SIZE
+
+
+def test_hotel_search_route():
+    from app import app
+    import routes  # noqa: F401 (registers the routes)
+
+    client = app.test_client()
+    response = client.get('/hotels/search?destination=Lisbon&check_in=2024-06-06&check_out=2024-06-09'
+                          '&amenities=Pool,Gym&min_stars=3&page=2&page_size=5')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['page'] == 2 and len(body['hotels']) == 5 and body['total'] >= 10
+    assert all({'Pool', 'Gym'} <= set(hotel['amenities']) for hotel in body['hotels'])
+
+    assert client.get('/hotels/search?destination=Lisbon&check_in=2024-06-06').status_code == 400
+    assert client.get('/hotels/search?destination=Lisbon&check_in=2024-06-09&check_out=2024-06-06').status_code == 400
+    assert client.get('/hotels/search?destination=Lisbon&check_in=2024-06-06&check_out=2024-06-09'
+                      '&amenities=Helipad').status_code == 400
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+PIL = pytest.importorskip('PIL')
+from PIL import Image
+
+from image_store import IMAGE_VARIANTS, ImageStore, remote_image_set
+
+PHOTO_ID = '1545569341-9eb8b30979d9'
+
+
+@pytest.fixture
+def store(tmp_path):
+    source_dir = tmp_path / 'originals'
+    source_dir.mkdir()
+    Image.new('RGB', (1600, 1000), (200, 80, 40)).save(source_dir / f'{PHOTO_ID}.jpg', 'JPEG')
+    return ImageStore(root=str(tmp_path / 'store'), source_dir=str(source_dir), workers=1, image_format='jpeg')
+
+
+def test_process_round_trips_one_image(store):
+    digest = store.process(PHOTO_ID)
+
+    assert store.lookup(PHOTO_ID) == digest
+    with open(os.path.join(store.root, 'blobs', digest), 'rb') as f, \
+            open(os.path.join(store.source_dir, f'{PHOTO_ID}.jpg'), 'rb') as original:
+        assert f.read() == original.read()
+    for variant, width in IMAGE_VARIANTS.items():
+        path = store.variant_file(digest, f'{variant}.jpg')
+        assert path is not None
+        with Image.open(path) as image:
+            assert image.format == 'JPEG'
+            assert image.size == (width, round(1000 * width / 1600))
+
+    image_set = store.image_set(PHOTO_ID)
+    assert image_set['local'] is True
+    assert image_set['src'] == f'/images/{digest}/card.jpg'
+
+
+def test_another_worker_finds_stored_variants(store):
+    digest = store.process(PHOTO_ID)
+    other = ImageStore(root=store.root, workers=1, image_format='jpeg')
+    assert other.lookup(PHOTO_ID) == digest
+
+
+def test_missing_photo_uses_remote_images_until_ready(store):
+    assert store.image_set(PHOTO_ID) == remote_image_set(PHOTO_ID)
+    store._executor.shutdown(wait=True)
+    assert store.image_set(PHOTO_ID)['local'] is True
+
+
+def test_variant_file_rejects_unknown_names(store):
+    digest = store.process(PHOTO_ID)
+    assert store.variant_file(digest, 'card.webp') is None
+    assert store.variant_file(digest, 'poster.jpg') is None
+    assert store.variant_file('../../etc', 'card.jpg') is None
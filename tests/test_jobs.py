@@ -0,0 +1,71 @@
+import pytest
+
+import gemini
+import jobs
+from gemini import FallbackResponse
+from jobs import DONE, FAILED, JobRunner, JobStore
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    runner = JobRunner(JobStore(str(tmp_path / 'jobs.db')), max_workers=2)
+    monkeypatch.setattr(jobs, '_runner', runner)
+    return runner
+
+
+def finished(runner, job_id):
+    job = runner.wait(job_id, timeout=5)
+    assert job['status'] in (DONE, FAILED)
+    return job
+
+
+def test_finished_job_is_reused(runner):
+    job_id, created = runner.submit('plan', {'destination': 'Kyoto'}, lambda: 'A Kyoto plan')
+    assert created
+    assert finished(runner, job_id)['result'] == 'A Kyoto plan'
+    assert runner.submit('plan', {'destination': 'Kyoto'}, lambda: 'never run') == (job_id, False)
+
+
+def test_fallback_job_is_reported_done_but_never_reused(runner):
+    job_id, _ = runner.submit('plan', {'destination': 'Kyoto'}, lambda: FallbackResponse('A fallback guide'))
+    job = finished(runner, job_id)
+    assert job['status'] == DONE
+    assert job['fallback'] is True
+
+    retry_id, created = runner.submit('plan', {'destination': 'Kyoto'}, lambda: 'A Kyoto plan')
+    assert created and retry_id != job_id
+    job = finished(runner, retry_id)
+    assert job['fallback'] is False
+    assert job['result'] == 'A Kyoto plan'
+
+
+def test_failed_job_is_not_reused(runner):
+    def fail():
+        raise RuntimeError('upstream error')
+
+    job_id, _ = runner.submit('plan', {'destination': 'Kyoto'}, fail)
+    job = finished(runner, job_id)
+    assert job['status'] == FAILED
+    assert job['error']
+    retry_id, created = runner.submit('plan', {'destination': 'Kyoto'}, lambda: 'A Kyoto plan')
+    assert created and retry_id != job_id
+
+
+def test_plan_job_route_retries_after_a_fallback(client, runner, stub_gemini, monkeypatch):
+    form = {'destination': 'Kyoto', 'duration': '3 days', 'budget': 'mid_range', 'interests': 'food'}
+
+    monkeypatch.setattr(gemini, 'GEMINI_AVAILABLE', False)
+    response = client.post('/jobs/generate_plan', data=form)
+    assert response.status_code == 202
+    first = client.get(f"/jobs/{response.get_json()['job_id']}?wait=5").get_json()
+    assert first['status'] == DONE and first['fallback'] is True
+
+    monkeypatch.setattr(gemini, 'GEMINI_AVAILABLE', True)
+    second_id = client.post('/jobs/generate_plan', data=form).get_json()['job_id']
+    assert second_id != first['job_id']
+    second = client.get(f'/jobs/{second_id}?wait=5').get_json()
+    assert second['fallback'] is False
+    assert second['response'] == 'Answer 1'
+
+    assert client.post('/jobs/generate_plan', data=form).get_json()['job_id'] == second_id
+    assert len(stub_gemini.prompts) == 1
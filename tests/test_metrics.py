@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(metrics, '_collectors', [])
+    monkeypatch.setattr(metrics, '_registry', [])
+    return tmp_path
+
+
+def write_worker_snapshot(directory, pid, families):
+    with open(os.path.join(directory, f'metrics_{pid}.json'), 'w') as f:
+        json.dump({'pid': pid, 'time': 0, 'families': families}, f)
+
+
+def samples(families, name):
+    return {sample: value for sample, _key, value in families[name]['samples']}
+
+
+def test_shared_gauges_are_not_multiplied_by_worker_count(metrics_dir):
+    stats = {'hits': 3, 'entries': 120, 'running': 2}
+    metrics.register_stats('cache', 'Cache', lambda: stats, counters=('hits',), shared=('entries',))
+    # A second live worker (the test runner's parent) reporting the same shared database
+    other = metrics._snapshot()
+    write_worker_snapshot(metrics_dir, os.getppid(), other)
+
+    families = metrics._aggregate_snapshots()
+
+    assert samples(families, 'cache_entries') == {'cache_entries': 120}
+    assert samples(families, 'cache_hits') == {'cache_hits_total': 6}
+    assert samples(families, 'cache_running') == {'cache_running': 4}
+
+
+def test_gauges_of_exited_workers_are_dropped(metrics_dir):
+    metrics.register_stats('cache', 'Cache', lambda: {'hits': 1, 'entries': 5}, counters=('hits',),
+                           shared=('entries',))
+    exited = metrics._snapshot()
+    exited['cache_entries']['samples'][0][2] = 500
+    write_worker_snapshot(metrics_dir, 2 ** 22 + 12345, exited)
+
+    families = metrics._aggregate_snapshots()
+
+    assert samples(families, 'cache_entries') == {'cache_entries': 5}
+    assert samples(families, 'cache_hits') == {'cache_hits_total': 2}
@@ -0,0 +1,44 @@
+import json
+import threading
+import time
+
+from plan_batch import dedupe_requests, iter_batch_results
+
+
+def test_duplicates_are_grouped_in_first_seen_order():
+    groups = dedupe_requests(['Kyoto', 'lisbon', 'kyoto', 'Oslo'], str.lower)
+    assert groups == [['Kyoto', 'kyoto'], ['lisbon'], ['Oslo']]
+
+
+def test_batch_keeps_at_most_max_concurrency_in_flight():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def generate(task):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        if task == 3:
+            raise ValueError('no plan')
+        return task * 10
+
+    results = {task: (result, error) for task, result, error in iter_batch_results(range(6), generate, 2)}
+    assert peak[0] <= 2
+    assert results[2] == (20, None)
+    assert results[3][0] is None and isinstance(results[3][1], ValueError)
+
+
+def test_batch_route_generates_duplicates_once(client, stub_gemini):
+    plans = [{'destination': 'Kyoto', 'duration': '3 days'}, {'destination': ''},
+             {'destination': 'kyoto ', 'duration': '3 days'}]
+    response = client.post('/generate_plan/batch', json={'plans': plans})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.status_code == 200
+    assert lines[0] == {'index': 1, 'success': False, 'error': 'Please enter a destination'}
+    assert lines[1]['index'] == 0 and lines[1]['duplicates'] == [2] and lines[1]['success']
+    assert lines[-1] == {'done': True, 'total': 3, 'unique': 1, 'invalid': 1}
+    assert len(stub_gemini.prompts) == 1
@@ -0,0 +1,40 @@
+from gemini import FallbackResponse
+from plan_sections import (PLAN_SECTIONS, build_section_prompt, generate_plan_sections,
+                           merge_plan_sections)
+
+FIELDS = {'destination': 'Kyoto', 'duration': '5 days', 'budget': 'luxury', 'interests': 'temples',
+          'additional_info': ''}
+
+
+def section(key):
+    return next(section for section in PLAN_SECTIONS if section[0] == key)
+
+
+def test_section_prompt_carries_only_the_fields_it_depends_on():
+    prompt = build_section_prompt(section('packing'), FIELDS)
+    assert 'Destination: Kyoto' in prompt
+    assert '5 days' not in prompt and 'luxury' not in prompt
+
+
+def test_sections_are_merged_in_plan_order_without_repeated_fallbacks():
+    merged = merge_plan_sections([
+        (2, 'budget', 'Budget Breakdown', 'Guide'),
+        (0, 'weather', 'Best Time to Visit & Weather', 'Spring'),
+        (1, 'itinerary', 'Daily Itinerary', 'Guide'),
+    ])
+    assert merged == '**Best Time to Visit & Weather**\n\nSpring\n\n**Daily Itinerary**\n\nGuide'
+
+
+def test_sections_are_sent_without_the_general_travel_prompt(stub_gemini):
+    plan = generate_plan_sections(FIELDS)
+    assert not isinstance(plan, FallbackResponse)
+    assert len(stub_gemini.prompts) == len(PLAN_SECTIONS)
+    assert all('comprehensive response' not in prompt for prompt in stub_gemini.prompts)
+    assert plan.index('Best Time to Visit') < plan.index('Packing Suggestions')
+
+
+def test_sections_are_cached_across_budgets(stub_gemini):
+    generate_plan_sections(FIELDS)
+    generate_plan_sections(dict(FIELDS, budget='budget'))
+    budget_dependent = sum('budget' in depends_on for *_, depends_on in PLAN_SECTIONS)
+    assert len(stub_gemini.prompts) == len(PLAN_SECTIONS) + budget_dependent
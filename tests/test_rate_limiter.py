@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter
+from token_bucket import TokenBucket
+
+
+def plan(destination):
+    return {'destination': destination, 'duration': '3 days', 'budget': 'mid_range', 'interests': 'food'}
+
+
+def post_batch(client, destinations):
+    response = client.post('/generate_plan/batch', json={'plans': [plan(d) for d in destinations]})
+    response.get_data()  # runs the streamed batch to the end
+    return response
+
+
+def ip_tokens(name='ai'):
+    return rate_limiter._limiters[name][1]._buckets['127.0.0.1'].tokens
+
+
+def test_token_bucket_waits_and_releases():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.try_acquire(2) == 0
+    assert bucket.try_acquire() == pytest.approx(1.0, abs=0.01)
+    bucket.release(5)
+    assert bucket.tokens == 2
+
+
+def test_limiter_drops_the_oldest_keys():
+    limiter = RateLimiter(requests_per_minute=60, burst=1, max_keys=2)
+    for key in ('a', 'b', 'c'):
+        assert limiter.check(key) == 0
+    assert len(limiter) == 2
+    assert limiter.check('a') == 0
+    assert limiter.check('a') > 0
+
+
+def test_batch_takes_one_ai_token_per_plan(client, stub_gemini):
+    response = post_batch(client, ['Kyoto', 'Lisbon', 'Rome'])
+    assert response.status_code == 200
+    assert len([line for line in response.data.splitlines() if line.strip()]) >= 3
+    assert len(stub_gemini.prompts) == 3
+
+    # Two of the five session tokens are left, so three more plans do not fit
+    response = post_batch(client, ['Paris', 'Oslo', 'Cairo'])
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert json.loads(response.data)['retry_after'] >= 1
+    assert len(stub_gemini.prompts) == 3
+
+
+def test_duplicate_plans_cost_one_token(client, stub_gemini):
+    assert post_batch(client, ['Kyoto'] * 8 + ['Lisbon'] * 4).status_code == 200
+    assert len(stub_gemini.prompts) == 2
+
+
+def test_batch_larger_than_the_burst_is_rejected(client, stub_gemini):
+    response = post_batch(client, ['Kyoto', 'Lisbon', 'Rome', 'Paris', 'Oslo', 'Cairo'])
+    assert response.status_code == 429
+    assert json.loads(response.data)['max_plans'] == 5
+    assert stub_gemini.prompts == []
+
+
+def test_session_rejection_returns_ip_tokens(client, stub_gemini):
+    assert post_batch(client, ['Kyoto', 'Lisbon', 'Rome', 'Paris']).status_code == 200
+    before = ip_tokens()
+    assert post_batch(client, ['Oslo', 'Cairo']).status_code == 429
+    assert ip_tokens() >= before
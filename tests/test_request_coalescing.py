@@ -0,0 +1,43 @@
+import threading
+import time
+
+import pytest
+
+from request_coalescing import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        release.wait(5)
+        return 'A Kyoto plan'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('kyoto', slow_call))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()['coalesced_waiters'] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['A Kyoto plan'] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {'leaders': 1, 'coalesced_waiters': 3, 'in_flight': 0}
+
+
+def test_errors_are_raised_and_not_kept():
+    flight = SingleFlight()
+
+    def failing_call():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        flight.do('kyoto', failing_call)
+    assert flight.do('kyoto', lambda: 'A Kyoto plan') == 'A Kyoto plan'
+    assert flight.in_flight() == 0
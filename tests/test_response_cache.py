@@ -0,0 +1,31 @@
+import gemini
+from response_cache import ResponseCache, make_cache_key
+
+
+def test_prompts_differing_in_case_and_whitespace_share_a_key():
+    assert make_cache_key('Plan a trip to  Kyoto\n') == make_cache_key('plan a trip to kyoto')
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.db'), ttl_seconds=-1)
+    cache.set('Kyoto', 'A Kyoto plan')
+    assert cache.get('Kyoto') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.db'), max_entries=2)
+    cache.set('Kyoto', 'A Kyoto plan')
+    cache.set('Lisbon', 'A Lisbon plan')
+    assert cache.get('Kyoto') == 'A Kyoto plan'
+    cache.set('Oslo', 'An Oslo plan')
+    assert cache.get('Lisbon') is None
+    assert cache.get('Kyoto') == 'A Kyoto plan'
+    assert cache.stats()['entries'] == 2
+
+
+def test_repeated_prompt_is_answered_from_the_cache(stub_gemini):
+    first = gemini.get_travel_response('Plan a trip to Kyoto')
+    assert gemini.get_travel_response('plan a trip to   kyoto') == first
+    assert len(stub_gemini.prompts) == 1
+    assert stub_gemini.cache.stats()['hits'] == 1
@@ -0,0 +1,50 @@
+import pytest
+
+from gemini import get_travel_response
+from similarity_index import SimilarityIndex, prompt_facets, prompt_scope
+
+
+def test_reworded_prompt_matches():
+    index = SimilarityIndex(threshold=0.5)
+    index.add('Kyoto temples and food for 5 days', 'plan-a', 'plan')
+    assert index.query('5 days of Kyoto food and temples', 'plan')[0] == 'plan-a'
+
+
+@pytest.mark.parametrize('stored, asked', [('plan', 'question'), ('question', 'plan'),
+                                           ('section:packing', 'question'), ('plan', 'section:food')])
+def test_prompts_only_match_their_own_kind(stored, asked):
+    index = SimilarityIndex(threshold=0.5)
+    index.add('Kyoto food', 'stored', stored)
+    assert index.query('Kyoto food', asked) is None
+    assert index.query('Kyoto food', stored)[0] == 'stored'
+
+
+def test_scope_separates_destinations_numbers_and_facets():
+    assert prompt_scope('7 days in Kyoto')[:2] != prompt_scope('7 days in Osaka')[:2]
+    assert prompt_scope('7 days in Kyoto') != prompt_scope('10 days in Kyoto')
+    assert prompt_facets('luxury winter trip') == {'budget:high', 'season:winter'}
+    assert prompt_facets('mid_range family trip') == {'budget:mid', 'travelers:family'}
+
+
+def test_question_never_gets_a_cached_plan(stub_gemini):
+    plan = get_travel_response('Plan a trip to Kyoto', 'Kyoto food', kind='plan')
+    answer = get_travel_response('Question: food in Kyoto?', 'food in Kyoto', kind='question')
+    assert answer != plan
+    assert len(stub_gemini.prompts) == 2
+    assert stub_gemini.index.stats()['hits'] == 0
+
+
+def test_plan_never_gets_a_cached_answer_or_section(stub_gemini):
+    get_travel_response('Question: should I visit Kyoto?', 'Should I visit Kyoto?', kind='question')
+    get_travel_response('Packing list for Kyoto', 'packing Kyoto', raw=True, kind='section:packing')
+    get_travel_response('Plan a trip to Kyoto', 'Kyoto', kind='plan')
+    get_travel_response('Question: packing for Kyoto?', 'Packing for Kyoto?', kind='question')
+    assert len(stub_gemini.prompts) == 4
+    assert stub_gemini.index.stats()['hits'] == 0
+
+
+def test_same_kind_near_duplicate_is_served_from_cache(stub_gemini):
+    first = get_travel_response('Plan: Kyoto, 5 days, food', 'Kyoto 5 food mid_range', kind='plan')
+    second = get_travel_response('Plan: kyoto 5 days food please', 'kyoto food 5 mid_range', kind='plan')
+    assert second == first
+    assert len(stub_gemini.prompts) == 1
@@ -0,0 +1,42 @@
+"""
+Thread-safe token bucket used for request budgets
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second up to `capacity`."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', '_lock')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update; callers must hold the lock."""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available and return 0, otherwise return the seconds until they would be."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            if self.rate <= 0:
+                return float('inf')
+            return (tokens - self.tokens) / self.rate
+
+    def release(self, tokens: float = 1.0):
+        """Return tokens taken for work that did not go ahead."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
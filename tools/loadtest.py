@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Open-loop load test for the AI Travel Planner
+Drives /generate_plan, /ask_question and the page routes at a target request rate and
+reports throughput and p50/p95/p99 latency per endpoint. Latency is measured from each
+request's scheduled start, so a backed-up server shows up in the numbers.
+
+    python tools/stub_gemini.py --latency-mean 1.5 &
+    GEMINI_API_KEY=stub GEMINI_API_ENDPOINT=http://127.0.0.1:8089 gunicorn -w 4 --threads 8 main:app &
+    python tools/loadtest.py --url http://127.0.0.1:8000 --rps 20 --duration 60
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from country_data import COUNTRY_DATA
+
+DURATIONS = ['2 days', '3 days', '5 days', '1 week', '10 days', '2 weeks']
+BUDGETS = ['', 'budget', 'mid-range', 'luxury', '$1500', '$3000']
+INTERESTS = ['', 'culture, food', 'hiking, nature', 'nightlife', 'museums, architecture', 'beaches']
+QUESTIONS = ['What should I pack for {d}?', 'Is {d} safe for solo travellers?', 'Best time to visit {d}?',
+             'How many days do I need in {d}?', 'What food should I try in {d}?']
+PAGES = ['/', '/preferences', '/destinations', '/itinerary']
+
+
+class Scenario:
+    """Builds randomized requests for each endpoint from a fixed destination pool."""
+
+    def __init__(self, destinations, seed):
+        self.destinations = destinations
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def build(self, name):
+        """Return (method, path, form data or None) for an endpoint name."""
+        with self.lock:
+            destination = self.rng.choice(self.destinations)
+            if name == 'generate_plan':
+                return 'POST', '/generate_plan', {
+                    'destination': destination,
+                    'duration': self.rng.choice(DURATIONS),
+                    'budget': self.rng.choice(BUDGETS),
+                    'interests': self.rng.choice(INTERESTS)
+                }
+            if name == 'ask_question':
+                return 'POST', '/ask_question', {'question': self.rng.choice(QUESTIONS).format(d=destination)}
+            return 'GET', self.rng.choice(PAGES), None
+
+
+class Results:
+    """Thread-safe latency and status collection per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, status, seconds):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][status] += 1
+
+
+def send(base_url, method, path, form, timeout):
+    """Issue one HTTP request and return its status code (0 for connection errors)."""
+    data = urllib.parse.urlencode(form).encode('utf-8') if form is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        return 0
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def parse_mix(value):
+    """Parse 'generate_plan=2,ask_question=3,pages=5' into names and weights."""
+    names, weights = [], []
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def run(args):
+    destinations = [name for info in COUNTRY_DATA.values() for name in info['popular_destinations']]
+    if args.destinations:
+        destinations = destinations[:args.destinations]
+    scenario = Scenario(destinations, args.seed)
+    names, weights = parse_mix(args.mix)
+    picker = random.Random(args.seed)
+    results = Results()
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+
+    def fire(name, scheduled):
+        method, path, form = scenario.build(name)
+        status = send(args.url.rstrip('/'), method, path, form, args.timeout)
+        results.record(name, status, time.perf_counter() - scheduled)
+
+    total = int(args.rps * args.duration)
+    interval = 1.0 / args.rps
+    started = time.perf_counter()
+    for i in range(total):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        executor.submit(fire, picker.choices(names, weights)[0], scheduled)
+    executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - started
+
+    report(results, elapsed, args.rps)
+
+
+def report(results, elapsed, target_rps):
+    print(f"\nTarget {target_rps:g} rps, wall time {elapsed:.1f}s\n")
+    header = f"{'endpoint':<16}{'requests':>9}{'rps':>8}{'ok':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    all_latencies = []
+    total_ok = total_errors = 0
+    for name in sorted(results.latencies):
+        latencies = sorted(results.latencies[name])
+        all_latencies.extend(latencies)
+        statuses = results.statuses[name]
+        ok = sum(count for status, count in statuses.items() if 200 <= status < 400)
+        errors = len(latencies) - ok
+        total_ok += ok
+        total_errors += errors
+        print(f"{name:<16}{len(latencies):>9}{len(latencies) / elapsed:>8.1f}{ok:>7}{errors:>8}"
+              f"{percentile(latencies, 0.50) * 1000:>9.0f}{percentile(latencies, 0.95) * 1000:>9.0f}"
+              f"{percentile(latencies, 0.99) * 1000:>9.0f}")
+    all_latencies.sort()
+    print('-' * len(header))
+    print(f"{'total':<16}{len(all_latencies):>9}{len(all_latencies) / elapsed:>8.1f}{total_ok:>7}{total_errors:>8}"
+          f"{percentile(all_latencies, 0.50) * 1000:>9.0f}{percentile(all_latencies, 0.95) * 1000:>9.0f}"
+          f"{percentile(all_latencies, 0.99) * 1000:>9.0f}")
+
+    print('\nStatus codes:')
+    for name in sorted(results.statuses):
+        codes = ', '.join(f"{status or 'conn-error'}: {count}" for status, count in sorted(results.statuses[name].items()))
+        print(f"  {name}: {codes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Open-loop load test for the AI Travel Planner')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='base URL of the app')
+    parser.add_argument('--rps', type=float, default=10.0, help='target requests per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='test length in seconds')
+    parser.add_argument('--concurrency', type=int, default=256, help='max requests in flight')
+    parser.add_argument('--timeout', type=float, default=120.0, help='per-request timeout in seconds')
+    parser.add_argument('--mix', default='generate_plan=3,ask_question=3,pages=4',
+                        help='endpoint weights, e.g. generate_plan=3,ask_question=3,pages=4')
+    parser.add_argument('--destinations', type=int, default=50,
+                        help='size of the destination pool (smaller means more cache hits)')
+    parser.add_argument('--seed', type=int, default=7)
+    run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    main()
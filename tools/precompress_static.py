@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Write .gz (and .br when brotli is installed) copies of the static assets
+The app serves these to clients that accept the encoding instead of compressing on every
+request; a copy older than its source file is ignored, so re-run this after changing assets.
+
+    python tools/precompress_static.py
+"""
+
+import argparse
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_caching import BROTLI_AVAILABLE, COMPRESS_MIN_SIZE
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+EXTENSIONS = ('.css', '.js', '.html', '.svg', '.json', '.txt')
+
+
+def precompress(path, use_brotli):
+    """Write the compressed variants of one file; returns the sizes written."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    sizes = {'gzip': len(compressed)}
+    with open(path + '.gz', 'wb') as f:
+        f.write(compressed)
+    if use_brotli:
+        import brotli
+        compressed = brotli.compress(data, quality=11)
+        sizes['br'] = len(compressed)
+        with open(path + '.br', 'wb') as f:
+            f.write(compressed)
+    return len(data), sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-compress static assets')
+    parser.add_argument('--static-dir', default=STATIC_DIR)
+    args = parser.parse_args(argv)
+
+    if not BROTLI_AVAILABLE:
+        print('brotli is not installed; writing gzip copies only (pip install brotli)', file=sys.stderr)
+
+    for root, _, files in os.walk(args.static_dir):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if not name.endswith(EXTENSIONS) or os.path.getsize(path) < COMPRESS_MIN_SIZE:
+                continue
+            size, sizes = precompress(path, BROTLI_AVAILABLE)
+            summary = ', '.join(f'{encoding} {compressed}' for encoding, compressed in sizes.items())
+            print(f'{os.path.relpath(path, args.static_dir)}: {size} bytes -> {summary}')
+
+
+if __name__ == '__main__':
+    main()
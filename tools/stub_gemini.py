@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent REST API
+Serves generateContent, streamGenerateContent and countTokens with configurable latency,
+error rate and response size so the app can be load-tested offline.
+
+Point the app at it with:
+    GEMINI_API_KEY=stub GEMINI_API_ENDPOINT=http://127.0.0.1:8089 python main.py
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_PATH_RE = re.compile(r'^/(?P<version>v1\w*)/models/(?P<model>[^:/]+)(?::(?P<method>\w+))?$')
+
+_SECTION_TITLES = ['Best Time to Visit', 'Daily Itinerary', 'Budget Breakdown', 'Must-See Attractions',
+                   'Local Cuisine', 'Getting Around', 'Cultural Tips', 'Packing List']
+_WORDS = ('explore visit enjoy local market museum temple harbour old town sunset walk tour street food '
+          'cafe garden river view festival train bus ferry hostel hotel budget tip book early').split()
+
+
+class StubConfig:
+    """Latency, error and size settings shared by all handler threads."""
+
+    def __init__(self, args):
+        self.latency = args.latency
+        self.latency_mean = args.latency_mean
+        self.latency_sigma = args.latency_sigma
+        self.latency_max = args.latency_max
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.response_bytes = args.response_bytes
+        self.stream_chunks = args.stream_chunks
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def sample_latency(self):
+        """Draw one response latency in seconds from the configured distribution."""
+        with self.lock:
+            self.requests += 1
+            if self.latency == 'fixed':
+                value = self.latency_mean
+            elif self.latency == 'uniform':
+                value = self.rng.uniform(0, 2 * self.latency_mean)
+            elif self.latency == 'exponential':
+                value = self.rng.expovariate(1 / self.latency_mean) if self.latency_mean > 0 else 0
+            else:
+                # Lognormal with the configured median, the usual shape of LLM latency
+                value = self.latency_mean * self.rng.lognormvariate(0, self.latency_sigma)
+        return min(value, self.latency_max)
+
+    def should_fail(self):
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+    def sample_size(self):
+        with self.lock:
+            return max(64, int(self.rng.gauss(self.response_bytes, self.response_bytes * 0.2)))
+
+
+def make_travel_text(prompt, size, seed):
+    """Markdown-ish travel text of roughly `size` bytes, deterministic for a prompt."""
+    rng = random.Random(seed)
+    destination = 'your destination'
+    match = re.search(r'Destination:\s*([^\n]+)', prompt)
+    if match:
+        destination = match.group(1).strip()
+
+    parts = [f"🌍 **Travel Plan for {destination}**\n"]
+    length = len(parts[0])
+    section = 0
+    while length < size:
+        title = _SECTION_TITLES[section % len(_SECTION_TITLES)]
+        lines = [f"\n**{section + 1}. {title}**\n"]
+        for _ in range(rng.randint(3, 6)):
+            lines.append('• ' + ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(6, 14))).capitalize() + '\n')
+        block = ''.join(lines)
+        parts.append(block)
+        length += len(block.encode('utf-8'))
+        section += 1
+    return ''.join(parts)
+
+
+def candidate_payload(text, prompt_tokens, finish=True):
+    """One GenerateContentResponse in the REST JSON shape."""
+    payload = {
+        'candidates': [{
+            'content': {'parts': [{'text': text}], 'role': 'model'},
+            'index': 0,
+            'safetyRatings': []
+        }],
+        'promptFeedback': {'safetyRatings': []},
+        'usageMetadata': {
+            'promptTokenCount': prompt_tokens,
+            'candidatesTokenCount': max(1, len(text) // 4),
+            'totalTokenCount': prompt_tokens + max(1, len(text) // 4)
+        }
+    }
+    if finish:
+        payload['candidates'][0]['finishReason'] = 'STOP'
+    return payload
+
+
+def prompt_text(body):
+    """Concatenate the text parts of a generateContent request body."""
+    texts = []
+    for content in body.get('contents', []):
+        for part in content.get('parts', []):
+            if 'text' in part:
+                texts.append(part['text'])
+    return '\n'.join(texts)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = 'StubGemini/1.0'
+    protocol_version = 'HTTP/1.1'
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self):
+        status = self.config.error_status
+        self._send_json(status, {'error': {'code': status, 'message': 'Injected stub failure', 'status': 'UNAVAILABLE'}})
+
+    def do_GET(self):
+        match = _PATH_RE.match(urlparse(self.path).path)
+        if not match or match.group('method'):
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+            return
+        model = match.group('model')
+        self._send_json(200, {
+            'name': f'models/{model}',
+            'displayName': f'Stub {model}',
+            'inputTokenLimit': 30720,
+            'outputTokenLimit': 2048,
+            'supportedGenerationMethods': ['generateContent', 'countTokens']
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        match = _PATH_RE.match(url.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        if not match:
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not found', 'status': 'NOT_FOUND'}})
+            return
+
+        method = match.group('method')
+        prompt = prompt_text(body)
+        prompt_tokens = max(1, len(prompt) // 4)
+
+        if method == 'countTokens':
+            self._send_json(200, {'totalTokens': prompt_tokens})
+            return
+        if method not in ('generateContent', 'streamGenerateContent'):
+            self._send_json(404, {'error': {'code': 404, 'message': f'Unknown method {method}', 'status': 'NOT_FOUND'}})
+            return
+
+        latency = self.config.sample_latency()
+        if self.config.should_fail():
+            time.sleep(latency * random.random())
+            self._send_error()
+            return
+
+        text = make_travel_text(prompt, self.config.sample_size(), seed=hash(prompt))
+        if method == 'generateContent':
+            time.sleep(latency)
+            self._send_json(200, candidate_payload(text, prompt_tokens))
+            return
+
+        sse = 'sse' in parse_qs(url.query).get('alt', [])
+        self._stream(text, prompt_tokens, latency, sse)
+
+    def _stream(self, text, prompt_tokens, latency, sse):
+        """Send the text in chunks spread across the sampled latency."""
+        count = max(1, self.config.stream_chunks)
+        step = max(1, -(-len(text) // count))
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+        # The first chunk arrives after ~20% of the latency, the rest spread evenly
+        first_delay = latency * 0.2
+        gap = (latency - first_delay) / max(1, len(chunks) - 1)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream' if sse else 'application/json; charset=UTF-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        time.sleep(first_delay)
+        if not sse:
+            self._write_chunk(b'[')
+        for index, chunk in enumerate(chunks):
+            if index:
+                time.sleep(gap)
+            payload = json.dumps(candidate_payload(chunk, prompt_tokens, finish=index == len(chunks) - 1))
+            if sse:
+                self._write_chunk(f'data: {payload}\r\n\r\n'.encode('utf-8'))
+            else:
+                self._write_chunk(((',\n' if index else '') + payload).encode('utf-8'))
+        if not sse:
+            self._write_chunk(b']')
+        self._write_chunk(b'')
+
+    def _write_chunk(self, data):
+        self.wfile.write(f'{len(data):X}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Local stub of the Gemini generateContent API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'exponential', 'lognormal'], default='lognormal',
+                        help='latency distribution (default: lognormal)')
+    parser.add_argument('--latency-mean', type=float, default=2.0,
+                        help='mean latency in seconds (median for lognormal)')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='lognormal shape parameter')
+    parser.add_argument('--latency-max', type=float, default=60.0, help='cap on any single latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail (0-1)')
+    parser.add_argument('--error-status', type=int, default=503, help='HTTP status for injected failures')
+    parser.add_argument('--response-bytes', type=int, default=4000, help='mean response size in bytes')
+    parser.add_argument('--stream-chunks', type=int, default=12, help='chunks per streamed response')
+    parser.add_argument('--seed', type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    StubHandler.config = StubConfig(args)
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"Stub Gemini listening on http://{args.host}:{args.port} "
+          f"({args.latency} latency ~{args.latency_mean}s, error rate {args.error_rate:.0%}, "
+          f"~{args.response_bytes} bytes/response)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Fill the local image store with every known destination photo and report the size savings
+Without this the store fills itself in the background as pages are rendered. Point
+--source-dir (or IMAGE_SOURCE_DIR) at a directory of <photo id>.jpg files to work offline.
+
+    python tools/warm_image_store.py [--source-dir fixtures/images]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from destination_images import DESTINATION_IMAGES, FALLBACK_PHOTO_ID
+from image_store import IMAGE_SOURCE_DIR, IMAGE_STORE_DIR, IMAGE_VARIANTS, PILLOW_AVAILABLE, ImageStore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-generate destination image variants')
+    parser.add_argument('--store-dir', default=IMAGE_STORE_DIR)
+    parser.add_argument('--source-dir', default=IMAGE_SOURCE_DIR)
+    args = parser.parse_args(argv)
+
+    if not PILLOW_AVAILABLE:
+        print('Pillow is not installed (pip install pillow); cards will keep using remote images', file=sys.stderr)
+        return 1
+
+    store = ImageStore(root=args.store_dir, source_dir=args.source_dir, workers=1)
+    totals = dict.fromkeys(['original', *IMAGE_VARIANTS], 0)
+    failures = 0
+    for photo_id in sorted({*DESTINATION_IMAGES.values(), FALLBACK_PHOTO_ID}):
+        try:
+            digest = store.process(photo_id)
+        except Exception as e:
+            print(f"{photo_id}: failed ({e})", file=sys.stderr)
+            failures += 1
+            continue
+        totals['original'] += os.path.getsize(os.path.join(args.store_dir, 'blobs', digest))
+        for variant in IMAGE_VARIANTS:
+            totals[variant] += os.path.getsize(store.variant_file(digest, variant + store.extension))
+
+    print(', '.join(f"{name} {size / 1024:.0f} KB" for name, size in totals.items()) + f" ({store.mimetype})")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())